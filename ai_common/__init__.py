@@ -0,0 +1,5 @@
+"""Modules shared by the Job Search AI and Resume AI Agent apps and the LLM gateway
+
+The apps run as scripts from their own folders and add the repository root
+to sys.path, so these are imported as ai_common.<module>.
+"""
@@ -0,0 +1,245 @@
+import asyncio
+import contextvars
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# time.monotonic() by which the request running in this context must finish, set by
+# with_deadline() so clients can pass the time left on to the LLM gateway
+request_deadline = contextvars.ContextVar("request_deadline", default=None)
+
+
+def time_remaining():
+    """Seconds left before the current request's deadline, or None when it has none"""
+    deadline = request_deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+async def with_deadline(coro, timeout):
+    """Await a coroutine within timeout seconds, raising TimeoutError with a readable message on expiry
+
+    The coroutine runs in its own task, with request_deadline set to the
+    earlier of this deadline and any deadline it is nested in.
+    """
+    deadline = time.monotonic() + timeout
+    outer = request_deadline.get()
+
+    async def run():
+        request_deadline.set(deadline if outer is None else min(deadline, outer))
+        return await coro
+
+    try:
+        return await asyncio.wait_for(run(), timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"Request timed out after {timeout:.0f}s") from None
+
+
+class RequestHandle:
+    """A request running on an AsyncLoopThread that the UI can cancel
+
+    Cancelling cancels the asyncio task, which aborts the in-flight Gemini
+    call and releases its connection and rate-limiter slot. The deadline is
+    enforced on the loop the same way, so a hung call never outlives it.
+    """
+
+    def __init__(self, future, method, deadline=None):
+        self.future = future
+        self.method = method
+        self.deadline = deadline
+        self.started = time.monotonic()
+
+    def elapsed(self):
+        """Seconds since the request started"""
+        return time.monotonic() - self.started
+
+    def cancel(self):
+        """Abort the request, returning False when it had already finished"""
+        cancelled = self.future.cancel()
+        if cancelled:
+            logging.info(f"Cancelled {self.method} after {self.elapsed():.1f}s")
+        return cancelled
+
+    def cancelled(self):
+        """Whether the request was cancelled"""
+        return self.future.cancelled()
+
+    def done(self):
+        """Whether the request has finished, failed or been cancelled"""
+        return self.future.done()
+
+    def result(self):
+        """Block until the request finishes and return its result, raising its error
+
+        Raises TimeoutError once the deadline passes and CancelledError after cancel().
+        """
+        return self.future.result()
+
+    def add_done_callback(self, fn):
+        """Call fn(handle) from the loop thread once the request is done"""
+        self.future.add_done_callback(lambda _: fn(self))
+
+
+class ActionLimitReached(Exception):
+    """Raised when an action is started while the app already has max_pending running"""
+
+
+class Action:
+    """A user action in flight: its future and the dialog showing its progress, if any"""
+
+    def __init__(self, name, key, future=None):
+        self.name = name
+        self.key = key
+        self.future = future
+        self.dialog = None
+        self.started = time.monotonic()
+
+
+class ActionRunner:
+    """Tracks the actions started from the GUI, one per button and inputs
+
+    A repeat click while an identical action is pending gets that action back
+    instead of starting new work. Once max_pending actions are running, new
+    ones are refused with ActionLimitReached until one finishes, so rapid
+    clicking cannot pile up requests, threads or dialogs.
+    """
+
+    def __init__(self, max_pending):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.started = 0
+        self.attached = 0
+        self.rejected = 0
+
+    @staticmethod
+    def make_key(name, inputs):
+        """Key an action by its name and inputs"""
+        return json.dumps([name, inputs], sort_keys=True, default=str)
+
+    def run(self, name, inputs, start):
+        """Return (action, started): the pending action with the same name and inputs, or a new one
+
+        start(action) must return a concurrent.futures.Future and may set
+        action.dialog; it runs without holding the lock. The action is
+        forgotten once its future is done.
+        """
+        key = self.make_key(name, inputs)
+        with self._lock:
+            action = self._pending.get(key)
+            if action is not None:
+                self.attached += 1
+                return action, False
+            if len(self._pending) >= self.max_pending:
+                self.rejected += 1
+                raise ActionLimitReached(
+                    f"{len(self._pending)} requests are already running. "
+                    "Wait for one to finish or cancel it, then try again."
+                )
+            # Hold the slot while start() runs
+            action = self._pending[key] = Action(name, key, None)
+
+        try:
+            action.future = start(action)
+        except Exception:
+            self._finished(action)
+            raise
+        with self._lock:
+            self.started += 1
+        action.future.add_done_callback(lambda _: self._finished(action))
+        return action, True
+
+    def _finished(self, action):
+        """Forget a finished action so the next click starts it afresh"""
+        with self._lock:
+            if self._pending.get(action.key) is action:
+                del self._pending[action.key]
+
+    def pending(self):
+        """Number of actions still running"""
+        with self._lock:
+            return len(self._pending)
+
+    def stats(self):
+        """Return how many actions were started, attached to by repeat clicks, and refused"""
+        with self._lock:
+            return {
+                "started": self.started,
+                "attached": self.attached,
+                "rejected": self.rejected,
+                "pending": len(self._pending)
+            }
+
+
+class AsyncLoopThread:
+    """Long-lived asyncio event loop running on a background thread
+
+    The Tk thread submits coroutines with submit() or submit_to_tk(); results
+    are handed back through the app's UIDispatcher so widgets are only touched
+    from the GUI thread. Blocking work the loop hands off (run_in_executor with
+    the default executor) shares one pool of at most max_workers threads.
+    """
+
+    def __init__(self, name="gemini-async-loop", max_workers=None):
+        self.loop = asyncio.new_event_loop()
+        if max_workers:
+            self.loop.set_default_executor(ThreadPoolExecutor(max_workers, thread_name_prefix=f"{name}-worker"))
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        """Start the event loop thread"""
+        self._thread.start()
+        return self
+
+    def _run(self):
+        """Run the event loop until stop() is called"""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+        # Cancel whatever is still in flight before closing the loop
+        pending = asyncio.all_tasks(self.loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        self.loop.close()
+
+    def submit(self, coro, timeout=None):
+        """Schedule a coroutine on the loop and return a concurrent.futures.Future
+
+        Cancelling the returned future cancels the underlying task.
+        """
+        if timeout is not None:
+            coro = with_deadline(coro, timeout)
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def submit_to_tk(self, ui, coro, on_result, on_error=None, timeout=None):
+        """Run a coroutine and deliver its result (or exception) on the Tk thread through ui.post"""
+        future = self.submit(coro, timeout)
+
+        def deliver(done):
+            if done.cancelled():
+                return
+
+            error = done.exception()
+            if error is None:
+                ui.post(on_result, done.result())
+            elif on_error:
+                ui.post(on_error, error)
+            else:
+                logging.error(f"Async request failed: {str(error)}")
+
+        future.add_done_callback(deliver)
+        return future
+
+    def start_request(self, method, coro, deadline=None):
+        """Run a coroutine with a deadline and return a cancellable RequestHandle"""
+        return RequestHandle(self.submit(coro, deadline), method, deadline)
+
+    def stop(self, timeout=5):
+        """Stop the loop, cancelling in-flight tasks, and wait for the thread to exit"""
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._thread.is_alive():
+            self._thread.join(timeout)
@@ -0,0 +1,268 @@
+import functools
+import json
+import logging
+import time
+
+import httpx
+import requests
+
+from .async_runner import time_remaining
+from .rate_limiter import RateLimitExceeded
+
+
+class GatewayClient:
+    """Mixin that sends an app's GeminiClient prompts to the shared local LLM gateway
+
+    Prompts are still built by the app's GeminiClient, so the method names and
+    results match it; the gateway owns the SDK connection, response cache and
+    rate limits shared by every app. create_client() combines the two.
+    """
+
+    def __init__(self, config, base_url=None):
+        # Set before GeminiClient.__init__, which calls _initialize_client
+        self.config = config
+        self.base_url = (base_url or config.LLM_GATEWAY_URL).rstrip("/")
+        self.session = requests.Session()
+        super().__init__()
+        # The gateway caches full responses; structured responses are split into
+        # sections client-side, so those stay in the local section cache
+        self.cache = None
+
+    def _initialize_client(self):
+        """Check that the gateway is up in place of setting up the Gemini SDK"""
+        response = self.session.get(f"{self.base_url}/health", timeout=self.config.LLM_GATEWAY_CONNECT_TIMEOUT)
+        response.raise_for_status()
+        logging.info(f"Using LLM gateway at {self.base_url}")
+
+    def _generate(self, method, inputs, prompt, use_cache=True, on_chunk=None, generation_config=None):
+        """Send a prompt to the gateway for the routed model tier, streaming chunks to on_chunk when given"""
+        return self.router.call(
+            method,
+            prompt,
+            on_chunk,
+            lambda model_name, on_chunk, timeout: self._post(
+                method, inputs, prompt, model_name, use_cache, on_chunk, generation_config, timeout
+            )
+        )
+
+    @staticmethod
+    def _payload(method, inputs, prompt, model_name, use_cache, stream, generation_config, timeout=None):
+        """Build a /generate request body
+
+        Its timeout is how long the app will wait: the time left before the
+        request's deadline, or a fallback tier's timeout for a non-streaming
+        call. The gateway stops working on the request after that.
+        """
+        remaining = time_remaining()
+        if timeout and not stream:
+            remaining = timeout if remaining is None else min(timeout, remaining)
+
+        return {
+            "method": method,
+            "inputs": inputs,
+            "prompt": prompt,
+            "model": model_name,
+            "use_cache": use_cache,
+            "stream": stream,
+            "generation_config": generation_config,
+            "timeout": remaining
+        }
+
+    @staticmethod
+    def _raise_for_status(response):
+        """Raise RateLimitExceeded for a 429, TimeoutError for a 504 and the HTTP error for any other failure"""
+        if response.status_code == 429:
+            raise RateLimitExceeded(response.json().get("detail", "Gemini is rate limiting requests"))
+        if response.status_code == 504:
+            # The gateway gave up at the request's deadline; a timeout like any other
+            raise TimeoutError(response.json().get("detail", "LLM gateway timed out"))
+        response.raise_for_status()
+
+    @staticmethod
+    def _final_text(event):
+        """Return the text of a stream's final event, raise its error, or return None for other events"""
+        if "text" in event:
+            return event["text"]
+        if "error" in event:
+            if event.get("status") == 429:
+                raise RateLimitExceeded(event["error"])
+            if event.get("status") == 504:
+                raise TimeoutError(event["error"])
+            raise RuntimeError(event["error"])
+        return None
+
+    @staticmethod
+    def _first_chunk(method, started):
+        """Log the time from sending a request to its first streamed chunk"""
+        logging.info(f"{method} first token after {time.perf_counter() - started:.2f}s")
+
+    def _post(self, method, inputs, prompt, model_name, use_cache, on_chunk, generation_config, timeout=None):
+        """Send one request to the gateway; timeout shortens the read timeout for tiers with a fallback"""
+        try:
+            response = self.session.post(
+                f"{self.base_url}/generate",
+                json=self._payload(
+                    method, inputs, prompt, model_name, use_cache, on_chunk is not None, generation_config, timeout
+                ),
+                timeout=(self.config.LLM_GATEWAY_CONNECT_TIMEOUT, timeout or self.config.LLM_GATEWAY_READ_TIMEOUT),
+                stream=on_chunk is not None
+            )
+        except requests.Timeout as e:
+            # Reported as a TimeoutError so the model router falls back to the next tier
+            raise TimeoutError(f"LLM gateway did not answer {method} in time ({str(e)})") from e
+        self._raise_for_status(response)
+
+        if on_chunk is None:
+            return response.json()["text"]
+
+        return self._read_stream(method, response, on_chunk)
+
+    def _read_stream(self, method, response, on_chunk):
+        """Forward streamed chunks and return the final text"""
+        started = time.perf_counter()
+        received_chunk = False
+
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+
+            event = json.loads(line)
+            if "chunk" in event:
+                if not received_chunk:
+                    received_chunk = True
+                    self._first_chunk(method, started)
+                on_chunk(event["chunk"])
+                continue
+
+            text = self._final_text(event)
+            if text is not None:
+                return text
+
+        raise RuntimeError("LLM gateway closed the stream before the response finished")
+
+    def _stats(self):
+        """Fetch the gateway's counters"""
+        response = self.session.get(f"{self.base_url}/stats", timeout=self.config.LLM_GATEWAY_CONNECT_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    def cache_stats(self):
+        """Return the gateway's response cache counters"""
+        return self._stats()["cache"]
+
+    def rate_limit_stats(self):
+        """Return the gateway's throttling and retry counters"""
+        return self._stats()["rate_limit"]
+
+    def single_flight_stats(self):
+        """Return how many duplicate requests the gateway coalesced"""
+        return self._stats()["single_flight"]
+
+    def hedge_stats(self):
+        """Return the gateway's hedged request counters and latency percentiles"""
+        return self._stats()["hedging"]
+
+
+class AsyncGatewayClient:
+    """Mixin for an app's AsyncGeminiClient, the counterpart of GatewayClient
+
+    Requests go through httpx on the app's event loop rather than a blocking
+    call on a worker thread. Cancelling a request (Cancel, closing its dialog
+    or reaching its deadline) closes its connection at once, which tells
+    the gateway to stop working on it.
+    """
+
+    def __init__(self, client):
+        super().__init__(client)
+        self.config = client.config
+        self.http = httpx.AsyncClient(
+            base_url=client.base_url,
+            timeout=httpx.Timeout(
+                self.config.LLM_GATEWAY_READ_TIMEOUT, connect=self.config.LLM_GATEWAY_CONNECT_TIMEOUT
+            )
+        )
+
+    async def _generate(self, method, inputs, prompt, use_cache=True, on_chunk=None, generation_config=None):
+        """Send a prompt to the gateway for the routed model tier, streaming chunks to on_chunk when given"""
+        return await self.client.router.call_async(
+            method,
+            prompt,
+            on_chunk,
+            lambda model_name, on_chunk, timeout: self._post(
+                method, inputs, prompt, model_name, use_cache, on_chunk, generation_config, timeout
+            )
+        )
+
+    async def _post(self, method, inputs, prompt, model_name, use_cache, on_chunk, generation_config, timeout=None):
+        """Send one request to the gateway; timeout shortens the read timeout for tiers with a fallback"""
+        payload = self.client._payload(
+            method, inputs, prompt, model_name, use_cache, on_chunk is not None, generation_config, timeout
+        )
+        request_timeout = httpx.Timeout(
+            timeout or self.config.LLM_GATEWAY_READ_TIMEOUT, connect=self.config.LLM_GATEWAY_CONNECT_TIMEOUT
+        )
+
+        try:
+            if on_chunk is None:
+                response = await self.http.post("/generate", json=payload, timeout=request_timeout)
+                self.client._raise_for_status(response)
+                return response.json()["text"]
+
+            async with self.http.stream("POST", "/generate", json=payload, timeout=request_timeout) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                self.client._raise_for_status(response)
+                return await self._read_stream(method, response, on_chunk)
+        except httpx.TimeoutException as e:
+            # Reported as a TimeoutError so the model router falls back to the next tier
+            raise TimeoutError(f"LLM gateway did not answer {method} in time ({str(e)})") from e
+
+    async def _read_stream(self, method, response, on_chunk):
+        """Forward streamed chunks and return the final text"""
+        started = time.perf_counter()
+        received_chunk = False
+
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+
+            event = json.loads(line)
+            if "chunk" in event:
+                if not received_chunk:
+                    received_chunk = True
+                    self.client._first_chunk(method, started)
+                on_chunk(event["chunk"])
+                continue
+
+            text = self.client._final_text(event)
+            if text is not None:
+                return text
+
+        raise RuntimeError("LLM gateway closed the stream before the response finished")
+
+
+def create_client(config, client_class):
+    """Return a GatewayClient built on client_class when the gateway is reachable, otherwise a client_class
+
+    client_class is the calling app's GeminiClient.
+    """
+    if config.LLM_GATEWAY_URL:
+        try:
+            return _with_base(GatewayClient, client_class)(config)
+        except requests.RequestException as e:
+            logging.info(f"LLM gateway not available ({str(e)}), using a local Gemini client")
+
+    return client_class()
+
+
+def create_async_client(client, async_client_class):
+    """Wrap a client from create_client() in the matching async client, built on the app's AsyncGeminiClient"""
+    if isinstance(client, GatewayClient):
+        return _with_base(AsyncGatewayClient, async_client_class)(client)
+    return async_client_class(client)
+
+
+@functools.lru_cache(maxsize=None)
+def _with_base(mixin, base):
+    """Return the class combining a gateway mixin with an app's client class"""
+    return type(mixin.__name__, (mixin, base), {})
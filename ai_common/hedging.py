@@ -0,0 +1,215 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+
+# Hedge credit saved up while requests finish in time; bounds bursts of hedges
+MAX_HEDGE_CREDIT = 2.0
+
+
+class LatencyTracker:
+    """Rolling window of recent latencies per key (e.g. per method)"""
+
+    def __init__(self, window=200):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, key, seconds):
+        """Record one latency in seconds"""
+        with self._lock:
+            self._samples[key].append(seconds)
+
+    def count(self, key):
+        """Number of latencies currently in the window for key"""
+        with self._lock:
+            return len(self._samples[key])
+
+    def percentile(self, key, fraction):
+        """Latency below which the given fraction of recent samples fall, or None without samples"""
+        with self._lock:
+            samples = sorted(self._samples[key])
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def summary(self):
+        """Return the sample count, p50 and p95 in seconds for every key; tuple keys are joined with '/'"""
+        with self._lock:
+            keys = list(self._samples)
+        return {
+            "/".join(key) if isinstance(key, tuple) else key: {
+                "samples": self.count(key),
+                "p50": round(self.percentile(key, 0.5), 3),
+                "p95": round(self.percentile(key, 0.95), 3)
+            }
+            for key in keys
+            if self.count(key)
+        }
+
+
+class Hedger:
+    """Hedged requests: a duplicate is sent when a request outlives its method's p95 latency
+
+    The threshold is learned online from the latencies recorded for each
+    method and only used once min_samples have been seen. The first response
+    wins and the other attempt is cancelled (an async task is cancelled
+    outright; a blocking SDK call cannot be interrupted, so its late result is
+    discarded). Each request earns max_rate of a hedge credit and each hedge
+    spends one, so at most about max_rate of requests are duplicated.
+
+    Latencies are recorded even when hedging is disabled, so the thresholds
+    are ready as soon as it is turned on.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, enabled=False, percentile=0.95, max_rate=0.1, min_samples=20, window=200):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker(window)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._credit = 0.0
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @classmethod
+    def shared(cls, config):
+        """Return the process-wide hedger configured from Config"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    config.HEDGE_ENABLED,
+                    percentile=config.HEDGE_PERCENTILE,
+                    max_rate=config.HEDGE_MAX_RATE,
+                    min_samples=config.HEDGE_MIN_SAMPLES,
+                    window=config.HEDGE_WINDOW
+                )
+            return cls._shared
+
+    def threshold(self, key):
+        """Seconds after which a request for key is hedged, or None while hedging is off or still learning"""
+        if not self.enabled or self.latencies.count(key) < self.min_samples:
+            return None
+        return self.latencies.percentile(key, self.percentile)
+
+    def _start_request(self):
+        """Count a request and earn its share of hedge credit"""
+        with self._lock:
+            self.requests += 1
+            self._credit = min(MAX_HEDGE_CREDIT, self._credit + self.max_rate)
+
+    def _take_hedge(self):
+        """Spend a hedge credit, returning False when the hedge rate cap has been reached"""
+        with self._lock:
+            if self._credit < 1.0:
+                return False
+            self._credit -= 1.0
+            self.hedges += 1
+            return True
+
+    def _finish(self, key, started, hedged, hedge_won):
+        """Record the request's latency, from when its first attempt started until the first response"""
+        seconds = time.perf_counter() - started
+        self.latencies.record(key, seconds)
+        if hedge_won:
+            with self._lock:
+                self.hedge_wins += 1
+        if hedged:
+            logging.info(f"Hedged {key}: {'hedge' if hedge_won else 'original'} answered first after {seconds:.2f}s")
+
+    def call(self, key, fn):
+        """Run fn(), sending a duplicate call if it is still running after key's threshold"""
+        self._start_request()
+        started = time.perf_counter()
+        delay = self.threshold(key)
+        if delay is None:
+            result = fn()
+            self._finish(key, started, False, False)
+            return result
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="gemini-hedge")
+        primary = self._executor.submit(fn)
+        try:
+            result = primary.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+        else:
+            self._finish(key, started, False, False)
+            return result
+
+        if not self._take_hedge():
+            result = primary.result()
+            self._finish(key, started, False, False)
+            return result
+
+        hedge = self._executor.submit(fn)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    result = future.result()
+                    self._finish(key, started, True, future is hedge)
+                    return result
+                error = error or future.exception()
+        raise error
+
+    async def call_async(self, key, make_coro):
+        """Async counterpart of call(); make_coro() must return a fresh coroutine per attempt"""
+        self._start_request()
+        started = time.perf_counter()
+        delay = self.threshold(key)
+        if delay is None:
+            result = await make_coro()
+            self._finish(key, started, False, False)
+            return result
+
+        primary = asyncio.ensure_future(make_coro())
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done or not self._take_hedge():
+                result = await primary
+                self._finish(key, started, False, False)
+                return result
+
+            hedge = asyncio.ensure_future(make_coro())
+            pending.add(hedge)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        result = task.result()
+                        self._finish(key, started, True, task is hedge)
+                        return result
+                    error = error or task.exception()
+            raise error
+        finally:
+            # The losing attempt, or both when the caller itself was cancelled
+            for task in pending:
+                task.cancel()
+
+    def stats(self):
+        """Return hedge counters and the per-method latency percentiles"""
+        with self._lock:
+            stats = {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": self.hedges / self.requests if self.requests else 0.0
+            }
+        stats["latency"] = self.latencies.summary()
+        return stats
@@ -0,0 +1,346 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class Job:
+    """One queued Gemini request and, once finished, its result or error"""
+
+    id: str
+    method: str
+    payload: dict
+    status: str
+    attempts: int = 0
+    result: str = None
+    error: str = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+
+class JobQueue:
+    """Durable SQLite queue of Gemini requests that survives restarts
+
+    Workers lease a job for a limited time and renew the lease while it runs;
+    a job whose worker died (e.g. the app was closed mid-request) is leased
+    again once its lease expires. Results are stored idempotently: the first
+    completion wins and later ones are ignored, so a job that was retried
+    after a lost lease never ends up with two different results. A cancelled
+    job is never leased again and a late result for it is dropped.
+    """
+
+    COLUMNS = "id, method, payload, status, attempts, result, error, created_at, updated_at"
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._create_table()
+
+    def _create_table(self):
+        """Create the jobs table if it does not exist yet"""
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    method TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    lease_expires REAL,
+                    available_at REAL NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, available_at)"
+            )
+
+    @staticmethod
+    def _job(row):
+        """Build a Job from a row selected with COLUMNS"""
+        job_id, method, payload, status, attempts, result, error, created_at, updated_at = row
+        return Job(job_id, method, json.loads(payload), status, attempts, result, error, created_at, updated_at)
+
+    def enqueue(self, method, payload, job_id=None):
+        """Add a job and return its id
+
+        Enqueueing an id that already exists is a no-op, so callers that derive
+        ids from their input (e.g. a batch row key) can safely enqueue again
+        after a restart. A job that failed for good or was cancelled is queued again.
+        """
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT OR IGNORE INTO jobs (id, method, payload, status, available_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (job_id, method, json.dumps(payload), QUEUED, now, now, now)
+            )
+            self._connection.execute(
+                """
+                UPDATE jobs SET status = ?, attempts = 0, error = NULL, available_at = ?, updated_at = ?
+                WHERE id = ? AND status IN (?, ?)
+                """,
+                (QUEUED, now, now, job_id, FAILED, CANCELLED)
+            )
+
+        return job_id
+
+    def get(self, job_id):
+        """Return a job by id, or None when it does not exist"""
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {self.COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._job(row) if row else None
+
+    def lease(self, owner, lease_seconds):
+        """Claim the oldest runnable job for owner, or return None when there is none
+
+        Runnable means queued (and past any retry delay) or running under an
+        expired lease.
+        """
+        now = time.time()
+
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                """
+                SELECT id FROM jobs
+                WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_expires < ?)
+                ORDER BY created_at LIMIT 1
+                """,
+                (QUEUED, now, RUNNING, now)
+            ).fetchone()
+            if row is None:
+                return None
+
+            # Repeat the condition so another process that claimed the job first wins
+            claimed = self._connection.execute(
+                """
+                UPDATE jobs SET status = ?, owner = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ?
+                WHERE id = ? AND ((status = ? AND available_at <= ?) OR (status = ? AND lease_expires < ?))
+                """,
+                (RUNNING, owner, now + lease_seconds, now, row[0], QUEUED, now, RUNNING, now)
+            ).rowcount
+            if not claimed:
+                return None
+
+            row = self._connection.execute(
+                f"SELECT {self.COLUMNS} FROM jobs WHERE id = ?", (row[0],)
+            ).fetchone()
+
+        return self._job(row)
+
+    def renew(self, job_id, owner, lease_seconds):
+        """Extend a running job's lease, returning False when owner no longer holds it"""
+        now = time.time()
+        with self._lock, self._connection:
+            return self._connection.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (now + lease_seconds, now, job_id, owner, RUNNING)
+            ).rowcount == 1
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job, returning False when it had already finished"""
+        now = time.time()
+        with self._lock, self._connection:
+            return self._connection.execute(
+                """
+                UPDATE jobs SET status = ?, owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ? AND status IN (?, ?)
+                """,
+                (CANCELLED, now, job_id, QUEUED, RUNNING)
+            ).rowcount == 1
+
+    def complete(self, job_id, result):
+        """Store a job's result, returning False when it already had one or was cancelled"""
+        now = time.time()
+        with self._lock, self._connection:
+            return self._connection.execute(
+                """
+                UPDATE jobs SET status = ?, result = ?, error = NULL, owner = NULL, lease_expires = NULL,
+                    updated_at = ?
+                WHERE id = ? AND status NOT IN (?, ?)
+                """,
+                (DONE, result, now, job_id, DONE, CANCELLED)
+            ).rowcount == 1
+
+    def fail(self, job_id, owner, error, max_attempts, retry_delay):
+        """Record a failed attempt: queue the job again after retry_delay, or mark it failed
+
+        Returns the job's new status, or None when owner no longer held the job.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND owner = ? AND status = ?",
+                (job_id, owner, RUNNING)
+            ).fetchone()
+            if row is None:
+                return None
+
+            status = QUEUED if row[0] < max_attempts else FAILED
+            self._connection.execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, owner = NULL, lease_expires = NULL, available_at = ?,
+                    updated_at = ?
+                WHERE id = ?
+                """,
+                (status, error, now + retry_delay, now, job_id)
+            )
+        return status
+
+    def pending(self):
+        """Return the jobs that are queued or running, oldest first"""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {self.COLUMNS} FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (QUEUED, RUNNING)
+            ).fetchall()
+        return [self._job(row) for row in rows]
+
+    def prune(self, max_age_seconds):
+        """Delete finished jobs last updated more than max_age_seconds ago"""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?, ?) AND updated_at < ?",
+                (DONE, FAILED, CANCELLED, time.time() - max_age_seconds)
+            )
+
+    def stats(self):
+        """Return the number of jobs in each state"""
+        with self._lock:
+            rows = self._connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0, CANCELLED: 0}
+        counts.update(rows)
+        return counts
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._connection.close()
+
+
+class JobWorkerPool:
+    """Worker threads that lease jobs from a JobQueue and run them
+
+    handler(job) returns the result text or raises; a failed attempt is
+    retried with exponential backoff up to max_attempts, except a TimeoutError
+    (the request ran past its deadline), which fails the job straight away.
+    on_finished(job) is called from the worker thread once a job is done or
+    has failed for good; it is not called for a job cancelled while it ran.
+    """
+
+    def __init__(self, queue, handler, workers, lease_seconds=30.0, max_attempts=3,
+                 retry_delay=5.0, poll_interval=0.5, on_finished=None):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.on_finished = on_finished
+        self.owner_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Start the worker threads; jobs left over from a previous run are picked up too"""
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, args=(f"{self.owner_prefix}:{index}",), name=f"job-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def notify(self):
+        """Wake idle workers, e.g. right after enqueueing a job"""
+        self._wake.set()
+
+    def stop(self, timeout=1.0):
+        """Stop leasing new jobs; running jobs keep their lease and resume on the next start if cut off"""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _work(self, owner):
+        """Lease and run jobs until stopped"""
+        while not self._stop.is_set():
+            try:
+                job = self.queue.lease(owner, self.lease_seconds)
+            except sqlite3.Error as e:
+                logging.warning(f"Could not lease a job: {str(e)}")
+                job = None
+
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+
+            self._run(job, owner)
+
+    def _run(self, job, owner):
+        """Run one job while renewing its lease, then store the outcome"""
+        finished = threading.Event()
+
+        def renew_lease():
+            while not finished.wait(self.lease_seconds / 3):
+                if not self.queue.renew(job.id, owner, self.lease_seconds):
+                    return
+
+        threading.Thread(target=renew_lease, name=f"job-lease-{job.id[:8]}", daemon=True).start()
+        try:
+            result = self.handler(job)
+        except Exception as e:
+            finished.set()
+            error = str(e) or type(e).__name__
+            delay = self.retry_delay * 2 ** (job.attempts - 1)
+            max_attempts = job.attempts if isinstance(e, TimeoutError) else self.max_attempts
+            status = self.queue.fail(job.id, owner, error, max_attempts, delay)
+            if status is None:
+                logging.info(f"Job {job.id} ({job.method}) stopped: it was cancelled or leased elsewhere")
+                return
+            logging.warning(f"Job {job.id} ({job.method}) attempt {job.attempts} failed: {error}")
+            if status != FAILED:
+                return
+        else:
+            finished.set()
+            if not self.queue.complete(job.id, result):
+                logging.info(f"Job {job.id} already had a result or was cancelled; dropping this one")
+                return
+
+        if self.on_finished:
+            self.on_finished(self.queue.get(job.id))
+
+
+def create_job_queue(config):
+    """Open the job queue described by the config, dropping old finished jobs"""
+    queue = JobQueue(config.JOB_QUEUE_PATH)
+    queue.prune(config.JOB_RETENTION_SECONDS)
+    return queue
@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+
+from .rate_limiter import RETRYABLE_STATUS_CODES, RateLimitExceeded, estimate_tokens, is_retryable
+
+# Calls a tier needs in its recent window before its error rate or latency can shift traffic
+MIN_SAMPLES = 5
+
+
+def can_fall_back(error):
+    """Return True for failures another tier might not have: timeouts, quota and transient server errors
+
+    Anything else, such as a bad request or a cancelled call, would fail the
+    same way on every tier and is raised as it is.
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, RateLimitExceeded)):
+        return True
+    # HTTP errors from the LLM gateway carry the response they failed on
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES
+    return is_retryable(error)
+
+
+class ModelRouter:
+    """Picks a Gemini model per request from a ladder of tiers, lightest first
+
+    Each tier is a dict with a 'model' and optionally the 'methods' it takes
+    (all when omitted), the largest prompt it takes ('max_prompt_tokens') and
+    the p95 latency above which traffic moves on ('max_p95_seconds'). A
+    request goes to the lightest tier that takes its method and prompt size,
+    unless that tier's recent error rate or latency is too high. If a call
+    times out or hits a quota or server error, the next heavier tier is tried. Statistics age out,
+    so a skipped tier gets traffic again once it has been quiet for a while.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, ladder, tier_timeout=None, max_error_rate=0.25, window=50, max_age=300):
+        self.ladder = list(ladder)
+        self.tier_timeout = tier_timeout
+        self.max_error_rate = max_error_rate
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        # (finished_at, seconds, ok) for each recent call, per model
+        self._calls = defaultdict(lambda: deque(maxlen=window))
+        self._routed = defaultdict(int)
+        self._fallbacks = defaultdict(int)
+
+    @classmethod
+    def shared(cls, config):
+        """Return the process-wide router; with routing disabled every request uses GEMINI_MODEL"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                if config.MODEL_ROUTING_ENABLED:
+                    cls._shared = cls(
+                        config.MODEL_LADDER,
+                        tier_timeout=config.MODEL_TIER_TIMEOUT,
+                        max_error_rate=config.MODEL_MAX_ERROR_RATE,
+                        window=config.MODEL_STATS_WINDOW,
+                        max_age=config.MODEL_STATS_MAX_AGE
+                    )
+                else:
+                    cls._shared = cls([{"model": config.GEMINI_MODEL}])
+            return cls._shared
+
+    def _recent(self, model):
+        """Calls to model within the last max_age seconds (caller holds the lock)"""
+        cutoff = time.time() - self.max_age
+        return [call for call in self._calls[model] if call[0] >= cutoff]
+
+    def _health(self, model):
+        """Return (calls, error rate, p95 seconds of successful calls) over the recent window"""
+        with self._lock:
+            calls = self._recent(model)
+        if not calls:
+            return 0, 0.0, None
+        errors = sum(1 for _, _, ok in calls if not ok)
+        latencies = sorted(seconds for _, seconds, ok in calls if ok)
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] if latencies else None
+        return len(calls), errors / len(calls), p95
+
+    def _skip_reason(self, tier):
+        """Why traffic should move past a tier right now, or None when it is healthy"""
+        calls, error_rate, p95 = self._health(tier["model"])
+        if calls < MIN_SAMPLES:
+            return None
+        if error_rate > self.max_error_rate:
+            return f"{tier['model']} error rate {error_rate:.0%}"
+        if tier.get("max_p95_seconds") and p95 is not None and p95 > tier["max_p95_seconds"]:
+            return f"{tier['model']} p95 {p95:.1f}s"
+        return None
+
+    def _eligible(self, method, prompt):
+        """Return the tiers that may answer a request: the one its method and size go to, then heavier ones"""
+        tokens = estimate_tokens(prompt)
+        tiers = [
+            tier for tier in self.ladder
+            if not tier.get("max_prompt_tokens") or tokens <= tier["max_prompt_tokens"]
+        ] or self.ladder[-1:]
+
+        chosen = next(
+            (index for index, tier in enumerate(tiers) if not tier.get("methods") or method in tier["methods"]),
+            len(tiers) - 1
+        )
+        return tokens, tiers[chosen:]
+
+    def candidates(self, method, prompt):
+        """Return every model that may answer a request, lightest first, whatever the tiers' health
+
+        A response cached from any of them is good enough for the request.
+        """
+        return [tier["model"] for tier in self._eligible(method, prompt)[1]]
+
+    def route(self, method, prompt):
+        """Return the models to try for a request: the chosen tier, then heavier fallbacks"""
+        tokens, tiers = self._eligible(method, prompt)
+        chosen = 0
+        reasons = []
+        while chosen < len(tiers) - 1:
+            reason = self._skip_reason(tiers[chosen])
+            if reason is None:
+                break
+            reasons.append(reason)
+            chosen += 1
+
+        models = [tier["model"] for tier in tiers[chosen:]]
+        if len(self.ladder) > 1:
+            logging.info(
+                f"Routing {method} (~{tokens} tokens) to {models[0]}"
+                + (f" (skipped: {', '.join(reasons)})" if reasons else "")
+            )
+        return models
+
+    def record(self, model, seconds, ok):
+        """Record the outcome of one call to a tier"""
+        with self._lock:
+            self._calls[model].append((time.time(), seconds, ok))
+
+    def call(self, method, prompt, on_chunk, attempt):
+        """Run attempt(model, on_chunk, timeout) on the routed tier, falling back to heavier tiers
+
+        Tiers with a fallback left get tier_timeout, so a stuck call moves on
+        quickly; the last tier is called with timeout None. A streamed response that already sent text is not retried
+        elsewhere, since the text would be shown twice.
+        """
+        models = self.route(method, prompt)
+        streamed = []
+
+        def forward(text):
+            streamed.append(True)
+            on_chunk(text)
+
+        for index, model in enumerate(models):
+            last = index == len(models) - 1
+            timeout = None if last else self.tier_timeout
+            started = time.perf_counter()
+            try:
+                text = attempt(model, forward if on_chunk else None, timeout)
+            except Exception as e:
+                seconds = time.perf_counter() - started
+                self.record(model, seconds, False)
+                if last or streamed or not can_fall_back(e):
+                    raise
+                self._fall_back(method, models, index, seconds, e)
+                continue
+            self._succeeded(method, model, time.perf_counter() - started)
+            return text
+
+    async def call_async(self, method, prompt, on_chunk, make_coro):
+        """Async counterpart of call(); make_coro(model, on_chunk, timeout) returns a fresh coroutine"""
+        models = self.route(method, prompt)
+        streamed = []
+
+        def forward(text):
+            streamed.append(True)
+            on_chunk(text)
+
+        for index, model in enumerate(models):
+            last = index == len(models) - 1
+            timeout = None if last else self.tier_timeout
+            started = time.perf_counter()
+            try:
+                text = await make_coro(model, forward if on_chunk else None, timeout)
+            except Exception as e:
+                seconds = time.perf_counter() - started
+                self.record(model, seconds, False)
+                if last or streamed or not can_fall_back(e):
+                    raise
+                self._fall_back(method, models, index, seconds, e)
+                continue
+            self._succeeded(method, model, time.perf_counter() - started)
+            return text
+
+    def _succeeded(self, method, model, seconds):
+        """Record and log a successful call"""
+        self.record(model, seconds, True)
+        with self._lock:
+            self._routed[model] += 1
+        if len(self.ladder) > 1:
+            logging.info(f"{method} answered by {model} in {seconds:.2f}s")
+
+    def _fall_back(self, method, models, index, seconds, error):
+        """Count and log a failed call that moves on to the next tier"""
+        with self._lock:
+            self._fallbacks[models[index]] += 1
+        logging.warning(
+            f"{method} failed on {models[index]} after {seconds:.2f}s ({str(error)[:80]}), "
+            f"falling back to {models[index + 1]}"
+        )
+
+    def stats(self):
+        """Return per-tier answered and fallback counts with recent error rate and p50/p95 latency"""
+        stats = {}
+        for tier in self.ladder:
+            model = tier["model"]
+            calls, error_rate, p95 = self._health(model)
+            with self._lock:
+                latencies = sorted(seconds for _, seconds, ok in self._recent(model) if ok)
+                stats[model] = {
+                    "answered": self._routed[model],
+                    "fallbacks": self._fallbacks[model],
+                    "recent_calls": calls,
+                    "error_rate": round(error_rate, 3),
+                    "p50": round(latencies[len(latencies) // 2], 3) if latencies else None,
+                    "p95": round(p95, 3) if p95 is not None else None
+                }
+        return stats
@@ -0,0 +1,168 @@
+import logging
+import re
+import textwrap
+import threading
+
+from .rate_limiter import estimate_tokens
+
+# Matches estimate_tokens(): roughly four characters per token
+CHARS_PER_TOKEN = 4
+
+# Fields are never cut below this, even when the budget cannot otherwise be met
+MIN_FIELD_TOKENS = 16
+
+TRUNCATION_MARKER = " [...]"
+
+INLINE_WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+BLANK_LINE_RUNS = re.compile(r"\n{3,}")
+# Blank lines in front of list items ("1. ...", "- ...") add tokens but no structure
+BLANK_BEFORE_LIST_ITEM = re.compile(r"\n\n+(?=[ ]*(?:\d+\.|-) )")
+
+
+def compact_template(template):
+    """Strip a prompt template's source indentation, trailing spaces and extra blank lines"""
+    lines = [line.rstrip() for line in textwrap.dedent(template).strip().splitlines()]
+    text = BLANK_LINE_RUNS.sub("\n\n", "\n".join(lines))
+    return BLANK_BEFORE_LIST_ITEM.sub("\n", text)
+
+
+def compact_field(value):
+    """Collapse runs of spaces and blank lines in a user-entered field"""
+    lines = [INLINE_WHITESPACE.sub(" ", line).strip() for line in value.splitlines()]
+    return BLANK_LINE_RUNS.sub("\n\n", "\n".join(lines)).strip()
+
+
+def truncate_text(text, max_tokens):
+    """Shorten text to about max_tokens, cutting at a sentence or word boundary"""
+    limit = max(0, max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER))
+    if len(text) <= limit:
+        return text
+
+    cut = text[:limit]
+    boundary = max(cut.rfind(". "), cut.rfind("\n"))
+    if boundary < limit * 0.8:
+        boundary = cut.rfind(" ")
+    if boundary > 0:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + TRUNCATION_MARKER
+
+
+def fit_fields(fields, max_tokens):
+    """Truncate the longest string fields until together they fit in max_tokens
+
+    The fields are cut down to a common cap, lowered only as far as needed, so a
+    pasted job description is shortened long before a job title is touched.
+    """
+    sizes = {key: estimate_tokens(value) for key, value in fields.items() if isinstance(value, str)}
+    excess = sum(sizes.values()) - max_tokens
+    if excess <= 0:
+        return fields
+
+    # Water-filling: find the cap at which the parts above it add up to the excess
+    ordered = sorted(sizes.values(), reverse=True)
+    cap = 0
+    total = 0
+    for count, size in enumerate(ordered, start=1):
+        total += size
+        next_size = ordered[count] if count < len(ordered) else 0
+        cap = (total - excess) / count
+        if cap >= next_size:
+            break
+    cap = max(int(cap), MIN_FIELD_TOKENS)
+
+    return {
+        key: truncate_text(value, cap) if key in sizes and sizes[key] > cap else value
+        for key, value in fields.items()
+    }
+
+
+class PromptBudget:
+    """Builds compact prompts within a per-method input-token budget
+
+    Template indentation is stripped, user fields have their whitespace
+    collapsed, and when a prompt would still exceed its method's budget the
+    longest user fields are truncated to fit. Every prompt's estimated size
+    is compared with what the raw template would have sent and the savings
+    are logged and counted.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, budgets=None, default_budget=2000):
+        self.budgets = dict(budgets or {})
+        self.default_budget = default_budget
+        self._lock = threading.Lock()
+        self._prompts = 0
+        self._truncated = 0
+        self._raw_tokens = 0
+        self._sent_tokens = 0
+
+    @classmethod
+    def shared(cls, config):
+        """Return the process-wide budget, created from Config on first use"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(config.PROMPT_TOKEN_BUDGETS, config.PROMPT_TOKEN_BUDGET)
+            return cls._shared
+
+    def budget(self, method):
+        """Input-token budget for a method"""
+        return self.budgets.get(method, self.default_budget)
+
+    def build(self, method, template, fields):
+        """Format a str.format template with the fields, compacted and within budget"""
+        raw_tokens = estimate_tokens(template.format(**fields))
+        compact = compact_template(template)
+        return self.render(method, lambda values: compact.format(**values), fields, raw_tokens)
+
+    def render(self, method, render, fields, raw_tokens=None):
+        """Build a prompt with render(fields), truncating the longest fields to fit the budget
+
+        Only the fields passed in are compacted or truncated; pass the ones the
+        prompt actually shows.
+        """
+        if raw_tokens is None:
+            raw_tokens = estimate_tokens(render(fields))
+        fields = {key: compact_field(value) if isinstance(value, str) else value for key, value in fields.items()}
+        prompt = render(fields)
+        budget = self.budget(method)
+        truncated = estimate_tokens(prompt) > budget
+
+        if truncated:
+            empty = {key: "" if isinstance(value, str) else value for key, value in fields.items()}
+            allowance = budget - estimate_tokens(render(empty))
+            # Further passes cover text the template derives from the fields
+            # (e.g. keywords computed from the requirements)
+            for _ in range(3):
+                prompt = render(fit_fields(fields, allowance))
+                over = estimate_tokens(prompt) - budget
+                if over <= 0:
+                    break
+                allowance -= over
+            else:
+                logging.warning(f"{method} prompt is still over its {budget} token budget")
+
+        sent_tokens = estimate_tokens(prompt)
+        with self._lock:
+            self._prompts += 1
+            self._truncated += truncated
+            self._raw_tokens += raw_tokens
+            self._sent_tokens += sent_tokens
+
+        logging.info(
+            f"{method} prompt: ~{sent_tokens} input tokens, ~{raw_tokens - sent_tokens} saved"
+            + (f" (fields truncated to the {budget} token budget)" if truncated else "")
+        )
+        return prompt
+
+    def stats(self):
+        """Return prompt counts and estimated input tokens before and after compaction"""
+        with self._lock:
+            return {
+                "prompts": self._prompts,
+                "truncated": self._truncated,
+                "raw_tokens": self._raw_tokens,
+                "sent_tokens": self._sent_tokens,
+                "saved_tokens": self._raw_tokens - self._sent_tokens
+            }
@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+
+# HTTP status codes worth retrying: quota exhaustion and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request still fails with a quota/server error after all retries"""
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate
+
+    reserve() always succeeds and returns how long the caller has to wait, so
+    the same bucket serves blocking threads and asyncio tasks alike.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens accumulated since the last update (caller holds the lock)"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount=1):
+        """Take tokens, returning the seconds to wait before they are actually available"""
+        with self._lock:
+            self._refill()
+            self.tokens -= min(amount, self.capacity)
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def available(self):
+        """Fraction of the bucket currently available (0 while callers are waiting for tokens)"""
+        with self._lock:
+            self._refill()
+            return max(0.0, self.tokens) / self.capacity
+
+    def adjust(self, amount):
+        """Charge (positive) or refund (negative) tokens after the real cost is known"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+def estimate_tokens(text):
+    """Cheap local token estimate (roughly four characters per token)"""
+    return max(1, len(text) // 4)
+
+
+def retry_after_seconds(error):
+    """Extract a server-provided retry delay from an API error, if any"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    if headers.get("Retry-After"):
+        try:
+            return float(headers["Retry-After"])
+        except ValueError:
+            pass
+
+    # Gemini reports RetryInfo as "retry_delay { seconds: N }" or "Please retry in Ns"
+    message = str(error)
+    match = re.search(r"retry_delay\s*\{\s*seconds:\s*(\d+)", message)
+    if not match:
+        match = re.search(r"retry in ([\d.]+)\s*s", message, re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+
+def is_retryable(error):
+    """Return True for quota (429) and transient server (5xx) errors"""
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS_CODES
+
+    message = str(error)
+    return "429" in message or "Resource has been exhausted" in message or "quota" in message.lower()
+
+
+class RateLimiter:
+    """Client-side rate limiting shared by every Gemini call in the process
+
+    Combines request and token buckets sized from Config, a semaphore capping
+    in-flight calls, and exponential backoff with jitter for 429/5xx errors.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, requests_per_minute, tokens_per_minute, max_concurrent,
+                 max_retries=4, base_delay=1.0, max_delay=60.0, expected_output_tokens=1024):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.expected_output_tokens = expected_output_tokens
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._stats_lock = threading.Lock()
+        self.throttled = 0
+        self.retries = 0
+        self.wait_seconds = 0.0
+
+    @classmethod
+    def shared(cls, config):
+        """Return the process-wide limiter configured from Config"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(
+                    config.RATE_LIMIT_REQUESTS_PER_MINUTE,
+                    config.RATE_LIMIT_TOKENS_PER_MINUTE,
+                    config.MAX_CONCURRENT_REQUESTS,
+                    max_retries=config.RETRY_MAX_ATTEMPTS,
+                    base_delay=config.RETRY_BASE_DELAY,
+                    max_delay=config.RETRY_MAX_DELAY,
+                    expected_output_tokens=config.RATE_LIMIT_EXPECTED_OUTPUT_TOKENS
+                )
+            return cls._shared
+
+    def _reserve(self, estimated_tokens):
+        """Reserve one request and the estimated tokens, returning the wait in seconds"""
+        wait = max(
+            self.request_bucket.reserve(1),
+            self.token_bucket.reserve(estimated_tokens)
+        )
+        if wait > 0:
+            with self._stats_lock:
+                self.throttled += 1
+                self.wait_seconds += wait
+        return wait
+
+    def _backoff(self, attempt, error):
+        """Exponential backoff with full jitter, never shorter than the server's hint"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        hint = retry_after_seconds(error)
+        if hint is not None:
+            delay = max(delay, min(hint, self.max_delay))
+
+        with self._stats_lock:
+            self.retries += 1
+            self.wait_seconds += delay
+        return delay
+
+    def headroom(self):
+        """Fraction of the request and token quota currently unused, whichever is lower"""
+        return min(self.request_bucket.available(), self.token_bucket.available())
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """Reconcile the token bucket once the real size of a call is known"""
+        self.token_bucket.adjust(actual_tokens - estimated_tokens)
+
+    def call(self, fn, prompt, max_retries=None):
+        """Run fn() under the rate limits, retrying quota and server errors
+
+        max_retries overrides the configured retry count, e.g. 0 for a caller
+        that would rather fall back to another model than wait.
+        """
+        estimated = estimate_tokens(prompt) + self.expected_output_tokens
+        max_retries = self.max_retries if max_retries is None else max_retries
+
+        for attempt in range(max_retries + 1):
+            time.sleep(self._reserve(estimated))
+
+            with self._slots:
+                try:
+                    result = fn()
+                except Exception as e:
+                    if not is_retryable(e):
+                        raise
+                    error = e
+                else:
+                    self.record_usage(estimated, estimate_tokens(prompt) + estimate_tokens(result))
+                    return result
+
+            if attempt == max_retries:
+                break
+            delay = self._backoff(attempt, error)
+            logging.warning(f"Gemini call failed ({str(error)[:80]}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+        raise RateLimitExceeded(f"Gemini is rate limiting or unavailable, please try again shortly ({str(error)[:120]})")
+
+    async def call_async(self, make_coro, prompt, max_retries=None):
+        """Async counterpart of call(); make_coro() must return a fresh coroutine per attempt"""
+        estimated = estimate_tokens(prompt) + self.expected_output_tokens
+        max_retries = self.max_retries if max_retries is None else max_retries
+
+        for attempt in range(max_retries + 1):
+            await asyncio.sleep(self._reserve(estimated))
+
+            # Share the in-flight cap with threaded callers without blocking the loop
+            while not self._slots.acquire(blocking=False):
+                await asyncio.sleep(0.05)
+            try:
+                result = await make_coro()
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                error = e
+            else:
+                self.record_usage(estimated, estimate_tokens(prompt) + estimate_tokens(result))
+                return result
+            finally:
+                self._slots.release()
+
+            if attempt == max_retries:
+                break
+            delay = self._backoff(attempt, error)
+            logging.warning(f"Gemini call failed ({str(error)[:80]}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        raise RateLimitExceeded(f"Gemini is rate limiting or unavailable, please try again shortly ({str(error)[:120]})")
+
+    def stats(self):
+        """Return throttling and retry counters"""
+        with self._stats_lock:
+            return {
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "wait_seconds": round(self.wait_seconds, 2)
+            }
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """Persistent SQLite cache for Gemini responses with TTL and LRU eviction"""
+
+    def __init__(self, path, ttl_seconds=86400, max_entries=500):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._create_table()
+
+    def _create_table(self):
+        """Create the cache table if it does not exist yet"""
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    method TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_accessed ON responses (last_accessed)"
+            )
+
+    @staticmethod
+    def normalize(value):
+        """Normalize an input value so trivial whitespace/case edits share a cache entry"""
+        if isinstance(value, dict):
+            return {key: ResponseCache.normalize(value[key]) for key in sorted(value)}
+        if isinstance(value, (list, tuple)):
+            return [ResponseCache.normalize(item) for item in value]
+        if isinstance(value, str):
+            return " ".join(value.split()).casefold()
+        return value
+
+    @staticmethod
+    def make_key(model, method, inputs):
+        """Build a stable cache key from the model name, method and normalized inputs"""
+        payload = json.dumps(
+            {"model": model, "method": method, "inputs": ResponseCache.normalize(inputs)},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, model, method, inputs):
+        """Return a cached response, or None when missing or expired"""
+        return self.get_any([model], method, inputs)
+
+    def get_any(self, models, method, inputs):
+        """Return the response cached for the first of models that has one, or None
+
+        Counts as a single hit or miss however many models are checked.
+        """
+        now = time.time()
+
+        with self._lock, self._connection:
+            for model in models:
+                key = self.make_key(model, method, inputs)
+                row = self._connection.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    continue
+
+                response, created_at = row
+                if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                    self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    continue
+
+                self._connection.execute(
+                    "UPDATE responses SET last_accessed = ? WHERE key = ?", (now, key)
+                )
+                self.hits += 1
+                return response
+
+            self.misses += 1
+            return None
+
+    def set(self, model, method, inputs, response):
+        """Store a response and evict the least recently used entries over the size cap"""
+        key = self.make_key(model, method, inputs)
+        now = time.time()
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO responses (key, model, method, response, created_at, last_accessed)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, method, response, now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop expired entries and trim the table down to max_entries (caller holds the lock)"""
+        if self.ttl_seconds:
+            self._connection.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+
+        if self.max_entries:
+            self._connection.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def stats(self):
+        """Return hit/miss counters and the current number of entries"""
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            total = self.hits + self.misses
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": entries
+            }
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._connection.close()
+
+
+def create_cache(config):
+    """Create the response cache described by the config, or None when disabled"""
+    if not config.CACHE_ENABLED:
+        return None
+
+    try:
+        return ResponseCache(
+            config.CACHE_PATH,
+            ttl_seconds=config.CACHE_TTL_SECONDS,
+            max_entries=config.CACHE_MAX_ENTRIES
+        )
+    except sqlite3.Error as e:
+        logging.warning(f"Response cache disabled: {str(e)}")
+        return None
@@ -0,0 +1,193 @@
+JSON_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+# Stands in for a section's body when splitting its rendering into prefix and suffix
+BODY_MARKER = "\0"
+
+
+class SectionStream:
+    """Write a structured reply as markdown while its JSON streams in
+
+    The reply is a flat JSON object of section strings. Each value is decoded
+    as it arrives and written through render() in `order`: sections already
+    known (`ready`) are written as they are, right away, and a section the
+    model sends early is held until the ones before it are done. Streamed
+    values are trimmed the way parse_sections() trims them, so the text
+    written matches the final to_markdown(). Subclasses define render().
+    """
+
+    separator = "\n\n"
+    # Leave out sections whose body is empty, heading included
+    skip_empty = False
+
+    def __init__(self, order, ready, missing, on_chunk):
+        self.on_chunk = on_chunk
+        self.order = list(order)
+        self.ready = dict(ready)
+        self.bodies = {name: [] for name in missing}
+        self.complete = set()
+        self.position = 0
+        self.written = False
+        self.entered = False
+        self.prefix_written = False
+        self.body_started = False
+        self.pending_space = ""
+        self.suffix = ""
+
+        # JSON scanner state
+        self._state = "start"
+        self._key = []
+        self._field = None
+        self._escape = ""
+        self._high_surrogate = None
+        self._advance()
+
+    def render(self, name, body):
+        """Return a section's markdown with the given body"""
+        raise NotImplementedError
+
+    def feed(self, chunk):
+        """Consume the next chunk of the JSON reply"""
+        index = 0
+        while index < len(chunk):
+            if self._state == "string" and not self._escape:
+                # Copy a run of plain characters in one go
+                end = index
+                while end < len(chunk) and chunk[end] not in '"\\':
+                    end += 1
+                if end > index:
+                    self._string_text(chunk[index:end])
+                    index = end
+                    continue
+
+            self._scan(chunk[index])
+            index += 1
+
+    def _scan(self, char):
+        """Advance the scanner by one character outside a plain-text run"""
+        if self._state == "start":
+            if char == "{":
+                self._state = "key_or_end"
+        elif self._state == "key_or_end":
+            if char == '"':
+                self._state, self._field, self._key = "string", None, []
+            elif char == "}":
+                self._state = "done"
+        elif self._state == "colon":
+            if char == ":":
+                self._state = "value"
+        elif self._state == "value":
+            if char == '"':
+                self._state = "string"
+            elif not char.isspace():
+                # Not a string; skip it (the schemas only ask for strings)
+                self._state = "other"
+        elif self._state == "other":
+            if char == ",":
+                self._state, self._field = "key_or_end", None
+            elif char == "}":
+                self._state = "done"
+        elif self._state == "string":
+            if self._escape:
+                self._escape += char
+                if self._escape[1] != "u":
+                    self._string_text(JSON_ESCAPES.get(char, char))
+                    self._escape = ""
+                elif len(self._escape) == 6:
+                    self._string_text(self._decode_unicode_escape(self._escape))
+                    self._escape = ""
+            elif char == "\\":
+                self._escape = char
+            elif char == '"':
+                self._end_string()
+
+    def _decode_unicode_escape(self, escape):
+        """Decode a \\uXXXX escape, joining surrogate pairs"""
+        code = int(escape[2:], 16)
+        if 0xD800 <= code < 0xDC00:
+            self._high_surrogate = code
+            return ""
+        if self._high_surrogate is not None and 0xDC00 <= code < 0xE000:
+            code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+        self._high_surrogate = None
+        return chr(code)
+
+    def _string_text(self, text):
+        """Route decoded string text to the key being read or the section being written"""
+        if self._field is None:
+            self._key.append(text)
+        elif self._field in self.bodies and self._field not in self.complete:
+            self.bodies[self._field].append(text)
+            if self.position < len(self.order) and self._field == self.order[self.position]:
+                self._write_body(text)
+
+    def _end_string(self):
+        """Finish a key, or finish a section value"""
+        if self._field is None:
+            self._field = "".join(self._key)
+            self._state = "colon"
+            return
+
+        if self._field in self.bodies and self._field not in self.complete:
+            self.complete.add(self._field)
+            self._advance()
+        self._state, self._field = "key_or_end", None
+
+    def _emit(self, text):
+        """Pass text on, skipping empty writes"""
+        if text:
+            self.on_chunk(text)
+
+    def _start_section(self, name):
+        """Write the separator and the part of the section before its body"""
+        prefix, self.suffix = self.render(name, BODY_MARKER).split(BODY_MARKER)
+        self._emit((self.separator if self.written else "") + prefix)
+        self.written = True
+        self.prefix_written = True
+
+    def _write_body(self, text):
+        """Write section text without its leading and trailing whitespace"""
+        if not self.body_started:
+            text = text.lstrip()
+            if not text:
+                return
+            self.body_started = True
+            if not self.prefix_written:
+                self._start_section(self.order[self.position])
+
+        stripped = text.rstrip()
+        if stripped:
+            self._emit(self.pending_space + stripped)
+            self.pending_space = text[len(stripped):]
+        else:
+            self.pending_space += text
+
+    def _end_section(self):
+        """Close the current section and move on to the next one"""
+        if self.prefix_written:
+            self._emit(self.suffix)
+        self.position += 1
+        self.entered = False
+        self.prefix_written = False
+        self.body_started = False
+        self.pending_space = ""
+
+    def _advance(self):
+        """Write every section that is ready, then start the one being waited on"""
+        while self.position < len(self.order):
+            name = self.order[self.position]
+            if name in self.ready:
+                content = self.ready[name]
+                if content or not self.skip_empty:
+                    self._start_section(name)
+                    self._emit(content)
+                self._end_section()
+                continue
+
+            if not self.entered:
+                self.entered = True
+                if not self.skip_empty:
+                    self._start_section(name)
+                self._write_body("".join(self.bodies[name]))
+            if name not in self.complete:
+                return
+            self._end_section()
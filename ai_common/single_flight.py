@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import threading
+
+
+class _Call:
+    """An in-flight call that duplicate callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _AsyncCall:
+    """An in-flight asyncio task shared by duplicate callers"""
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent identical requests into one underlying call
+
+    Callers that arrive while a call with the same key is in flight wait for
+    it and receive the same result (or exception) instead of sending their own.
+    Threaded and asyncio callers are tracked separately.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+        self.executed = 0
+        self.suppressed = 0
+
+    @classmethod
+    def shared(cls):
+        """Return the process-wide single-flight group"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def make_key(model, prompt):
+        """Key a request by model and whitespace-normalized prompt"""
+        normalized = " ".join(prompt.split())
+        return hashlib.sha256(f"{model}\n{normalized}".encode("utf-8")).hexdigest()
+
+    def do(self, key, fn):
+        """Run fn() unless an identical call is in flight; returns (result, shared)"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.suppressed += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+    async def do_async(self, key, make_coro):
+        """Async counterpart of do(); returns (result, shared)
+
+        The shared task is only cancelled once every caller waiting on it has
+        been cancelled, so one caller giving up does not fail the others.
+        """
+        call = self._async_calls.get(key)
+        shared = call is not None
+
+        with self._lock:
+            if shared:
+                self.suppressed += 1
+            else:
+                self.executed += 1
+
+        if not shared:
+            call = self._async_calls[key] = _AsyncCall(asyncio.ensure_future(make_coro()))
+            call.task.add_done_callback(
+                lambda _: self._async_calls.pop(key, None) if self._async_calls.get(key) is call else None
+            )
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def stats(self):
+        """Return how many calls were executed and how many duplicates were suppressed"""
+        with self._lock:
+            return {"executed": self.executed, "suppressed": self.suppressed}
@@ -0,0 +1,237 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+
+# Bump when the compiled layout changes so old caches are rebuilt
+AUTOMATON_FORMAT = 2
+
+SKILL_SEPARATORS = re.compile(r"[,;\n|•]+")
+
+
+def _is_word_char(char):
+    """Whether a character continues a word (so a match next to it is not a whole word)"""
+    return char.isalnum() or char == "_"
+
+
+class SkillTaxonomy:
+    """Extracts and normalizes skills from free text with an Aho-Corasick automaton
+
+    Every skill name and alias in the bundled taxonomy ("k8s" -> "Kubernetes",
+    "JS" -> "JavaScript") is compiled into one automaton, so extraction is a
+    single pass over the text however long it is. The compiled automaton is
+    saved as JSON next to the taxonomy and reused until the taxonomy changes.
+
+    Aliases listed as ambiguous (e.g. "go", "r") are only recognized when a
+    skills list item consists of just that word, never inside running text.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, taxonomy_path=TAXONOMY_PATH, cache_path=None):
+        with open(taxonomy_path, "rb") as handle:
+            source = handle.read()
+        taxonomy = json.loads(source)
+        digest = hashlib.sha256(source).hexdigest()
+
+        self.canonical = {}
+        for name, aliases in taxonomy["skills"].items():
+            for alias in [name] + aliases:
+                self.canonical[alias.casefold()] = name
+        self.ambiguous = {alias.casefold() for alias in taxonomy.get("ambiguous", [])}
+
+        patterns = [pattern for pattern in self.canonical if pattern not in self.ambiguous]
+        compiled = self._load_cache(cache_path, digest, set(patterns))
+        if compiled is None:
+            compiled = self._compile(patterns)
+            self._save_cache(cache_path, digest, compiled)
+        self._goto, self._fail, self._output = compiled
+
+    @classmethod
+    def shared(cls, config):
+        """Return the process-wide taxonomy, loading it on first use"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(cache_path=config.SKILL_TAXONOMY_CACHE_PATH)
+            return cls._shared
+
+    @staticmethod
+    def _compile(patterns):
+        """Build the goto, failure and output tables for the patterns"""
+        goto = [{}]
+        output = [[]]
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto.append({})
+                    output.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            output[state].append(pattern)
+
+        # Breadth-first so each state's failure link is resolved before its children's
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(char, 0) if state else 0
+                output[child] = output[child] + output[fail[child]]
+
+        return goto, fail, output
+
+    @staticmethod
+    def _load_cache(cache_path, digest, patterns):
+        """Return the cached automaton when it was compiled from this taxonomy and is well formed"""
+        if not cache_path or not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, "r", encoding="utf-8") as handle:
+                cached = json.load(handle)
+            if cached.get("format") != AUTOMATON_FORMAT or cached.get("digest") != digest:
+                return None
+            goto, fail, output = cached["goto"], cached["fail"], cached["output"]
+            if not SkillTaxonomy._is_valid_automaton(goto, fail, output, patterns):
+                raise ValueError("malformed automaton tables")
+            return goto, fail, output
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable skill taxonomy cache: {str(e)}")
+        return None
+
+    @staticmethod
+    def _is_valid_automaton(goto, fail, output, patterns):
+        """Whether cached tables are safe to search with
+
+        Every transition and failure link must point at a state, and every
+        output must be one of the taxonomy's patterns.
+        """
+        states = len(goto) if isinstance(goto, list) else 0
+        if not states or not isinstance(fail, list) or not isinstance(output, list):
+            return False
+        if len(fail) != states or len(output) != states:
+            return False
+        for edges in goto:
+            if not isinstance(edges, dict):
+                return False
+            for char, child in edges.items():
+                if len(char) != 1 or type(child) is not int or not 0 < child < states:
+                    return False
+        if any(type(link) is not int or not 0 <= link < states for link in fail):
+            return False
+        return all(
+            isinstance(matches, list) and all(match in patterns for match in matches) for matches in output
+        )
+
+    @staticmethod
+    def _save_cache(cache_path, digest, compiled):
+        """Write the compiled automaton atomically so a crash never leaves half a file"""
+        if not cache_path:
+            return
+        goto, fail, output = compiled
+        try:
+            with open(f"{cache_path}.tmp", "w", encoding="utf-8") as handle:
+                json.dump(
+                    {"format": AUTOMATON_FORMAT, "digest": digest, "goto": goto, "fail": fail, "output": output},
+                    handle,
+                    ensure_ascii=False,
+                    separators=(",", ":")
+                )
+            os.replace(f"{cache_path}.tmp", cache_path)
+        except OSError as e:
+            logging.warning(f"Could not cache the skill taxonomy automaton: {str(e)}")
+
+    def find(self, text):
+        """Return non-overlapping (start, end, skill) matches, preferring the longest"""
+        lowered = text.casefold()
+        goto, fail, output = self._goto, self._fail, self._output
+        candidates = []
+        state = 0
+
+        for position, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for pattern in output[state]:
+                start = position - len(pattern) + 1
+                end = position + 1
+                # Only whole words: "java" must not match inside "javascript"
+                if start > 0 and _is_word_char(lowered[start - 1]) and _is_word_char(pattern[0]):
+                    continue
+                if end < len(lowered) and _is_word_char(lowered[end]) and _is_word_char(pattern[-1]):
+                    continue
+                candidates.append((start, end, self.canonical[pattern]))
+
+        # Leftmost-longest, e.g. "machine learning" wins over "learning"
+        candidates.sort(key=lambda match: (match[0], match[0] - match[1]))
+        matches = []
+        covered = 0
+        for start, end, skill in candidates:
+            if start >= covered:
+                matches.append((start, end, skill))
+                covered = end
+        return matches
+
+    def extract(self, text):
+        """Return the distinct skills mentioned in the text, in order of first mention"""
+        return list(dict.fromkeys(skill for _, _, skill in self.find(text)))
+
+    def list_items(self, text):
+        """Yield (item, known skills) for each item of a comma/newline separated skills list"""
+        for item in SKILL_SEPARATORS.split(text):
+            # Only trailing dots go, so ".NET" keeps its leading one
+            item = " ".join(item.split()).rstrip(" .")
+            if item:
+                exact = self.canonical.get(item.casefold())
+                yield item, [exact] if exact else self.extract(item)
+
+    def known_skills(self, text):
+        """Return the distinct taxonomy skills in a skills list, including ambiguous ones such as Go"""
+        return self._dedupe(skill for _, found in self.list_items(text) for skill in found)
+
+    def compact_skills(self, text):
+        """Normalize a free-text skills list into a short, deduplicated, comma-separated list
+
+        Items that are just known skills or aliases ("k8s", "Python/Django")
+        become their canonical names. Items with more to them ("Python scripting
+        for automation") and items the taxonomy does not know are kept as
+        written (whitespace collapsed).
+        """
+        skills = []
+        for item, found in self.list_items(text):
+            if found and self._only_skills(item):
+                skills.extend(found)
+            else:
+                skills.append(item)
+        return ", ".join(self._dedupe(skills))
+
+    def _only_skills(self, item):
+        """Whether a skills list item names known skills and nothing else"""
+        lowered = item.casefold()
+        if lowered in self.canonical:
+            return True
+        for start, end, _ in reversed(self.find(lowered)):
+            lowered = lowered[:start] + " " + lowered[end:]
+        return not any(_is_word_char(char) for char in lowered)
+
+    @staticmethod
+    def _dedupe(skills):
+        """Drop repeated skills, ignoring case"""
+        seen = set()
+        unique = []
+        for skill in skills:
+            if skill.casefold() not in seen:
+                seen.add(skill.casefold())
+                unique.append(skill)
+        return unique
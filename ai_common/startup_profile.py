@@ -0,0 +1,52 @@
+import threading
+import time
+
+
+class StartupProfiler:
+    """Records named startup milestones and prints a timing breakdown
+
+    Import this module before anything else so its clock starts as early as
+    possible. Marks are always recorded; the report is only printed when
+    enabled (see --profile-startup).
+    """
+
+    def __init__(self, required=("first paint", "Gemini warm-up finished")):
+        self.started = time.perf_counter()
+        self.enabled = False
+        self.required = set(required)
+        self.marks = []
+        self.notes = []
+        self.reported = False
+        self._lock = threading.Lock()
+
+    def mark(self, label):
+        """Record a milestone, printing the report once every required one is in"""
+        with self._lock:
+            self.marks.append((label, time.perf_counter()))
+            ready = self.required.issubset(name for name, _ in self.marks)
+            if not (self.enabled and ready and not self.reported):
+                return
+            self.reported = True
+
+        self.report()
+
+    def note(self, label, seconds):
+        """Record a duration measured elsewhere, e.g. work done on a background thread"""
+        with self._lock:
+            self.notes.append((label, seconds))
+
+    def report(self):
+        """Print each milestone with its duration and time since startup"""
+        print("Startup profile")
+        print(f"{'phase':<32}{'step':>10}{'total':>10}")
+
+        previous = self.started
+        for label, at in self.marks:
+            print(f"{label:<32}{(at - previous) * 1000:>8.0f}ms{(at - self.started) * 1000:>8.0f}ms")
+            previous = at
+
+        for label, seconds in self.notes:
+            print(f"{label:<32}{seconds * 1000:>8.0f}ms{'':>10}")
+
+
+profiler = StartupProfiler()
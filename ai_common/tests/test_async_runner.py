@@ -0,0 +1,193 @@
+import asyncio
+import threading
+from concurrent.futures import CancelledError, Future
+
+import pytest
+
+from ai_common.async_runner import (
+    ActionLimitReached, ActionRunner, AsyncLoopThread, request_deadline, time_remaining, with_deadline
+)
+
+
+async def remaining():
+    return time_remaining()
+
+
+def test_deadline_is_visible_inside_the_request():
+    assert asyncio.run(with_deadline(remaining(), 30)) == pytest.approx(30, abs=1)
+
+
+def test_nested_deadline_keeps_the_earlier_one():
+    async def nested():
+        return await with_deadline(with_deadline(remaining(), 60), 10)
+
+    assert asyncio.run(nested()) == pytest.approx(10, abs=1)
+
+
+def test_deadline_does_not_leak_to_the_caller():
+    async def caller():
+        await with_deadline(remaining(), 30)
+        return request_deadline.get()
+
+    assert asyncio.run(caller()) is None
+
+
+def test_expiry_raises_timeout_error():
+    with pytest.raises(TimeoutError, match="timed out"):
+        asyncio.run(with_deadline(asyncio.sleep(1), 0.01))
+
+
+class UI:
+    """Stands in for UIDispatcher: runs posted callbacks at once"""
+
+    def __init__(self):
+        self.posted = []
+
+    def post(self, fn, *args):
+        self.posted.append(args)
+        fn(*args)
+
+
+@pytest.fixture
+def loop_thread():
+    loop_thread = AsyncLoopThread(max_workers=2).start()
+    yield loop_thread
+    loop_thread.stop()
+
+
+async def answer(value, delay=0):
+    await asyncio.sleep(delay)
+    return value
+
+
+def test_submitted_coroutine_runs_on_the_loop(loop_thread):
+    assert loop_thread.submit(answer("done")).result(timeout=5) == "done"
+
+
+def test_cancelling_a_request_cancels_its_task(loop_thread):
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    async def hang():
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    handle = loop_thread.start_request("tips", hang(), deadline=30)
+    assert started.wait(5)
+
+    assert handle.cancel()
+    assert cancelled.wait(5)
+    assert handle.cancelled()
+    with pytest.raises(CancelledError):
+        handle.result()
+
+
+def test_cancelling_a_finished_request_does_nothing(loop_thread):
+    handle = loop_thread.start_request("tips", answer("done"), deadline=30)
+
+    assert handle.result() == "done"
+    assert not handle.cancel()
+    assert not handle.cancelled()
+
+
+def test_request_past_its_deadline_raises_timeout_error(loop_thread):
+    handle = loop_thread.start_request("tips", answer("late", delay=5), deadline=0.05)
+
+    with pytest.raises(TimeoutError, match="timed out"):
+        handle.result()
+    assert handle.done() and not handle.cancelled()
+
+
+def test_results_and_errors_are_delivered_through_the_ui(loop_thread):
+    ui = UI()
+    results, errors = [], []
+
+    async def fail():
+        raise ValueError("bad prompt")
+
+    loop_thread.submit_to_tk(ui, answer("done"), results.append, errors.append).result(timeout=5)
+    failed = loop_thread.submit_to_tk(ui, fail(), results.append, errors.append)
+    with pytest.raises(ValueError):
+        failed.result(timeout=5)
+
+    assert results == ["done"]
+    assert [str(error) for error in errors] == ["bad prompt"]
+
+
+def test_cancelled_request_delivers_nothing(loop_thread):
+    ui = UI()
+    future = loop_thread.submit_to_tk(ui, answer("late", delay=60), ui.post, ui.post)
+    future.cancel()
+
+    with pytest.raises(CancelledError):
+        future.result(timeout=5)
+    assert ui.posted == []
+
+
+def test_stop_cancels_requests_in_flight():
+    loop_thread = AsyncLoopThread().start()
+    future = loop_thread.submit(answer("late", delay=60))
+
+    loop_thread.stop()
+
+    assert future.cancelled()
+
+
+def test_repeat_click_attaches_to_the_pending_action():
+    runner = ActionRunner(max_pending=2)
+    future = Future()
+
+    first, started = runner.run("tips", {"title": "Data Engineer"}, lambda action: future)
+    again, started_again = runner.run("tips", {"title": "Data Engineer"}, lambda action: Future())
+
+    assert started and not started_again
+    assert again is first
+    assert runner.stats() == {"started": 1, "attached": 1, "rejected": 0, "pending": 1}
+
+
+def test_finished_action_starts_afresh():
+    runner = ActionRunner(max_pending=2)
+    future = Future()
+    runner.run("tips", {"title": "Data Engineer"}, lambda action: future)
+
+    future.set_result("done")
+
+    assert runner.pending() == 0
+    assert runner.run("tips", {"title": "Data Engineer"}, lambda action: Future())[1]
+
+
+def test_cancelled_action_frees_its_slot():
+    runner = ActionRunner(max_pending=1)
+    future = Future()
+    runner.run("tips", {}, lambda action: future)
+
+    future.cancel()
+
+    assert runner.pending() == 0
+    assert runner.run("trends", {}, lambda action: Future())[1]
+
+
+def test_actions_past_the_limit_are_refused():
+    runner = ActionRunner(max_pending=2)
+    runner.run("tips", {}, lambda action: Future())
+    runner.run("trends", {}, lambda action: Future())
+
+    with pytest.raises(ActionLimitReached, match="2 requests are already running"):
+        runner.run("strategy", {}, lambda action: Future())
+    assert runner.stats()["rejected"] == 1
+
+
+def test_failed_start_releases_its_slot():
+    runner = ActionRunner(max_pending=1)
+
+    def start(action):
+        raise RuntimeError("client not ready")
+
+    with pytest.raises(RuntimeError):
+        runner.run("tips", {}, start)
+    assert runner.pending() == 0
+    assert runner.stats()["started"] == 0
@@ -0,0 +1,105 @@
+import pytest
+
+pytest.importorskip("httpx")
+requests = pytest.importorskip("requests")
+
+from ai_common.gateway_client import AsyncGatewayClient, GatewayClient, create_async_client, create_client
+from ai_common.rate_limiter import RateLimitExceeded
+
+
+class Config:
+    LLM_GATEWAY_URL = "http://gateway.test/"
+    LLM_GATEWAY_CONNECT_TIMEOUT = 1
+    LLM_GATEWAY_READ_TIMEOUT = 5
+
+
+class AppClient:
+    """Stands in for an app's GeminiClient"""
+
+    def __init__(self):
+        self.cache = "local cache"
+        self.section_cache = self.cache
+        self.rate_limiter = "rate limiter"
+        self._initialize_client()
+
+    def _initialize_client(self):
+        self.sdk_ready = True
+
+
+class AsyncAppClient:
+    def __init__(self, client=None):
+        self.client = client or AppClient()
+
+
+class Response:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.body = body or {}
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+def gateway_up(monkeypatch, status_code=200):
+    urls = []
+
+    def get(session, url, timeout):
+        urls.append(url)
+        if status_code is None:
+            raise requests.ConnectionError("refused")
+        return Response(status_code)
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    return urls
+
+
+def test_gateway_client_extends_the_app_client(monkeypatch):
+    urls = gateway_up(monkeypatch)
+
+    client = create_client(Config, AppClient)
+
+    assert isinstance(client, GatewayClient) and isinstance(client, AppClient)
+    assert urls == ["http://gateway.test/health"]
+    # Base attributes come from the app's __init__; the SDK setup is replaced by the health check
+    assert client.rate_limiter == "rate limiter"
+    assert not hasattr(client, "sdk_ready")
+    # Full responses are cached by the gateway, sections stay local
+    assert client.cache is None
+    assert client.section_cache == "local cache"
+
+
+def test_falls_back_to_the_app_client_when_the_gateway_is_down(monkeypatch):
+    gateway_up(monkeypatch, status_code=None)
+
+    client = create_client(Config, AppClient)
+
+    assert type(client) is AppClient
+    assert type(create_async_client(client, AsyncAppClient)) is AsyncAppClient
+
+
+def test_async_client_matches_the_client(monkeypatch):
+    gateway_up(monkeypatch)
+
+    async_client = create_async_client(create_client(Config, AppClient), AsyncAppClient)
+
+    assert isinstance(async_client, AsyncGatewayClient) and isinstance(async_client, AsyncAppClient)
+    assert async_client.config is Config
+
+
+@pytest.mark.parametrize("status_code, error", [(429, RateLimitExceeded), (504, TimeoutError)])
+def test_gateway_errors_map_to_router_errors(status_code, error):
+    with pytest.raises(error, match="busy"):
+        GatewayClient._raise_for_status(Response(status_code, {"detail": "busy"}))
+    with pytest.raises(error, match="busy"):
+        GatewayClient._final_text({"error": "busy", "status": status_code})
+
+
+def test_other_stream_errors_are_raised():
+    assert GatewayClient._final_text({"text": "done"}) == "done"
+    assert GatewayClient._final_text({"chunk": "partial"}) is None
+    with pytest.raises(RuntimeError, match="boom"):
+        GatewayClient._final_text({"error": "boom", "status": 500})
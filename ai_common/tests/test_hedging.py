@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from ai_common.hedging import Hedger, LatencyTracker
+
+
+def make_hedger():
+    hedger = Hedger(True, min_samples=1, max_rate=1.0)
+    hedger.latencies.record("tips", 0.05)
+    return hedger
+
+
+def test_percentile():
+    tracker = LatencyTracker()
+    for seconds in range(1, 101):
+        tracker.record("tips", seconds)
+
+    assert tracker.percentile("tips", 0.5) == 51
+    assert tracker.percentile("tips", 0.95) == 96
+    assert tracker.percentile("other", 0.5) is None
+
+
+def test_no_hedge_while_learning():
+    hedger = Hedger(True, min_samples=5)
+    assert hedger.call("tips", lambda: "answer") == "answer"
+    assert hedger.stats()["hedges"] == 0
+
+
+def test_slow_request_is_hedged_and_timed_from_its_start():
+    hedger = make_hedger()
+    calls = []
+
+    def call():
+        calls.append(1)
+        time.sleep(0.5 if len(calls) == 1 else 0.05)
+        return len(calls)
+
+    assert hedger.call("tips", call) == 2
+    assert hedger.stats()["hedge_wins"] == 1
+    # Delay before hedging plus the hedge itself, not just the hedge's own duration
+    assert hedger.latencies.percentile("tips", 1.0) >= 0.1
+
+
+def test_async_hedge_cancels_the_loser():
+    hedger = make_hedger()
+    cancelled = []
+
+    async def call():
+        first = not cancelled
+        cancelled.append(False)
+        try:
+            await asyncio.sleep(0.5 if first else 0.05)
+        except asyncio.CancelledError:
+            cancelled[0] = True
+            raise
+        return "hedge" if not first else "primary"
+
+    assert asyncio.run(hedger.call_async("tips", call)) == "hedge"
+    assert cancelled[0] is True
+
+
+def test_tuple_keys_in_summary():
+    hedger = Hedger()
+    hedger.call(("flash", "tips"), lambda: "answer")
+    assert list(hedger.stats()["latency"]) == ["flash/tips"]
@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from ai_common import job_queue
+from ai_common.job_queue import CANCELLED, DONE, FAILED, QUEUED, RUNNING, JobQueue, JobWorkerPool
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    yield queue
+    queue.close()
+
+
+def test_enqueue_with_same_id_is_a_no_op(queue):
+    queue.enqueue("tips", {"q": 1}, job_id="row-1")
+    queue.enqueue("tips", {"q": 2}, job_id="row-1")
+
+    job = queue.get("row-1")
+    assert job.payload == {"q": 1}
+    assert queue.stats()[QUEUED] == 1
+
+
+def test_lease_and_complete(queue):
+    job_id = queue.enqueue("tips", {"q": 1})
+
+    job = queue.lease("worker", 30)
+    assert (job.id, job.status, job.attempts) == (job_id, RUNNING, 1)
+    assert queue.lease("other", 30) is None
+
+    assert queue.complete(job_id, "answer")
+    assert not queue.complete(job_id, "second answer")
+    assert queue.get(job_id).result == "answer"
+    assert queue.get(job_id).status == DONE
+
+
+def test_expired_lease_is_taken_over(queue, monkeypatch):
+    job_id = queue.enqueue("tips", {})
+    queue.lease("crashed", 30)
+
+    now = job_queue.time.time()
+    monkeypatch.setattr(job_queue.time, "time", lambda: now + 31)
+    job = queue.lease("restarted", 30)
+
+    assert job.id == job_id
+    assert job.attempts == 2
+    assert not queue.renew(job_id, "crashed", 30)
+    assert queue.fail(job_id, "crashed", "late", 3, 0) is None
+
+
+def test_failed_attempts_are_retried_then_fail(queue):
+    job_id = queue.enqueue("tips", {})
+
+    queue.lease("worker", 30)
+    assert queue.fail(job_id, "worker", "boom", 2, 0) == QUEUED
+    queue.lease("worker", 30)
+    assert queue.fail(job_id, "worker", "boom", 2, 0) == FAILED
+    assert queue.get(job_id).error == "boom"
+
+    # Enqueueing a job that failed for good queues it again
+    queue.enqueue("tips", {}, job_id=job_id)
+    assert queue.get(job_id).status == QUEUED
+
+
+def test_cancelled_job_is_not_leased_or_completed(queue):
+    job_id = queue.enqueue("tips", {})
+    queue.lease("worker", 30)
+
+    assert queue.cancel(job_id)
+    assert not queue.complete(job_id, "late")
+    assert queue.lease("worker", 30) is None
+    assert queue.get(job_id).status == CANCELLED
+    assert not queue.cancel(job_id)
+
+
+def run_pool(queue, handler, expected):
+    finished = []
+    done = threading.Event()
+
+    def on_finished(job):
+        finished.append(job)
+        if len(finished) == expected:
+            done.set()
+
+    pool = JobWorkerPool(queue, handler, 2, retry_delay=0.0, poll_interval=0.01, on_finished=on_finished)
+    pool.start()
+    try:
+        assert done.wait(5)
+    finally:
+        pool.stop()
+    return finished
+
+
+def test_worker_pool_retries_until_success(queue):
+    job_id = queue.enqueue("tips", {"q": 1})
+    attempts = []
+
+    def handler(job):
+        attempts.append(job.attempts)
+        if job.attempts == 1:
+            raise RuntimeError("transient")
+        return f"answer {job.payload['q']}"
+
+    [job] = run_pool(queue, handler, 1)
+    assert (job.id, job.status, job.result) == (job_id, DONE, "answer 1")
+    assert attempts == [1, 2]
+
+
+def test_worker_pool_does_not_retry_timeouts(queue):
+    queue.enqueue("tips", {})
+
+    def handler(job):
+        raise TimeoutError("deadline passed")
+
+    [job] = run_pool(queue, handler, 1)
+    assert job.status == FAILED
+    assert job.attempts == 1
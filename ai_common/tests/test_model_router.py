@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from ai_common.model_router import MIN_SAMPLES, ModelRouter, can_fall_back
+from ai_common.rate_limiter import RateLimitExceeded
+
+
+class HttpError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = type("Response", (), {"status_code": status_code})()
+
+
+def make_router():
+    return ModelRouter([{"model": "light"}, {"model": "heavy"}], tier_timeout=5)
+
+
+def failing_on(model, error, calls):
+    def attempt(name, on_chunk, timeout):
+        calls.append((name, timeout))
+        if name == model:
+            raise error
+        return f"from {name}"
+    return attempt
+
+
+@pytest.mark.parametrize("error", [
+    TimeoutError(), asyncio.TimeoutError(), RateLimitExceeded("quota"), HttpError(503)
+])
+def test_falls_back_on_timeouts_and_quota_errors(error):
+    calls = []
+    assert make_router().call("tips", "prompt", None, failing_on("light", error, calls)) == "from heavy"
+    assert calls == [("light", 5), ("heavy", None)]
+
+
+@pytest.mark.parametrize("error", [ValueError("bad prompt"), HttpError(400), KeyError("text")])
+def test_other_errors_are_raised(error):
+    calls = []
+    with pytest.raises(type(error)):
+        make_router().call("tips", "prompt", None, failing_on("light", error, calls))
+    assert [name for name, _ in calls] == ["light"]
+
+
+def test_cancellation_is_not_a_fallback():
+    assert not can_fall_back(asyncio.CancelledError())
+
+
+def test_no_fallback_once_text_streamed():
+    chunks = []
+
+    def attempt(name, on_chunk, timeout):
+        on_chunk("partial")
+        raise TimeoutError()
+
+    with pytest.raises(TimeoutError):
+        make_router().call("tips", "prompt", chunks.append, attempt)
+    assert chunks == ["partial"]
+
+
+def test_unhealthy_tier_is_skipped():
+    router = make_router()
+    for _ in range(MIN_SAMPLES):
+        router.record("light", 1.0, False)
+
+    assert router.route("tips", "prompt") == ["heavy"]
+
+
+def test_methods_and_prompt_size_pick_the_tier():
+    router = ModelRouter([
+        {"model": "light", "methods": ["tips"], "max_prompt_tokens": 10},
+        {"model": "heavy"}
+    ])
+
+    assert router.route("tips", "short") == ["light", "heavy"]
+    assert router.route("strategy", "short") == ["heavy"]
+    assert router.route("tips", "x" * 100) == ["heavy"]
+
+
+def test_candidates_ignore_tier_health():
+    router = make_router()
+    for _ in range(MIN_SAMPLES):
+        router.record("light", 1.0, False)
+
+    assert router.candidates("tips", "prompt") == ["light", "heavy"]
+
+
+def test_async_call_falls_back_and_raises():
+    router = make_router()
+
+    async def timing_out(name, on_chunk, timeout):
+        if name == "light":
+            raise asyncio.TimeoutError()
+        return name
+
+    async def invalid(name, on_chunk, timeout):
+        raise ValueError("bad prompt")
+
+    assert asyncio.run(router.call_async("tips", "prompt", None, timing_out)) == "heavy"
+    with pytest.raises(ValueError):
+        asyncio.run(router.call_async("tips", "prompt", None, invalid))
+    assert router.stats()["light"]["fallbacks"] == 1
@@ -0,0 +1,103 @@
+from ai_common.prompt_budget import (
+    MIN_FIELD_TOKENS, TRUNCATION_MARKER, PromptBudget, compact_field, compact_template, fit_fields, truncate_text
+)
+from ai_common.rate_limiter import estimate_tokens
+
+TEMPLATE = """
+    Job title: {job_title}
+
+    Requirements:
+    {requirements}
+
+
+    Answer with:
+
+    1. Fit
+    2. Gaps
+    """
+
+
+def test_template_indentation_and_blank_lines_are_stripped():
+    assert compact_template(TEMPLATE) == (
+        "Job title: {job_title}\n\nRequirements:\n{requirements}\n\nAnswer with:\n1. Fit\n2. Gaps"
+    )
+
+
+def test_field_whitespace_is_collapsed():
+    assert compact_field("  Python,\t\tSQL  \n\n\n\nDocker ") == "Python, SQL\n\nDocker"
+
+
+def test_short_text_is_not_truncated():
+    assert truncate_text("Short enough.", 10) == "Short enough."
+
+
+def test_truncation_cuts_at_a_sentence_boundary():
+    text = "First sentence here. Second sentence is longer than the rest of it."
+
+    truncated = truncate_text(text, 7)
+
+    assert truncated == "First sentence here." + TRUNCATION_MARKER
+    assert len(truncated) <= 7 * 4
+
+
+def test_truncation_falls_back_to_a_word_boundary():
+    truncated = truncate_text("word " * 50, 10)
+
+    assert truncated.endswith("word" + TRUNCATION_MARKER)
+    assert len(truncated) <= 10 * 4
+
+
+def test_longest_fields_are_cut_first():
+    fields = {"job_title": "Data Engineer", "requirements": "Spark and Airflow. " * 100, "years": 5}
+
+    fitted = fit_fields(fields, 200)
+
+    assert fitted["job_title"] == "Data Engineer"
+    assert fitted["years"] == 5
+    assert fitted["requirements"].endswith(TRUNCATION_MARKER)
+    assert estimate_tokens(fitted["job_title"]) + estimate_tokens(fitted["requirements"]) <= 200
+
+
+def test_fields_are_never_cut_below_the_minimum():
+    fields = {"a": "x " * 200, "b": "y " * 200}
+
+    fitted = fit_fields(fields, 10)
+
+    assert fitted == {key: truncate_text(value, MIN_FIELD_TOKENS) for key, value in fields.items()}
+
+
+def test_prompt_within_budget_is_only_compacted():
+    budget = PromptBudget(default_budget=500)
+
+    prompt = budget.build("analyze", TEMPLATE, {"job_title": "Data  Engineer", "requirements": "Spark"})
+
+    assert "Job title: Data Engineer\n" in prompt
+    stats = budget.stats()
+    assert stats["prompts"] == 1 and stats["truncated"] == 0
+    assert stats["saved_tokens"] > 0
+
+
+def test_prompt_over_its_method_budget_is_truncated_to_fit():
+    budget = PromptBudget({"analyze": 100}, default_budget=5000)
+    fields = {"job_title": "Data Engineer", "requirements": "Build Spark pipelines. " * 200}
+
+    prompt = budget.build("analyze", TEMPLATE, fields)
+
+    assert estimate_tokens(prompt) <= 100
+    assert "Job title: Data Engineer" in prompt
+    assert TRUNCATION_MARKER in prompt
+    assert budget.stats()["truncated"] == 1
+    # Other methods keep the default budget
+    assert TRUNCATION_MARKER not in budget.build("tips", TEMPLATE, fields)
+
+
+def test_derived_text_is_counted_against_the_budget():
+    budget = PromptBudget(default_budget=150)
+
+    # The rendered prompt repeats the requirements, so one pass of fitting is not enough
+    prompt = budget.render(
+        "analyze", lambda values: f"{values['requirements']}\nKeywords: {values['requirements']}",
+        {"requirements": "Kubernetes operators in Go. " * 100}
+    )
+
+    assert estimate_tokens(prompt) <= 150
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from ai_common import rate_limiter
+from ai_common.rate_limiter import (
+    RateLimiter, RateLimitExceeded, TokenBucket, is_retryable, retry_after_seconds
+)
+
+
+class ApiError(Exception):
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    delays = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", delays.append)
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: high)
+    return delays
+
+
+def make_limiter(**kwargs):
+    return RateLimiter(600, 1000000, 2, base_delay=1.0, max_delay=8.0, **kwargs)
+
+
+def test_bucket_reports_wait_once_empty():
+    bucket = TokenBucket(60)
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    assert bucket.available() == 0.0
+
+
+def test_retryable_errors():
+    assert is_retryable(ApiError("busy", code=503))
+    assert is_retryable(ApiError("429 Resource has been exhausted"))
+    assert not is_retryable(ApiError("bad request", code=400))
+    assert not is_retryable(ValueError("invalid prompt"))
+
+
+def test_retry_delay_hint_from_message():
+    assert retry_after_seconds(ApiError("Please retry in 7s")) == 7.0
+    assert retry_after_seconds(ApiError("retry_delay { seconds: 12 }")) == 12.0
+    assert retry_after_seconds(ApiError("no hint")) is None
+
+
+def test_retries_transient_errors_with_backoff(no_sleep):
+    limiter = make_limiter(max_retries=3)
+    outcomes = [ApiError("busy", code=503), ApiError("busy", code=503), "done"]
+
+    def call():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert limiter.call(call, "prompt") == "done"
+    assert limiter.stats()["retries"] == 2
+    assert [delay for delay in no_sleep if delay] == [1.0, 2.0]
+
+
+def test_other_errors_are_raised_at_once(no_sleep):
+    limiter = make_limiter()
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise ValueError("invalid prompt")
+
+    with pytest.raises(ValueError):
+        limiter.call(call, "prompt")
+    assert len(calls) == 1
+
+
+def test_gives_up_after_max_retries(no_sleep):
+    limiter = make_limiter(max_retries=1)
+
+    def call():
+        raise ApiError("quota", code=429)
+
+    with pytest.raises(RateLimitExceeded):
+        limiter.call(call, "prompt")
+    assert limiter.stats()["retries"] == 1
+
+
+def test_async_call_retries(monkeypatch):
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: 0.0)
+    limiter = make_limiter(max_retries=2)
+    outcomes = [ApiError("busy", code=502), "done"]
+
+    async def call():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert asyncio.run(limiter.call_async(call, "prompt")) == "done"
+    assert limiter.stats()["retries"] == 1
@@ -0,0 +1,74 @@
+from ai_common import response_cache
+from ai_common.response_cache import ResponseCache
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(tmp_path, monkeypatch, **kwargs):
+    clock = Clock()
+    monkeypatch.setattr(response_cache.time, "time", clock)
+    return ResponseCache(str(tmp_path / "cache.sqlite3"), **kwargs), clock
+
+
+def test_hit_after_set_ignores_whitespace_and_case(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    cache.set("model", "tips", {"skills": "Python,  SQL"}, "answer")
+
+    assert cache.get("model", "tips", {"skills": "python, sql"}) == "answer"
+    assert cache.get("other-model", "tips", {"skills": "python, sql"}) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_get_any_returns_the_first_model_with_a_response(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    cache.set("heavy", "tips", {"q": 1}, "heavy answer")
+
+    assert cache.get_any(["light", "heavy"], "tips", {"q": 1}) == "heavy answer"
+    cache.set("light", "tips", {"q": 1}, "light answer")
+    assert cache.get_any(["light", "heavy"], "tips", {"q": 1}) == "light answer"
+    assert cache.get_any(["light", "heavy"], "tips", {"q": 2}) is None
+    # One lookup counts once, however many models it checked
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_entry_is_a_miss(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl_seconds=60)
+    cache.set("model", "tips", {"q": 1}, "answer")
+
+    clock.now += 59
+    assert cache.get("model", "tips", {"q": 1}) == "answer"
+    clock.now += 2
+    assert cache.get("model", "tips", {"q": 1}) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, max_entries=2)
+    cache.set("model", "m", {"q": "a"}, "A")
+    clock.now += 1
+    cache.set("model", "m", {"q": "b"}, "B")
+    clock.now += 1
+    assert cache.get("model", "m", {"q": "a"}) == "A"
+    clock.now += 1
+    cache.set("model", "m", {"q": "c"}, "C")
+
+    assert cache.get("model", "m", {"q": "a"}) == "A"
+    assert cache.get("model", "m", {"q": "b"}) is None
+    assert cache.get("model", "m", {"q": "c"}) == "C"
+
+
+def test_entries_survive_reopening(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch)
+    cache.set("model", "m", {"q": 1}, "kept")
+    cache.close()
+
+    reopened = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    assert reopened.get("model", "m", {"q": 1}) == "kept"
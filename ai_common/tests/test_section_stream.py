@@ -0,0 +1,34 @@
+import json
+import random
+
+import pytest
+
+from ai_common.section_stream import SectionStream
+
+
+class NumberedStream(SectionStream):
+    def render(self, name, body):
+        return f"## {name}\n\n{body}"
+
+
+def rendered(order, sections):
+    return "\n\n".join(f"## {name}\n\n{sections[name].strip()}" for name in order)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_streamed_text_matches_the_final_rendering(seed):
+    rng = random.Random(seed)
+    order = ["summary", "skills", "plan"]
+    ready = {"summary": "Already known"}
+    reply = {"plan": "  Step 1\n\tStep 2 é\U0001F600  ", "skills": "\"Python\", \\ SQL\n"}
+    encoded = json.dumps(reply, ensure_ascii=rng.random() < 0.5)
+
+    written = []
+    stream = NumberedStream(order, ready, ["skills", "plan"], written.append)
+    position = 0
+    while position < len(encoded):
+        step = rng.randint(1, 7)
+        stream.feed(encoded[position:position + step])
+        position += step
+
+    assert "".join(written) == rendered(order, dict(ready, **reply))
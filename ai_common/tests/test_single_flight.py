@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ai_common.single_flight import SingleFlight
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting"
+        time.sleep(0.001)
+
+
+def test_key_ignores_whitespace_but_not_the_model():
+    assert SingleFlight.make_key("model", "tips  for\nPython") == SingleFlight.make_key("model", "tips for Python")
+    assert SingleFlight.make_key("model", "tips") != SingleFlight.make_key("other-model", "tips")
+
+
+def test_concurrent_duplicates_share_one_call():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    with ThreadPoolExecutor(3) as pool:
+        leader = pool.submit(group.do, "key", call)
+        wait_until(lambda: calls)
+        followers = [pool.submit(group.do, "key", call) for _ in range(2)]
+        wait_until(lambda: group.stats()["suppressed"] == 2)
+        release.set()
+
+        assert leader.result() == ("answer", False)
+        assert [follower.result() for follower in followers] == [("answer", True)] * 2
+
+    assert calls == [1]
+    assert group.stats() == {"executed": 1, "suppressed": 2}
+
+
+def test_error_reaches_every_waiter_and_is_not_remembered():
+    group = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("quota")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(group.do, "key", fail)
+        wait_until(lambda: group.stats()["executed"] == 1)
+        follower = pool.submit(group.do, "key", fail)
+        wait_until(lambda: group.stats()["suppressed"] == 1)
+        release.set()
+
+        for future in (leader, follower):
+            with pytest.raises(ValueError, match="quota"):
+                future.result()
+
+    # The failed call is gone, so the next request runs again
+    assert group.do("key", lambda: "retried") == ("retried", False)
+
+
+def test_async_duplicates_share_one_task():
+    group = SingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "answer"
+
+    async def run():
+        return await asyncio.gather(*(group.do_async("key", call) for _ in range(3)))
+
+    assert asyncio.run(run()) == [("answer", False), ("answer", True), ("answer", True)]
+    assert calls == [1]
+
+
+def test_one_async_caller_giving_up_does_not_cancel_the_others():
+    group = SingleFlight()
+    started = []
+
+    async def call():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def run():
+        impatient = asyncio.ensure_future(group.do_async("key", call))
+        patient = asyncio.ensure_future(group.do_async("key", call))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        return await patient, impatient.cancelled()
+
+    assert asyncio.run(run()) == (("answer", True), True)
+    assert started == [1]
+
+
+def test_shared_task_is_cancelled_once_every_caller_gave_up():
+    group = SingleFlight()
+    cancelled = []
+
+    async def call():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        callers = [asyncio.ensure_future(group.do_async("key", call)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert cancelled == [1]
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from ai_common.skill_taxonomy import SkillTaxonomy
+
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return SkillTaxonomy()
+
+
+def test_aliases_become_canonical_names(taxonomy):
+    assert taxonomy.compact_skills("k8s, JS, python, Python") == "Kubernetes, JavaScript, Python"
+
+
+def test_leading_dot_is_kept(taxonomy):
+    assert taxonomy.compact_skills(".NET, C#.") == ".NET, C#"
+
+
+def test_items_with_qualifiers_are_kept_as_written(taxonomy):
+    assert taxonomy.compact_skills("Python scripting for automation, Python/Django") == (
+        "Python scripting for automation, Python, Django"
+    )
+
+
+def test_whole_words_only(taxonomy):
+    assert taxonomy.extract("JavaScript and machine learning") == ["JavaScript", "Machine Learning"]
+
+
+def test_ambiguous_alias_only_as_a_list_item(taxonomy):
+    assert taxonomy.known_skills("Go") == ["Go"]
+    assert taxonomy.extract("ready to go") == []
+
+
+def test_compiled_automaton_is_cached(tmp_path):
+    cache_path = str(tmp_path / "taxonomy.cache")
+    SkillTaxonomy(cache_path=cache_path)
+
+    assert SkillTaxonomy(cache_path=cache_path).extract("k8s") == ["Kubernetes"]
+
+
+def test_cache_is_json_and_tampered_tables_are_rebuilt(tmp_path):
+    cache_path = tmp_path / "taxonomy.cache"
+    SkillTaxonomy(cache_path=str(cache_path))
+    cached = json.loads(cache_path.read_text(encoding="utf-8"))
+
+    cached["fail"][-1] = len(cached["fail"]) + 10
+    cache_path.write_text(json.dumps(cached), encoding="utf-8")
+    assert SkillTaxonomy(cache_path=str(cache_path)).extract("k8s") == ["Kubernetes"]
+    # The bad file was replaced with a freshly compiled automaton
+    assert json.loads(cache_path.read_text(encoding="utf-8"))["fail"][-1] < len(cached["fail"])
+
+
+def test_cache_from_another_taxonomy_is_ignored(tmp_path):
+    cache_path = tmp_path / "taxonomy.cache"
+    SkillTaxonomy(cache_path=str(cache_path))
+    cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    cached["digest"] = "0" * 64
+    cached["output"] = [[] for _ in cached["output"]]
+    cache_path.write_text(json.dumps(cached), encoding="utf-8")
+
+    assert SkillTaxonomy(cache_path=str(cache_path)).extract("k8s") == ["Kubernetes"]
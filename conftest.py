@@ -0,0 +1,26 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Folders run as scripts with flat imports ("from config import Config"); several
+# have modules of the same name, so only one folder's can be imported at a time
+APP_DIRS = [os.path.join(REPO_DIR, name) for name in ("job_search_ai", "resume_ai_agent", "llm_gateway")]
+
+
+def pytest_pycollect_makemodule(module_path, parent):
+    """Make a test file under an app folder import that app's flat modules"""
+    app_dir = next((path for path in APP_DIRS if str(module_path).startswith(path + os.sep)), None)
+    if app_dir is None:
+        return None
+
+    if app_dir in sys.path:
+        sys.path.remove(app_dir)
+    sys.path.insert(0, app_dir)
+
+    # Forget modules imported from another app so the names resolve again
+    for name, module in list(sys.modules.items()):
+        folder = os.path.dirname(os.path.abspath(getattr(module, "__file__", None) or ""))
+        if folder in APP_DIRS and folder != app_dir:
+            del sys.modules[name]
+    return None
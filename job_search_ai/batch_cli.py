@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+
+# The shared ai_common package sits next to this app's folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from gemini_client import GeminiClient, AsyncGeminiClient
+from ai_common.gateway_client import create_client, create_async_client
+from ai_common.async_runner import with_deadline
+
+# Same keys as JobSearchAI.get_form_data()
+ROW_FIELDS = ("job_title", "experience", "skills", "expected_salary")
+
+logging.basicConfig(level=logging.INFO)
+
+
+def read_rows(path, all_experience_levels=False):
+    """Read (job_title, experience, skills, expected_salary) rows from a CSV or JSONL file
+
+    With all_experience_levels, every row is expanded across
+    Config.DEFAULT_EXPERIENCE_LEVELS, e.g. to cover each title in a cohort.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.lower().endswith(".csv"):
+            records = list(csv.DictReader(handle))
+        else:
+            records = [json.loads(line) for line in handle if line.strip()]
+
+    rows = []
+    for record in records:
+        row = {key: str(record.get(key) or "").strip() for key in ROW_FIELDS}
+        row["expected_salary"] = row["expected_salary"] or Config.DEFAULT_SALARY_RANGES[0]
+        if all_experience_levels:
+            rows.extend(dict(row, experience=level) for level in Config.DEFAULT_EXPERIENCE_LEVELS)
+        else:
+            row["experience"] = row["experience"] or Config.DEFAULT_EXPERIENCE_LEVELS[0]
+            rows.append(row)
+
+    return rows
+
+
+def row_key(row):
+    """Stable file name for a row: a readable slug plus a hash of all its fields"""
+    slug = re.sub(r"[^\w]+", "_", f"{row['job_title']}_{row['experience']}").strip("_").lower()
+    digest = hashlib.sha256(json.dumps(row, sort_keys=True).encode("utf-8")).hexdigest()[:10]
+    return f"{slug[:60]}_{digest}"
+
+
+def format_duration(seconds):
+    """Format seconds as e.g. 4m12s"""
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m{seconds:02d}s" if minutes else f"{seconds}s"
+
+
+async def run_analyses(async_client, row, semaphore, use_cache=True):
+    """Run the strategy, market trends and resume tips analyses for one row concurrently"""
+    client = async_client.client
+
+    # The request builders and _generate are used directly (rather than the public
+    # methods) so failures raise instead of coming back as an error string
+    async def strategy():
+        if Config.STRUCTURED_STRATEGY:
+            result = await async_client.generate_job_search_strategy(
+                row['job_title'], row['experience'], row['skills'], row['expected_salary'], use_cache
+            )
+            return result.to_markdown()
+        inputs, prompt = client._job_search_query_request(
+            row['job_title'], row['experience'], row['skills'], row['expected_salary']
+        )
+        return await async_client._generate("generate_job_search_query", inputs, prompt, use_cache)
+
+    async def market_trends():
+        inputs, prompt = client._job_market_trends_request(row['job_title'], row['skills'])
+        return await async_client._generate("analyze_job_market_trends", inputs, prompt, use_cache)
+
+    async def resume_tips():
+        inputs, prompt = client._resume_tips_request(row['job_title'], row['experience'], row['skills'])
+        return await async_client._generate("generate_resume_tips", inputs, prompt, use_cache)
+
+    async def limited(method, make_request):
+        async with semaphore:
+            return await with_deadline(
+                make_request(), Config.REQUEST_DEADLINES.get(method, Config.ASYNC_REQUEST_TIMEOUT)
+            )
+
+    strategy_method = "generate_job_search_strategy" if Config.STRUCTURED_STRATEGY else "generate_job_search_query"
+    results = await asyncio.gather(
+        limited(strategy_method, strategy),
+        limited("analyze_job_market_trends", market_trends),
+        limited("generate_resume_tips", resume_tips)
+    )
+    return dict(zip(("strategy", "market_trends", "resume_tips"), results))
+
+
+async def run_batch(async_client, rows, output_dir, workers, use_cache=True):
+    """Generate every row, writing each one's results as soon as all three analyses finish
+
+    At most `workers` analyses are in flight at once (the shared rate limiter
+    still paces the requests). Failed rows are not written, so a rerun retries them.
+    """
+    semaphore = asyncio.Semaphore(workers)
+    started = time.perf_counter()
+    finished = 0
+    failed = []
+
+    async def generate(row):
+        nonlocal finished
+        key = row_key(row)
+        try:
+            results = await run_analyses(async_client, row, semaphore, use_cache)
+        except Exception as e:
+            logging.error(f"{key} failed: {str(e) or type(e).__name__}")
+            failed.append(key)
+        else:
+            write_result(output_dir, key, row, results)
+
+        finished += 1
+        elapsed = time.perf_counter() - started
+        rate = finished / elapsed
+        eta = (len(rows) - finished) / rate
+        print(f"[{finished}/{len(rows)}] {key} ({rate * 60:.1f} rows/min, ETA {format_duration(eta)})")
+
+    await asyncio.gather(*(generate(row) for row in rows))
+    return finished - len(failed), failed
+
+
+def write_result(output_dir, key, row, results):
+    """Write one row's results atomically, so a file only exists once the row is complete"""
+    path = os.path.join(output_dir, f"{key}.json")
+    with open(f"{path}.tmp", "w", encoding="utf-8") as handle:
+        json.dump({"row": row, **results}, handle, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def main():
+    """Generate job search analyses for a list of rows without the GUI"""
+    parser = argparse.ArgumentParser(description=f"{Config.APP_TITLE} batch mode")
+    parser.add_argument("input", help="CSV or JSONL file with job_title, experience, skills and expected_salary")
+    parser.add_argument("output_dir", help="directory for one <row>.json result per row")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=Config.BATCH_MAX_WORKERS,
+        help="maximum number of analyses running at the same time"
+    )
+    parser.add_argument(
+        "--all-experience-levels",
+        action="store_true",
+        help="run every row once per experience level in the app's list"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="ignore cached responses")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    all_rows = read_rows(args.input, args.all_experience_levels)
+    rows = [
+        row for row in all_rows
+        if not os.path.exists(os.path.join(args.output_dir, f"{row_key(row)}.json"))
+    ]
+    print(f"{len(all_rows)} rows, {len(all_rows) - len(rows)} already done, {len(rows)} to generate")
+
+    if not rows:
+        return
+
+    async_client = create_async_client(create_client(Config, GeminiClient), AsyncGeminiClient)
+    try:
+        completed, failed = asyncio.run(
+            run_batch(async_client, rows, args.output_dir, max(1, args.workers), not args.no_cache)
+        )
+    except KeyboardInterrupt:
+        print("Interrupted; rerun the same command to continue with the remaining rows")
+        sys.exit(130)
+
+    print(f"Finished: {completed} rows generated, {len(failed)} failed")
+    stats = async_client.client.prompt_budget_stats()
+    print(f"Prompts: ~{stats['sent_tokens']} input tokens sent, ~{stats['saved_tokens']} saved by compaction")
+    if Config.HEDGE_ENABLED:
+        stats = async_client.client.hedge_stats()
+        print(f"Hedging: {stats['hedges']} of {stats['requests']} requests hedged, {stats['hedge_wins']} won by the hedge")
+    if Config.MODEL_ROUTING_ENABLED:
+        for model, tier in async_client.client.routing_stats().items():
+            print(f"{model}: {tier['answered']} answered, {tier['fallbacks']} fell back, p95 {tier['p95']}s")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,140 @@ class Config:
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
     GEMINI_MODEL = 'gemini-1.5-flash'
     
+    # Response Cache Configuration (set GEMINI_CACHE_ENABLED=false to disable)
+    CACHE_ENABLED = os.getenv('GEMINI_CACHE_ENABLED', 'true').lower() == 'true'
+    CACHE_PATH = os.getenv(
+        'GEMINI_CACHE_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '.gemini_cache.sqlite3')
+    )
+    CACHE_TTL_SECONDS = int(os.getenv('GEMINI_CACHE_TTL_SECONDS', 24 * 60 * 60))
+    CACHE_MAX_ENTRIES = int(os.getenv('GEMINI_CACHE_MAX_ENTRIES', 500))
+    
+    # Stream responses into the results dialog as they are generated
+    STREAM_RESPONSES = os.getenv('GEMINI_STREAM_RESPONSES', 'true').lower() == 'true'
+    
+    # Worker threads hand widget updates to the Tk thread through a queue drained every
+    # UI_DISPATCH_INTERVAL_MS, spending at most UI_DISPATCH_BUDGET_MS per pass
+    UI_DISPATCH_INTERVAL_MS = int(os.getenv('UI_DISPATCH_INTERVAL_MS', 16))
+    UI_DISPATCH_BUDGET_MS = int(os.getenv('UI_DISPATCH_BUDGET_MS', 8))
+    
+    # Results are inserted RESULTS_CHUNK_CHARS at a time across idle callbacks
+    RESULTS_CHUNK_CHARS = int(os.getenv('RESULTS_CHUNK_CHARS', 4000))
+    
+    # Request the job search strategy as JSON sections, each cached under only the
+    # inputs it depends on (changing the salary only regenerates salary-related sections)
+    STRUCTURED_STRATEGY = os.getenv('GEMINI_STRUCTURED_STRATEGY', 'true').lower() == 'true'
+    
+    # Maximum number of analyses a Full Report runs at the same time
+    FULL_REPORT_MAX_WORKERS = int(os.getenv('FULL_REPORT_MAX_WORKERS', 3))
+    
+    # Maximum number of analyses batch_cli.py runs at the same time
+    BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', 4))
+    
+    # Durable job queue: requests survive closing the app and resume on the next launch
+    # (in-flight ones once their lease expires); finished jobs are kept for JOB_RETENTION_SECONDS
+    JOB_QUEUE_PATH = os.getenv(
+        'JOB_QUEUE_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '.job_queue.sqlite3')
+    )
+    JOB_QUEUE_WORKERS = int(os.getenv('JOB_QUEUE_WORKERS', 3))
+    JOB_LEASE_SECONDS = float(os.getenv('JOB_LEASE_SECONDS', 30))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+    JOB_RETRY_DELAY = float(os.getenv('JOB_RETRY_DELAY', 5.0))
+    JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_SECONDS', 7 * 24 * 60 * 60))
+    
+    # Speculative prefetch (opt-in): once the form has been unchanged for PREFETCH_DEBOUNCE_MS,
+    # run the likely next analyses in the background so their results open instantly.
+    # Prefetching pauses while a request is pending or less than PREFETCH_MIN_HEADROOM of the rate limit is free
+    PREFETCH_ENABLED = os.getenv('GEMINI_PREFETCH', 'false').lower() == 'true'
+    PREFETCH_DEBOUNCE_MS = int(os.getenv('PREFETCH_DEBOUNCE_MS', 1500))
+    PREFETCH_MIN_HEADROOM = float(os.getenv('PREFETCH_MIN_HEADROOM', 0.5))
+    PREFETCH_METHODS = [
+        method.strip()
+        for method in os.getenv('PREFETCH_METHODS', 'analyze_job_market_trends,generate_resume_tips').split(',')
+        if method.strip()
+    ]
+    
+    # Timeout for requests running on the async event loop thread
+    ASYNC_REQUEST_TIMEOUT = float(os.getenv('GEMINI_ASYNC_REQUEST_TIMEOUT', 120))
+    
+    # Threads shared by blocking work handed off from the event loop (e.g. LLM gateway calls)
+    ASYNC_MAX_WORKER_THREADS = int(os.getenv('ASYNC_MAX_WORKER_THREADS', 8))
+    
+    # Requests the GUI runs at once; clicking the same button with the same inputs while
+    # it is pending shows the running request instead of starting another
+    MAX_PENDING_ACTIONS = int(os.getenv('MAX_PENDING_ACTIONS', 4))
+    
+    # Per-method deadline in seconds for a request started from the GUI. At the deadline
+    # the request is aborted, its connection and rate-limit slot are released and it is
+    # reported as timed out rather than retried; methods not listed use ASYNC_REQUEST_TIMEOUT
+    REQUEST_DEADLINES = {
+        'generate_job_search_query': 90,
+        'generate_job_search_strategy': 90,
+        'analyze_job_market_trends': 45,
+        'generate_resume_tips': 45
+    }
+    
+    # Rate limiting (keep just under the Gemini quota) and retries for 429/5xx errors
+    RATE_LIMIT_REQUESTS_PER_MINUTE = int(os.getenv('GEMINI_REQUESTS_PER_MINUTE', 14))
+    RATE_LIMIT_TOKENS_PER_MINUTE = int(os.getenv('GEMINI_TOKENS_PER_MINUTE', 950000))
+    RATE_LIMIT_EXPECTED_OUTPUT_TOKENS = int(os.getenv('GEMINI_EXPECTED_OUTPUT_TOKENS', 1024))
+    MAX_CONCURRENT_REQUESTS = int(os.getenv('GEMINI_MAX_CONCURRENT_REQUESTS', 4))
+    RETRY_MAX_ATTEMPTS = int(os.getenv('GEMINI_RETRY_MAX_ATTEMPTS', 4))
+    RETRY_BASE_DELAY = float(os.getenv('GEMINI_RETRY_BASE_DELAY', 1.0))
+    RETRY_MAX_DELAY = float(os.getenv('GEMINI_RETRY_MAX_DELAY', 60.0))
+    
+    # Hedged requests (off by default): a non-streaming request still running after the
+    # HEDGE_PERCENTILE latency recently observed for its method is sent again and the first
+    # response wins. At most about HEDGE_MAX_RATE of requests are hedged, so quota use stays bounded;
+    # thresholds are learned from each method's last HEDGE_WINDOW latencies once HEDGE_MIN_SAMPLES are in
+    HEDGE_ENABLED = os.getenv('GEMINI_HEDGE_REQUESTS', 'false').lower() == 'true'
+    HEDGE_PERCENTILE = float(os.getenv('GEMINI_HEDGE_PERCENTILE', 0.95))
+    HEDGE_MAX_RATE = float(os.getenv('GEMINI_HEDGE_MAX_RATE', 0.1))
+    HEDGE_MIN_SAMPLES = int(os.getenv('GEMINI_HEDGE_MIN_SAMPLES', 20))
+    HEDGE_WINDOW = int(os.getenv('GEMINI_HEDGE_WINDOW', 200))
+    
+    # Model routing (off by default): each request goes to the lightest tier in MODEL_LADDER that
+    # takes its method and prompt size (estimated tokens). A tier whose recent error rate is above
+    # MODEL_MAX_ERROR_RATE, or whose p95 latency is above its max_p95_seconds, is skipped for now, and a
+    # call that fails or runs past MODEL_TIER_TIMEOUT falls back to the next tier. Tier statistics cover
+    # the last MODEL_STATS_WINDOW calls within MODEL_STATS_MAX_AGE seconds
+    MODEL_ROUTING_ENABLED = os.getenv('GEMINI_MODEL_ROUTING', 'false').lower() == 'true'
+    MODEL_LADDER = [
+        {
+            'model': os.getenv('GEMINI_LIGHT_MODEL', 'gemini-1.5-flash-8b'),
+            'methods': ['analyze_job_market_trends', 'generate_resume_tips'],
+            'max_prompt_tokens': int(os.getenv('GEMINI_LIGHT_MODEL_MAX_PROMPT_TOKENS', 1000)),
+            'max_p95_seconds': float(os.getenv('GEMINI_LIGHT_MODEL_MAX_P95_SECONDS', 8))
+        },
+        {'model': GEMINI_MODEL}
+    ]
+    MODEL_TIER_TIMEOUT = float(os.getenv('GEMINI_MODEL_TIER_TIMEOUT', 20))
+    MODEL_MAX_ERROR_RATE = float(os.getenv('GEMINI_MODEL_MAX_ERROR_RATE', 0.25))
+    MODEL_STATS_WINDOW = int(os.getenv('GEMINI_MODEL_STATS_WINDOW', 50))
+    MODEL_STATS_MAX_AGE = int(os.getenv('GEMINI_MODEL_STATS_MAX_AGE', 300))
+    
+    # Shared local LLM gateway (see llm_gateway/); set LLM_GATEWAY_URL= to always call Gemini directly
+    LLM_GATEWAY_URL = os.getenv('LLM_GATEWAY_URL', 'http://127.0.0.1:8765')
+    LLM_GATEWAY_CONNECT_TIMEOUT = float(os.getenv('LLM_GATEWAY_CONNECT_TIMEOUT', 0.5))
+    LLM_GATEWAY_READ_TIMEOUT = float(os.getenv('LLM_GATEWAY_READ_TIMEOUT', 300))
+    
+    # Input-token budget per prompt (local estimate). Prompts over budget have their
+    # longest user fields truncated; methods not listed use PROMPT_TOKEN_BUDGET
+    PROMPT_TOKEN_BUDGET = int(os.getenv('GEMINI_PROMPT_TOKEN_BUDGET', 1500))
+    PROMPT_TOKEN_BUDGETS = {
+        'generate_job_search_query': 1500,
+        'generate_job_search_strategy': 1500,
+        'analyze_job_market_trends': 800,
+        'generate_resume_tips': 800
+    }
+    
+    # Compiled skill taxonomy automaton (rebuilt automatically when skill_taxonomy.json changes)
+    SKILL_TAXONOMY_CACHE_PATH = os.getenv(
+        'SKILL_TAXONOMY_CACHE_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '.skill_taxonomy.cache')
+    )
+    
     # Application Configuration
     APP_TITLE = "Job Search AI Assistant"
     APP_VERSION = "1.0.0"
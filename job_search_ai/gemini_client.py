@@ -1,6 +1,17 @@
-import google.generativeai as genai
 from config import Config
+from ai_common.response_cache import create_cache
+from ai_common.rate_limiter import RateLimiter, RateLimitExceeded
+from ai_common.hedging import Hedger
+from ai_common.model_router import ModelRouter
+from ai_common.single_flight import SingleFlight
+from ai_common.prompt_budget import PromptBudget
+from ai_common.skill_taxonomy import SkillTaxonomy
+from structured_strategy import (
+    STRATEGY_SECTIONS, JobSearchStrategy, StrategyStream, build_sections_prompt, parse_sections,
+    prompt_fields, section_inputs, structured_generation_config
+)
 import logging
+import time
 
 class GeminiClient:
     """Client for interacting with Google's Gemini AI model"""
@@ -9,6 +20,16 @@ class GeminiClient:
         self.api_key = Config.GEMINI_API_KEY
         self.model_name = Config.GEMINI_MODEL
         self.model = None
+        self.models = {}
+        self.cache = create_cache(Config)
+        self.section_cache = self.cache
+        self.rate_limiter = RateLimiter.shared(Config)
+        self.hedger = Hedger.shared(Config)
+        self.router = ModelRouter.shared(Config)
+        self.single_flight = SingleFlight.shared()
+        self.skill_taxonomy = SkillTaxonomy.shared(Config)
+        self.prompt_budget = PromptBudget.shared(Config)
+        self.sdk_import_seconds = None
         self._initialize_client()
     
     def _initialize_client(self):
@@ -17,18 +38,156 @@ class GeminiClient:
             if not self.api_key:
                 raise ValueError("Gemini API key not found. Please set GEMINI_API_KEY in your .env file")
             
+            # Imported here rather than at module level: the SDK alone takes over
+            # a second to import, so apps construct the client off the GUI thread
+            started = time.perf_counter()
+            import google.generativeai as genai
+            self.sdk_import_seconds = time.perf_counter() - started
+            
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel(self.model_name)
+            self._genai = genai
+            self.model = self._model(self.model_name)
             logging.info("Gemini AI client initialized successfully")
             
         except Exception as e:
             logging.error(f"Failed to initialize Gemini AI client: {str(e)}")
             raise
     
-    def generate_job_search_query(self, job_title, experience, skills, expected_salary):
-        """Generate a comprehensive job search strategy using Gemini AI"""
+    def _generate(self, method, inputs, prompt, use_cache=True, on_chunk=None, generation_config=None):
+        """Generate content for a prompt, serving repeat inputs from the response cache"""
+        cache = self.cache if use_cache else None
+        
+        if cache:
+            # A response from any tier this request may be routed to is good enough
+            cached = cache.get_any(self.router.candidates(method, prompt), method, inputs)
+            if cached is not None:
+                logging.info(f"Cache hit for {method}")
+                if on_chunk:
+                    on_chunk(cached)
+                return cached
+        
+        # Identical prompts already in flight share that request instead of sending another
+        key = SingleFlight.make_key(self.model_name, prompt)
+        answered = []
+        text, shared = self.single_flight.do(
+            key, lambda: self._call_model(method, prompt, on_chunk, generation_config, answered)
+        )
+        
+        if shared:
+            logging.info(f"Joined an identical in-flight {method} request")
+            if on_chunk:
+                on_chunk(text)
+        elif cache:
+            # Keyed on the tier that answered, which need not be GEMINI_MODEL
+            cache.set(answered[-1], method, inputs, text)
+        
+        return text
+    
+    def _model(self, model_name):
+        """Return the GenerativeModel for a model tier, creating it on first use"""
+        if model_name not in self.models:
+            self.models[model_name] = self._genai.GenerativeModel(model_name)
+        return self.models[model_name]
+    
+    @staticmethod
+    def _hedge_key(method, model_name):
+        """Latency key for hedging: the method, plus the model when it is not the default tier"""
+        return method if model_name == Config.GEMINI_MODEL else f"{method}:{model_name}"
+    
+    def _call_model(self, method, prompt, on_chunk=None, generation_config=None, answered=None):
+        """Send a prompt to the routed model tier, falling back to heavier tiers on failure
+        
+        Each tier tried is appended to answered, so once a call succeeds its
+        last entry is the model that answered
+        """
+        def attempt(model_name, on_chunk, timeout):
+            if answered is not None:
+                answered.append(model_name)
+            return self._call_tier(method, model_name, prompt, on_chunk, generation_config, timeout)
+        
+        return self.router.call(method, prompt, on_chunk, attempt)
+    
+    def _call_tier(self, method, model_name, prompt, on_chunk, generation_config, timeout):
+        """Call one model under the shared rate limits, hedging slow non-streaming calls
+        
+        A call with a timeout has a heavier tier to fall back to, so quota and
+        server errors are not retried on this one.
+        """
+        model = self._model(model_name)
+        request_options = {"timeout": timeout} if timeout else None
+        max_retries = 0 if timeout else None
+        if on_chunk:
+            return self.rate_limiter.call(
+                lambda: self._stream(method, prompt, on_chunk, generation_config, model, request_options),
+                prompt,
+                max_retries
+            )
+        return self.hedger.call(self._hedge_key(method, model_name), lambda: self.rate_limiter.call(
+            lambda: model.generate_content(
+                prompt, generation_config=generation_config, request_options=request_options
+            ).text,
+            prompt,
+            max_retries
+        ))
+    
+    def _stream(self, method, prompt, on_chunk, generation_config=None, model=None, request_options=None):
+        """Stream a response chunk by chunk, logging its time to first token"""
+        started = time.perf_counter()
+        parts = []
+        model = model or self.model
+        
+        for chunk in model.generate_content(
+            prompt, stream=True, generation_config=generation_config, request_options=request_options
+        ):
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. safety metadata only) are skipped
+                continue
+            
+            if not parts:
+                logging.info(f"{method} first token after {time.perf_counter() - started:.2f}s")
+            
+            parts.append(text)
+            on_chunk(text)
+        
+        return "".join(parts)
+    
+    def cache_stats(self):
+        """Return response cache counters, or None when caching is disabled"""
+        return self.cache.stats() if self.cache else None
+    
+    def rate_limit_stats(self):
+        """Return throttling and retry counters for the shared rate limiter"""
+        return self.rate_limiter.stats()
+    
+    def single_flight_stats(self):
+        """Return how many duplicate in-flight requests were coalesced"""
+        return self.single_flight.stats()
+    
+    def prompt_budget_stats(self):
+        """Return prompt counts and the estimated input tokens saved by compaction"""
+        return self.prompt_budget.stats()
+    
+    def hedge_stats(self):
+        """Return hedged request counters and per-method latency percentiles"""
+        return self.hedger.stats()
+    
+    def routing_stats(self):
+        """Return per-tier answered and fallback counts with recent error rates and latency"""
+        return self.router.stats()
+    
+    def _job_search_query_request(self, job_title, experience, skills, expected_salary):
+        """Build the cache inputs and prompt for generate_job_search_query"""
+        skills = self.skill_taxonomy.compact_skills(skills)
+        inputs = {
+            "job_title": job_title,
+            "experience": experience,
+            "skills": skills,
+            "expected_salary": expected_salary
+        }
         
-        prompt = f"""
+        template = """
         You are a professional career advisor and job search expert. Help create a comprehensive job search strategy based on the following parameters:
 
         Job Title: {job_title}
@@ -59,19 +218,106 @@ class GeminiClient:
 
         Format your response in a clear, organized manner with proper headings and bullet points for easy reading.
         """
+        prompt = self.prompt_budget.build("generate_job_search_query", template, inputs)
+        
+        return inputs, prompt
+    
+    def generate_job_search_query(self, job_title, experience, skills, expected_salary, use_cache=True, on_chunk=None):
+        """Generate a comprehensive job search strategy using Gemini AI
+        
+        Pass on_chunk to stream the response; it is called with each text chunk as it arrives.
+        """
+        inputs, prompt = self._job_search_query_request(job_title, experience, skills, expected_salary)
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._generate("generate_job_search_query", inputs, prompt, use_cache, on_chunk)
         
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             logging.error(f"Error generating job search query: {str(e)}")
             return f"Error generating job search strategy: {str(e)}"
     
-    def analyze_job_market_trends(self, job_title, skills):
-        """Analyze current job market trends for the specified role"""
+    def _strategy_plan(self, job_title, experience, skills, expected_salary, use_cache=True):
+        """Fill a JobSearchStrategy from cached sections and list the sections still to generate"""
+        inputs = {
+            "job_title": job_title,
+            "experience": experience,
+            "skills": self.skill_taxonomy.compact_skills(skills),
+            "expected_salary": expected_salary
+        }
+        strategy = JobSearchStrategy()
+        missing = []
+        
+        for name, _, _, _ in STRATEGY_SECTIONS:
+            cached = None
+            if use_cache and self.section_cache:
+                cached = self.section_cache.get(
+                    self.model_name, f"job_search_strategy:{name}", section_inputs(name, inputs)
+                )
+            
+            if cached is None:
+                missing.append(name)
+            else:
+                setattr(strategy, name, cached)
+                strategy.reused_sections.append(name)
+        
+        return inputs, strategy, missing
+    
+    def _fill_strategy(self, strategy, inputs, missing, text):
+        """Parse generated sections into the strategy, caching each under its own inputs"""
+        for name, content in parse_sections(text, missing).items():
+            setattr(strategy, name, content)
+            strategy.generated_sections.append(name)
+            if self.section_cache and content:
+                self.section_cache.set(
+                    self.model_name, f"job_search_strategy:{name}", section_inputs(name, inputs), content
+                )
+        
+        logging.info(
+            f"Job search strategy: generated {len(strategy.generated_sections)} sections, "
+            f"reused {len(strategy.reused_sections)} from cache"
+        )
+        return strategy
+    
+    def _strategy_prompt(self, missing, inputs):
+        """Build the structured strategy prompt for the missing sections within its token budget"""
+        fields = {key: inputs[key] for key in prompt_fields(missing)}
+        return self.prompt_budget.render(
+            "generate_job_search_strategy",
+            lambda values: build_sections_prompt(missing, dict(inputs, **values)),
+            fields
+        )
+    
+    def generate_job_search_strategy(self, job_title, experience, skills, expected_salary, use_cache=True, on_chunk=None):
+        """Generate a job search strategy as a structured JobSearchStrategy
         
-        prompt = f"""
+        Each section is cached under only the inputs it depends on, so changing
+        one field regenerates just the affected sections in a single JSON request.
+        Pass on_chunk to stream the strategy as markdown; each section is filled
+        in as its JSON value arrives.
+        """
+        inputs, strategy, missing = self._strategy_plan(job_title, experience, skills, expected_salary, use_cache)
+        stream = StrategyStream(strategy, missing, on_chunk) if on_chunk else None
+        if not missing:
+            return strategy
+        
+        text = self._generate(
+            "generate_job_search_strategy",
+            inputs,
+            self._strategy_prompt(missing, inputs),
+            use_cache=False,
+            on_chunk=stream.feed if stream else None,
+            generation_config=structured_generation_config(missing)
+        )
+        return self._fill_strategy(strategy, inputs, missing, text)
+    
+    def _job_market_trends_request(self, job_title, skills):
+        """Build the cache inputs and prompt for analyze_job_market_trends"""
+        skills = self.skill_taxonomy.compact_skills(skills)
+        inputs = {"job_title": job_title, "skills": skills}
+        
+        template = """
         As a job market analyst, provide insights about current market trends for:
 
         Job Title: {job_title}
@@ -88,19 +334,29 @@ class GeminiClient:
 
         Keep the response concise but informative.
         """
+        prompt = self.prompt_budget.build("analyze_job_market_trends", template, inputs)
+        
+        return inputs, prompt
+    
+    def analyze_job_market_trends(self, job_title, skills, use_cache=True):
+        """Analyze current job market trends for the specified role"""
+        inputs, prompt = self._job_market_trends_request(job_title, skills)
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._generate("analyze_job_market_trends", inputs, prompt, use_cache)
         
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             logging.error(f"Error analyzing job market trends: {str(e)}")
             return f"Error analyzing market trends: {str(e)}"
     
-    def generate_resume_tips(self, job_title, experience, skills):
-        """Generate personalized resume optimization tips"""
+    def _resume_tips_request(self, job_title, experience, skills):
+        """Build the cache inputs and prompt for generate_resume_tips"""
+        skills = self.skill_taxonomy.compact_skills(skills)
+        inputs = {"job_title": job_title, "experience": experience, "skills": skills}
         
-        prompt = f"""
+        template = """
         As a professional resume writer, provide specific resume optimization tips for:
 
         Target Job Title: {job_title}
@@ -118,11 +374,206 @@ class GeminiClient:
 
         Keep recommendations specific and actionable.
         """
+        prompt = self.prompt_budget.build("generate_resume_tips", template, inputs)
+        
+        return inputs, prompt
+    
+    def generate_resume_tips(self, job_title, experience, skills, use_cache=True):
+        """Generate personalized resume optimization tips"""
+        inputs, prompt = self._resume_tips_request(job_title, experience, skills)
+        
+        try:
+            return self._generate("generate_resume_tips", inputs, prompt, use_cache)
+        
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            logging.error(f"Error generating resume tips: {str(e)}")
+            return f"Error generating resume tips: {str(e)}"
+    
+    def run_job(self, method, payload):
+        """Run a request from the durable job queue, raising on failure so it can be retried
+        
+        payload holds the method's keyword arguments, e.g. the job_title and skills
+        for analyze_job_market_trends.
+        """
+        if method == "generate_job_search_strategy":
+            return self.generate_job_search_strategy(**payload).to_markdown()
+        
+        requests = {
+            "generate_job_search_query": self._job_search_query_request,
+            "analyze_job_market_trends": self._job_market_trends_request,
+            "generate_resume_tips": self._resume_tips_request
+        }
+        inputs, prompt = requests[method](**payload)
+        return self._generate(method, inputs, prompt)
+
+class AsyncGeminiClient:
+    """Asyncio counterpart of GeminiClient built on generate_content_async
+    
+    Shares the prompts, model and response cache of a GeminiClient. Run its
+    coroutines on the app's AsyncLoopThread rather than one thread per request.
+    """
+    
+    def __init__(self, client=None):
+        self.client = client or GeminiClient()
+        self.model_name = self.client.model_name
+    
+    async def _generate(self, method, inputs, prompt, use_cache=True, on_chunk=None, generation_config=None):
+        """Generate content asynchronously, serving repeat inputs from the response cache"""
+        cache = self.client.cache if use_cache else None
+        
+        if cache:
+            # A response from any tier this request may be routed to is good enough
+            cached = cache.get_any(self.client.router.candidates(method, prompt), method, inputs)
+            if cached is not None:
+                logging.info(f"Cache hit for {method}")
+                if on_chunk:
+                    on_chunk(cached)
+                return cached
+        
+        key = SingleFlight.make_key(self.model_name, prompt)
+        answered = []
+        text, shared = await self.client.single_flight.do_async(
+            key, lambda: self._call_model(method, prompt, on_chunk, generation_config, answered)
+        )
+        
+        if shared:
+            logging.info(f"Joined an identical in-flight {method} request")
+            if on_chunk:
+                on_chunk(text)
+        elif cache:
+            # Keyed on the tier that answered, which need not be GEMINI_MODEL
+            cache.set(answered[-1], method, inputs, text)
+        
+        return text
+    
+    async def _call_model(self, method, prompt, on_chunk=None, generation_config=None, answered=None):
+        """Send a prompt to the routed model tier, falling back to heavier tiers on failure
+        
+        Each tier tried is appended to answered, so once a call succeeds its
+        last entry is the model that answered
+        """
+        def attempt(model_name, on_chunk, timeout):
+            if answered is not None:
+                answered.append(model_name)
+            return self._call_tier(method, model_name, prompt, on_chunk, generation_config, timeout)
+        
+        return await self.client.router.call_async(method, prompt, on_chunk, attempt)
+    
+    async def _call_tier(self, method, model_name, prompt, on_chunk, generation_config, timeout):
+        """Call one model under the shared rate limits, hedging slow non-streaming calls"""
+        model = self.client._model(model_name)
+        request_options = {"timeout": timeout} if timeout else None
+        max_retries = 0 if timeout else None
+        rate_limiter = self.client.rate_limiter
+        if on_chunk:
+            return await rate_limiter.call_async(
+                lambda: self._stream(method, prompt, on_chunk, generation_config, model, request_options),
+                prompt,
+                max_retries
+            )
+        return await self.client.hedger.call_async(
+            self.client._hedge_key(method, model_name),
+            lambda: rate_limiter.call_async(
+                lambda: self._request_text(prompt, generation_config, model, request_options), prompt, max_retries
+            )
+        )
+    
+    async def _request_text(self, prompt, generation_config=None, model=None, request_options=None):
+        """Send a single non-streaming request and return its text"""
+        response = await (model or self.client.model).generate_content_async(
+            prompt, generation_config=generation_config, request_options=request_options
+        )
+        return response.text
+    
+    async def _stream(self, method, prompt, on_chunk, generation_config=None, model=None, request_options=None):
+        """Stream a response chunk by chunk, logging its time to first token"""
+        started = time.perf_counter()
+        parts = []
+        
+        response = await (model or self.client.model).generate_content_async(
+            prompt, stream=True, generation_config=generation_config, request_options=request_options
+        )
+        async for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+            
+            if not parts:
+                logging.info(f"{method} first token after {time.perf_counter() - started:.2f}s")
+            
+            parts.append(text)
+            on_chunk(text)
+        
+        return "".join(parts)
+    
+    async def generate_job_search_query(self, job_title, experience, skills, expected_salary, use_cache=True, on_chunk=None):
+        """Generate a comprehensive job search strategy using Gemini AI"""
+        inputs, prompt = self.client._job_search_query_request(job_title, experience, skills, expected_salary)
+        
+        try:
+            return await self._generate("generate_job_search_query", inputs, prompt, use_cache, on_chunk)
+        
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            logging.error(f"Error generating job search query: {str(e)}")
+            return f"Error generating job search strategy: {str(e)}"
+    
+    async def generate_job_search_strategy(self, job_title, experience, skills, expected_salary, use_cache=True, on_chunk=None):
+        """Generate a job search strategy as a structured JobSearchStrategy, streaming it to on_chunk when given"""
+        inputs, strategy, missing = self.client._strategy_plan(job_title, experience, skills, expected_salary, use_cache)
+        stream = StrategyStream(strategy, missing, on_chunk) if on_chunk else None
+        if not missing:
+            return strategy
+        
+        text = await self._generate(
+            "generate_job_search_strategy",
+            inputs,
+            self.client._strategy_prompt(missing, inputs),
+            use_cache=False,
+            on_chunk=stream.feed if stream else None,
+            generation_config=structured_generation_config(missing)
+        )
+        return self.client._fill_strategy(strategy, inputs, missing, text)
+    
+    async def analyze_job_market_trends(self, job_title, skills, use_cache=True):
+        """Analyze current job market trends for the specified role"""
+        inputs, prompt = self.client._job_market_trends_request(job_title, skills)
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return await self._generate("analyze_job_market_trends", inputs, prompt, use_cache)
         
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            logging.error(f"Error analyzing job market trends: {str(e)}")
+            return f"Error analyzing market trends: {str(e)}"
+    
+    async def generate_resume_tips(self, job_title, experience, skills, use_cache=True):
+        """Generate personalized resume optimization tips"""
+        inputs, prompt = self.client._resume_tips_request(job_title, experience, skills)
+        
+        try:
+            return await self._generate("generate_resume_tips", inputs, prompt, use_cache)
+        
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             logging.error(f"Error generating resume tips: {str(e)}")
-            return f"Error generating resume tips: {str(e)}"
\ No newline at end of file
+            return f"Error generating resume tips: {str(e)}"
+    
+    async def run_job(self, method, payload):
+        """Async counterpart of GeminiClient.run_job, raising on failure"""
+        if method == "generate_job_search_strategy":
+            return (await self.generate_job_search_strategy(**payload)).to_markdown()
+        
+        requests = {
+            "generate_job_search_query": self.client._job_search_query_request,
+            "analyze_job_market_trends": self.client._job_market_trends_request,
+            "generate_resume_tips": self.client._resume_tips_request
+        }
+        inputs, prompt = requests[method](**payload)
+        return await self._generate(method, inputs, prompt)
@@ -1,29 +1,91 @@
+import os
+import sys
+
+# The shared ai_common package sits next to this app's folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_common.startup_profile import profiler
+import argparse
 import tkinter as tk
 from tkinter import messagebox
 import customtkinter as ctk
-import threading
+import asyncio
 import logging
+import threading
+from concurrent.futures import Future
 from config import Config
-from gemini_client import GeminiClient
+from gemini_client import GeminiClient, AsyncGeminiClient
+from ai_common.gateway_client import create_client, create_async_client
+from ai_common.async_runner import ActionLimitReached, ActionRunner, AsyncLoopThread, with_deadline
+from ai_common.job_queue import CANCELLED, DONE, JobWorkerPool, create_job_queue
+from prefetcher import Prefetcher
+from ai_common.skill_taxonomy import SkillTaxonomy
 from gui_components import (
     ModernButton, ModernEntry, ModernComboBox, ModernTextArea, 
-    ModernLabel, ModernFrame, LoadingDialog, ResultsDialog
+    ModernLabel, ModernFrame, LoadingDialog, ResultsDialog, TabbedResultsDialog, UIDispatcher
 )
 
+profiler.mark("imports")
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
+# Results dialog titles for jobs resumed from a previous session
+JOB_TITLES = {
+    "generate_job_search_query": "Job Search Strategy",
+    "generate_job_search_strategy": "Job Search Strategy",
+    "analyze_job_market_trends": "Market Trends Analysis",
+    "generate_resume_tips": "Resume Optimization Tips"
+}
+
+# Form fields each request takes, so a click finds the result prefetched for the same inputs
+JOB_FIELDS = {
+    "generate_job_search_query": ('job_title', 'experience', 'skills', 'expected_salary'),
+    "generate_job_search_strategy": ('job_title', 'experience', 'skills', 'expected_salary'),
+    "analyze_job_market_trends": ('job_title', 'skills'),
+    "generate_resume_tips": ('job_title', 'experience', 'skills')
+}
+
 class JobSearchAI:
     """Main application class for Job Search AI"""
     
     def __init__(self):
         self.root = ctk.CTk()
+        # Worker threads update widgets only through this queue, drained on the Tk thread
+        self.ui = UIDispatcher(self.root, Config.UI_DISPATCH_INTERVAL_MS, Config.UI_DISPATCH_BUDGET_MS).start()
         self.gemini_client = None
-        self.loading_dialog = None
+        self.async_client = None
+        self.gemini_init_error = None
+        
+        # One long-lived event loop thread for async Gemini requests, with a bounded
+        # thread pool for the blocking work it hands off
+        self.async_loop = AsyncLoopThread(max_workers=Config.ASYNC_MAX_WORKER_THREADS).start()
+        
+        # Requests started from the GUI; a repeat click attaches to the pending one
+        self.actions = ActionRunner(Config.MAX_PENDING_ACTIONS)
+        
+        # Durable queue for requests that must survive closing the app; its
+        # workers start once the Gemini client is ready
+        self.job_queue = create_job_queue(Config)
+        self.job_workers = None
+        # job_futures and running_requests are shared by the Tk thread, the job workers
+        # and whichever thread cancels a future, so they are only touched under this lock
+        self.jobs_lock = threading.Lock()
+        # Futures of the jobs queued this session, resolved when each one finishes
+        self.job_futures = {}
+        # Requests running for queued jobs, so a job can be cancelled mid-call
+        self.running_requests = {}
+        
+        # Speculative results for the likely next analyses (Config.PREFETCH_ENABLED);
+        # created once the Gemini client is ready
+        self.prefetcher = None
+        self._prefetch_timer = None
         
         # Initialize the application
         self.setup_window()
         self.create_widgets()
+        self.bind_prefetch_triggers()
+        profiler.mark("widgets created")
         self.initialize_gemini()
     
     def setup_window(self):
@@ -51,13 +113,273 @@ class JobSearchAI:
         self.root.geometry(f"{Config.WINDOW_WIDTH}x{Config.WINDOW_HEIGHT}+{x}+{y}")
     
     def initialize_gemini(self):
-        """Initialize Gemini AI client"""
+        """Warm up the Gemini client in the background so the window paints right away"""
+        self.async_loop.submit_to_tk(
+            self.ui,
+            self._warm_up_gemini(),
+            self._on_gemini_ready,
+            on_error=self._on_gemini_error
+        )
+    
+    async def _warm_up_gemini(self):
+        """Connect to the LLM gateway, or import the SDK and build a local client, on a worker thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, create_client, Config, GeminiClient)
+    
+    def _on_gemini_ready(self, client):
+        """Install the warmed-up client (runs on the Tk thread)"""
+        self.gemini_client = client
+        self.async_client = create_async_client(client, AsyncGeminiClient)
+        self.status_label.configure(text="✅ AI Assistant Ready")
+        self.start_job_workers()
+        
+        if Config.PREFETCH_ENABLED:
+            self.prefetcher = Prefetcher(
+                self.async_loop,
+                min_headroom=Config.PREFETCH_MIN_HEADROOM,
+                is_busy=lambda: self.actions.pending() > 0,
+                rate_limiter=getattr(client, "rate_limiter", None)
+            )
+            self.schedule_prefetch()
+        
+        if client.sdk_import_seconds is not None:
+            profiler.note("Gemini SDK import (background)", client.sdk_import_seconds)
+        profiler.mark("Gemini warm-up finished")
+    
+    def _on_gemini_error(self, error):
+        """Report a failed warm-up (runs on the Tk thread)"""
+        self.gemini_init_error = error
+        self.status_label.configure(text="❌ AI Assistant Error - Check API Key")
+        logging.error(f"Failed to initialize Gemini client: {str(error)}")
+        profiler.mark("Gemini warm-up finished")
+    
+    def start_job_workers(self):
+        """Start working through the job queue, including jobs left over from the last session"""
+        resumed = len(self.job_queue.pending())
+        self.job_workers = JobWorkerPool(
+            self.job_queue,
+            self._run_job,
+            Config.JOB_QUEUE_WORKERS,
+            lease_seconds=Config.JOB_LEASE_SECONDS,
+            max_attempts=Config.JOB_MAX_ATTEMPTS,
+            retry_delay=Config.JOB_RETRY_DELAY,
+            on_finished=lambda job: self.ui.post(self._on_job_finished, job)
+        ).start()
+        
+        if resumed:
+            self.status_label.configure(text=f"✅ AI Assistant Ready - resuming {resumed} unfinished request(s)")
+    
+    def request_deadline(self, method):
+        """Seconds a request for method may run before it is aborted"""
+        return Config.REQUEST_DEADLINES.get(method, Config.ASYNC_REQUEST_TIMEOUT)
+    
+    def _run_job(self, job):
+        """Run a queued job on the event loop under its deadline (runs on a job worker thread)"""
+        self.ui.post_latest(
+            "status",
+            self.status_label.configure,
+            text=f"⏳ Working on {JOB_TITLES.get(job.method, job.method)} (attempt {job.attempts})..."
+        )
+        handle = self.async_loop.start_request(
+            job.method,
+            self.async_client.run_job(job.method, job.payload),
+            self.request_deadline(job.method)
+        )
+        with self.jobs_lock:
+            self.running_requests[job.id] = handle
         try:
-            self.gemini_client = GeminiClient()
+            # Cancelled while it was being leased
+            if self.job_queue.get(job.id).status == CANCELLED:
+                handle.cancel()
+            return handle.result()
+        finally:
+            with self.jobs_lock:
+                self.running_requests.pop(job.id, None)
+    
+    def cancel_job(self, job_id):
+        """Abort a queued or running job, releasing its connection and rate-limit slot (any thread)"""
+        if not self.job_queue.cancel(job_id):
+            # Already finished: drop the result that is on its way to the Tk thread,
+            # unless it has been delivered and its entry is gone
+            with self.jobs_lock:
+                if job_id in self.job_futures:
+                    self.job_futures[job_id] = None
+            return
+        
+        with self.jobs_lock:
+            self.job_futures.pop(job_id, None)
+            handle = self.running_requests.get(job_id)
+        if handle:
+            handle.cancel()
+        logging.info(f"Cancelled job {job_id}")
+        self.ui.post_latest("status", self.status_label.configure, text="✅ AI Assistant Ready - request cancelled")
+    
+    def submit_job(self, method, payload):
+        """Queue a request durably and return a Future of its result text
+        
+        The future is resolved on the Tk thread, with the job's error as a
+        RuntimeError if it failed for good. Cancelling it cancels the job.
+        """
+        job_id = self.job_queue.enqueue(method, payload)
+        logging.info(f"Queued {method} as job {job_id}")
+        future = Future()
+        future.add_done_callback(lambda done: self.cancel_job(job_id) if done.cancelled() else None)
+        with self.jobs_lock:
+            self.job_futures[job_id] = future
+        self.job_workers.notify()
+        return future
+    
+    def _on_job_finished(self, job):
+        """Resolve the future of a job queued this session, or show a job resumed from the last one"""
+        with self.jobs_lock:
+            idle = not self.running_requests
+            queued_here = job.id in self.job_futures
+            future = self.job_futures.pop(job.id, None)
+        if idle:
             self.status_label.configure(text="✅ AI Assistant Ready")
+        
+        if queued_here:
+            if future is None or not future.set_running_or_notify_cancel():
+                return
+            if job.status == DONE:
+                future.set_result(job.result)
+            else:
+                future.set_exception(RuntimeError(job.error))
+        elif job.status == DONE:
+            ResultsDialog(self.root, f"{JOB_TITLES.get(job.method, 'Result')} (resumed)", job.result)
+        else:
+            logging.error(f"Resumed job {job.id} ({job.method}) failed: {job.error}")
+    
+    def run_action(self, name, inputs, start):
+        """Start a tracked action with start(action) and return it, or None if the click started nothing
+        
+        Clicking again while the same action with the same inputs is pending
+        brings its dialog to the front instead, and past
+        Config.MAX_PENDING_ACTIONS the click is refused with a message.
+        """
+        try:
+            action, started = self.actions.run(name, inputs, start)
+        except ActionLimitReached as e:
+            messagebox.showwarning("Busy", str(e))
+            return None
+        
+        if not started:
+            logging.info(f"{name} is already running for these inputs; showing it instead")
+            if action.dialog and action.dialog.dialog.winfo_exists():
+                action.dialog.dialog.lift()
+                action.dialog.dialog.focus_force()
+            return None
+        return action
+    
+    def request_analysis(self, method, data, loading_title, show_results, error_prefix, status=None):
+        """Show a prefetched result right away, or run the request behind its own loading dialog"""
+        payload = {key: data[key] for key in JOB_FIELDS[method]}
+        
+        if self.prefetcher:
+            result = self.prefetcher.take(method, payload)
+            if result is not None:
+                logging.info(f"Using prefetched {method}")
+                show_results(result)
+                return
+        
+        action = self.run_action(method, payload, lambda action: self._start_request(method, payload))
+        if action is None:
+            return
+        
+        # Show loading dialog
+        loading_dialog = LoadingDialog(
+            self.root, loading_title, on_cancel=action.future.cancel, deadline=self.request_deadline(method)
+        )
+        if status:
+            loading_dialog.update_status(status)
+        action.dialog = loading_dialog
+        action.future.add_done_callback(
+            lambda done: self.ui.post(self._finish_analysis, done, loading_dialog, show_results, error_prefix)
+        )
+    
+    def _start_request(self, method, payload):
+        """Return a Future of a request's text: a matching prefetch still running, or a queued job"""
+        claimed = self.prefetcher.claim(method, payload) if self.prefetcher else None
+        if claimed is None:
+            return self.submit_job(method, payload)
+        
+        logging.info(f"Waiting on prefetched {method}")
+        return self.async_loop.submit(self._await_prefetch(claimed, method, payload))
+    
+    async def _await_prefetch(self, claimed, method, payload):
+        """Wait on a claimed prefetch, queueing the request as usual if the prefetch failed"""
+        try:
+            return await asyncio.wrap_future(claimed)
         except Exception as e:
-            self.status_label.configure(text="❌ AI Assistant Error - Check API Key")
-            logging.error(f"Failed to initialize Gemini client: {str(e)}")
+            logging.info(f"Prefetched {method} failed ({str(e)}), queueing it")
+        return await asyncio.wrap_future(self.submit_job(method, payload))
+    
+    def _finish_analysis(self, future, loading_dialog, show_results, error_prefix):
+        """Close an analysis' loading dialog and show its result or error"""
+        loading_dialog.close()
+        if future.cancelled():
+            return
+        
+        if future.exception() is None:
+            show_results(future.result())
+        else:
+            self._show_error(f"{error_prefix}: {str(future.exception())}")
+    
+    def _finish_stream(self, future, results_dialog, error_prefix):
+        """Complete an open results dialog with a finished request's text or error"""
+        if future.cancelled():
+            return
+        
+        if future.exception() is None:
+            results_dialog.finish(future.result())
+        else:
+            results_dialog.finish(f"{error_prefix}: {str(future.exception())}")
+    
+    def bind_prefetch_triggers(self):
+        """Restart the prefetch countdown whenever the form changes"""
+        if not Config.PREFETCH_ENABLED:
+            return
+        
+        self.job_title_entry.bind("<KeyRelease>", self.schedule_prefetch)
+        self.skills_text.bind("<KeyRelease>", self.schedule_prefetch)
+        self.experience_combo.configure(command=self.schedule_prefetch)
+        self.salary_combo.configure(command=self.schedule_prefetch)
+    
+    def schedule_prefetch(self, *_):
+        """Prefetch once the form has been unchanged for Config.PREFETCH_DEBOUNCE_MS"""
+        if self._prefetch_timer is not None:
+            self.root.after_cancel(self._prefetch_timer)
+        self._prefetch_timer = self.root.after(Config.PREFETCH_DEBOUNCE_MS, self._prefetch)
+    
+    def _prefetch(self):
+        """Speculatively start the likely next analyses for the current form, dropping stale ones"""
+        self._prefetch_timer = None
+        if not self.prefetcher:
+            return
+        
+        data = self.get_form_data()
+        if not data['job_title'] or not data['skills'] or data['skills'].startswith("e.g.,"):
+            self.prefetcher.prefetch([])
+            return
+        
+        requests = []
+        for method in Config.PREFETCH_METHODS:
+            payload = {key: data[key] for key in JOB_FIELDS[method]}
+            requests.append((
+                method,
+                payload,
+                lambda method=method, payload=payload: with_deadline(
+                    self.async_client.run_job(method, payload), self.request_deadline(method)
+                )
+            ))
+        self.prefetcher.prefetch(requests)
+    
+    def show_ai_unavailable(self):
+        """Explain why the AI Assistant cannot take requests right now"""
+        if self.gemini_init_error is None:
+            messagebox.showinfo("Please wait", "AI Assistant is still starting up. Please try again in a moment.")
+        else:
+            messagebox.showerror("Error", "AI Assistant is not available. Please check your API key.")
     
     def create_widgets(self):
         """Create and layout all GUI widgets"""
@@ -215,6 +537,15 @@ class JobSearchAI:
         )
         resume_btn.pack(fill="x", pady=(0, 10))
         
+        # Full Report button
+        report_btn = ModernButton(
+            buttons_frame,
+            text="📊 Full Report (All Analyses)",
+            command=self.generate_full_report,
+            height=45
+        )
+        report_btn.pack(fill="x", pady=(0, 10))
+        
         # Clear Form button
         clear_btn = ModernButton(
             buttons_frame,
@@ -281,6 +612,13 @@ class JobSearchAI:
             messagebox.showerror("Validation Error", "Please enter your skills.")
             return False
         
+        if not SkillTaxonomy.shared(Config).known_skills(skills) and not messagebox.askyesno(
+            "Check Skills",
+            "None of the entered skills were recognized. Separate skills with commas "
+            "(e.g. Python, SQL, Project Management).\n\nContinue anyway?"
+        ):
+            return False
+        
         return True
     
     def get_form_data(self):
@@ -298,54 +636,77 @@ class JobSearchAI:
             return
         
         if not self.gemini_client:
-            messagebox.showerror("Error", "AI Assistant is not available. Please check your API key.")
+            self.show_ai_unavailable()
             return
         
         # Get form data
         data = self.get_form_data()
         
-        # Show loading dialog
-        self.loading_dialog = LoadingDialog(self.root, "Generating Strategy...")
-        
-        # Run AI generation in separate thread
-        thread = threading.Thread(
-            target=self._generate_strategy_thread,
-            args=(data,)
-        )
-        thread.daemon = True
-        thread.start()
-    
-    def _generate_strategy_thread(self, data):
-        """Thread function for generating strategy"""
-        try:
-            self.loading_dialog.update_status("Analyzing your requirements...")
+        if Config.STREAM_RESPONSES:
+            # Open the results right away and fill them in as the response streams;
+            # closing the dialog aborts the stream
+            def start(action):
+                action.dialog = ResultsDialog(self.root, "Job Search Strategy", streaming=True)
+                on_chunk = self.ui.stream(action.dialog.append_text)
+                if Config.STRUCTURED_STRATEGY:
+                    # Each section is written as its JSON value arrives
+                    future = self.async_loop.submit(
+                        self._stream_structured_strategy(data, on_chunk),
+                        self.request_deadline("generate_job_search_strategy")
+                    )
+                else:
+                    future = self.async_loop.submit(
+                        self.async_client.generate_job_search_query(
+                            data['job_title'],
+                            data['experience'],
+                            data['skills'],
+                            data['expected_salary'],
+                            on_chunk=on_chunk
+                        ),
+                        self.request_deadline("generate_job_search_query")
+                    )
+                action.dialog.on_close = future.cancel
+                return future
             
-            # Generate strategy using Gemini AI
-            strategy = self.gemini_client.generate_job_search_query(
-                data['job_title'],
-                data['experience'],
-                data['skills'],
-                data['expected_salary']
-            )
-            
-            # Close loading dialog and show results
-            self.root.after(0, self._show_strategy_results, strategy)
+            action = self.run_action("stream_job_search_strategy", data, start)
+        elif Config.STRUCTURED_STRATEGY:
+            # Sections are generated as JSON, so open the results and fill them in once parsed
+            def start(action):
+                action.dialog = ResultsDialog(self.root, "Job Search Strategy", streaming=True)
+                future = self.submit_job("generate_job_search_strategy", data)
+                action.dialog.on_close = future.cancel
+                return future
             
-        except Exception as e:
-            self.root.after(0, self._show_error, f"Error generating strategy: {str(e)}")
+            action = self.run_action("generate_job_search_strategy", data, start)
+        else:
+            self.request_analysis(
+                "generate_job_search_query",
+                data,
+                "Generating Strategy...",
+                self._show_strategy_results,
+                "Error generating strategy",
+                status="Analyzing your requirements..."
+            )
+            return
+        
+        if action:
+            action.future.add_done_callback(
+                lambda done: self.ui.post(self._finish_stream, done, action.dialog, "Error generating strategy")
+            )
+    
+    async def _stream_structured_strategy(self, data, on_chunk):
+        """Stream a structured strategy into a results dialog and return its markdown"""
+        strategy = await self.async_client.generate_job_search_strategy(
+            data['job_title'], data['experience'], data['skills'], data['expected_salary'], on_chunk=on_chunk
+        )
+        return strategy.to_markdown()
     
     def _show_strategy_results(self, strategy):
         """Show strategy results in a dialog"""
-        if self.loading_dialog:
-            self.loading_dialog.close()
-        
         ResultsDialog(self.root, "Job Search Strategy", strategy)
     
     def _show_error(self, error_message):
         """Show error message"""
-        if self.loading_dialog:
-            self.loading_dialog.close()
-        
         messagebox.showerror("Error", error_message)
     
     def analyze_market_trends(self):
@@ -358,33 +719,19 @@ class JobSearchAI:
             return
         
         if not self.gemini_client:
-            messagebox.showerror("Error", "AI Assistant is not available.")
+            self.show_ai_unavailable()
             return
         
-        # Show loading dialog
-        self.loading_dialog = LoadingDialog(self.root, "Analyzing Market Trends...")
-        
-        # Run analysis in separate thread
-        thread = threading.Thread(
-            target=self._analyze_trends_thread,
-            args=(job_title, skills)
+        self.request_analysis(
+            "analyze_job_market_trends",
+            {'job_title': job_title, 'skills': skills},
+            "Analyzing Market Trends...",
+            self._show_trends_results,
+            "Error analyzing trends"
         )
-        thread.daemon = True
-        thread.start()
-    
-    def _analyze_trends_thread(self, job_title, skills):
-        """Thread function for analyzing trends"""
-        try:
-            trends = self.gemini_client.analyze_job_market_trends(job_title, skills)
-            self.root.after(0, self._show_trends_results, trends)
-        except Exception as e:
-            self.root.after(0, self._show_error, f"Error analyzing trends: {str(e)}")
     
     def _show_trends_results(self, trends):
         """Show trends results"""
-        if self.loading_dialog:
-            self.loading_dialog.close()
-        
         ResultsDialog(self.root, "Market Trends Analysis", trends)
     
     def get_resume_tips(self):
@@ -393,40 +740,82 @@ class JobSearchAI:
             return
         
         if not self.gemini_client:
-            messagebox.showerror("Error", "AI Assistant is not available.")
+            self.show_ai_unavailable()
+            return
+        
+        self.request_analysis(
+            "generate_resume_tips",
+            self.get_form_data(),
+            "Generating Resume Tips...",
+            self._show_resume_tips_results,
+            "Error generating resume tips"
+        )
+    
+    def _show_resume_tips_results(self, tips):
+        """Show resume tips results"""
+        ResultsDialog(self.root, "Resume Optimization Tips", tips)
+    
+    def generate_full_report(self):
+        """Run the strategy, market trends and resume tips analyses concurrently"""
+        if not self.validate_inputs():
+            return
+        
+        if not self.gemini_client:
+            self.show_ai_unavailable()
             return
         
         data = self.get_form_data()
+        strategy_method = "generate_job_search_strategy" if Config.STRUCTURED_STRATEGY else "generate_job_search_query"
+        # Tab name -> (method whose deadline applies, coroutine factory)
+        analyses = {
+            "Job Search Strategy": (strategy_method, lambda: self._full_report_strategy(data)),
+            "Market Trends": ("analyze_job_market_trends", lambda: self.async_client.analyze_job_market_trends(
+                data['job_title'], data['skills']
+            )),
+            "Resume Tips": ("generate_resume_tips", lambda: self.async_client.generate_resume_tips(
+                data['job_title'], data['experience'], data['skills']
+            ))
+        }
         
-        # Show loading dialog
-        self.loading_dialog = LoadingDialog(self.root, "Generating Resume Tips...")
+        def start(action):
+            action.dialog = TabbedResultsDialog(self.root, "Full Job Search Report", list(analyses))
+            future = self.async_loop.submit(self._run_full_report(analyses, action.dialog))
+            
+            # Closing the report cancels any analyses that are still running
+            action.dialog.on_close = future.cancel
+            return future
         
-        # Run generation in separate thread
-        thread = threading.Thread(
-            target=self._generate_resume_tips_thread,
-            args=(data,)
-        )
-        thread.daemon = True
-        thread.start()
+        self.run_action("full_report", data, start)
     
-    def _generate_resume_tips_thread(self, data):
-        """Thread function for generating resume tips"""
-        try:
-            tips = self.gemini_client.generate_resume_tips(
-                data['job_title'],
-                data['experience'],
-                data['skills']
+    async def _full_report_strategy(self, data):
+        """Generate the Full Report's strategy tab, structured when enabled"""
+        if Config.STRUCTURED_STRATEGY:
+            strategy = await self.async_client.generate_job_search_strategy(
+                data['job_title'], data['experience'], data['skills'], data['expected_salary']
             )
-            self.root.after(0, self._show_resume_tips_results, tips)
-        except Exception as e:
-            self.root.after(0, self._show_error, f"Error generating resume tips: {str(e)}")
-    
-    def _show_resume_tips_results(self, tips):
-        """Show resume tips results"""
-        if self.loading_dialog:
-            self.loading_dialog.close()
+            return strategy.to_markdown()
         
-        ResultsDialog(self.root, "Resume Optimization Tips", tips)
+        return await self.async_client.generate_job_search_query(
+            data['job_title'], data['experience'], data['skills'], data['expected_salary']
+        )
+    
+    async def _run_full_report(self, analyses, report_dialog):
+        """Run every analysis concurrently, filling each tab as soon as it finishes"""
+        semaphore = asyncio.Semaphore(Config.FULL_REPORT_MAX_WORKERS)
+        
+        async def run_analysis(tab, method, make_request):
+            async with semaphore:
+                try:
+                    content = await with_deadline(make_request(), self.request_deadline(method))
+                except TimeoutError:
+                    content = f"Error generating {tab.lower()}: request timed out"
+                except Exception as e:
+                    content = f"Error generating {tab.lower()}: {str(e)}"
+            self.ui.post(report_dialog.set_tab_content, tab, content)
+        
+        await asyncio.gather(*(
+            run_analysis(tab, method, make_request) for tab, (method, make_request) in analyses.items()
+        ))
     
     def clear_form(self):
         """Clear all form fields"""
@@ -438,10 +827,33 @@ class JobSearchAI:
     
     def run(self):
         """Start the application"""
-        self.root.mainloop()
+        self.root.after_idle(profiler.mark, "first paint")
+        try:
+            self.root.mainloop()
+        finally:
+            if self.prefetcher:
+                self.prefetcher.close()
+                logging.info(f"Prefetch stats: {self.prefetcher.stats()}")
+            
+            # Unfinished jobs stay in the queue and resume on the next launch
+            if self.job_workers:
+                self.job_workers.stop()
+            self.async_loop.stop()
+            self.ui.stop()
+            logging.info(f"UI dispatch stats: {self.ui.stats()}")
+            logging.info(f"Action stats: {self.actions.stats()}")
 
 def main():
     """Main function to run the application"""
+    parser = argparse.ArgumentParser(description=Config.APP_TITLE)
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print an import-time and first-paint breakdown once the app is ready"
+    )
+    args = parser.parse_args()
+    profiler.enabled = args.profile_startup
+    
     try:
         app = JobSearchAI()
         app.run()
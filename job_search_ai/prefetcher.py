@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+import threading
+
+from ai_common.response_cache import ResponseCache
+
+# How often a waiting speculative request checks whether it may start
+BUSY_POLL_SECONDS = 0.5
+
+
+class Prefetcher:
+    """Speculatively runs the likely next analyses while the form is being filled in
+
+    prefetch() is called with the requests the user will probably make next for
+    the current form values. They run one at a time on the app's event loop,
+    only while none of the user's own requests are pending and the rate limiter
+    has quota to spare. Results are kept in memory for the current form values
+    only: when the inputs change, unused results are dropped and speculative
+    requests still running are cancelled.
+
+    Hit rate counts results a click actually used; wasted counts finished
+    results that were thrown away unused.
+    """
+
+    def __init__(self, async_loop, min_headroom=0.5, is_busy=None, rate_limiter=None):
+        self.async_loop = async_loop
+        self.min_headroom = min_headroom
+        self.is_busy = is_busy
+        self.rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+        self._results = {}
+        self._inflight = {}
+        # Created on the event loop the first time a request runs
+        self._slot = None
+        self.started = 0
+        self.hits = 0
+        self.wasted = 0
+        self.cancelled = 0
+        self.failed = 0
+
+    @staticmethod
+    def make_key(method, inputs):
+        """Key a request by method and normalized inputs, like the response cache"""
+        return json.dumps([method, ResponseCache.normalize(inputs)], sort_keys=True)
+
+    def prefetch(self, requests):
+        """Speculate on [(method, inputs, make_coro)] for the current inputs, dropping stale work"""
+        wanted = {self.make_key(method, inputs): (method, make_coro) for method, inputs, make_coro in requests}
+
+        with self._lock:
+            for key in [key for key in self._results if key not in wanted]:
+                del self._results[key]
+                self.wasted += 1
+            for key in [key for key in self._inflight if key not in wanted]:
+                self._inflight.pop(key).cancel()
+                self.cancelled += 1
+
+            for key, (method, make_coro) in wanted.items():
+                if key in self._results or key in self._inflight:
+                    continue
+                self._inflight[key] = self.async_loop.submit(self._speculate(key, method, make_coro))
+                self.started += 1
+
+    def _busy(self):
+        """Whether speculative work should wait: the user is waiting on a request, or quota is low"""
+        if self.is_busy and self.is_busy():
+            return True
+        return self.rate_limiter is not None and self.rate_limiter.headroom() < self.min_headroom
+
+    def _should_wait(self, key):
+        """Whether a speculative request should keep waiting; one claimed by a click starts right away"""
+        # The lock also waits for prefetch() to finish registering the request
+        with self._lock:
+            claimed = key not in self._inflight
+        return not claimed and self._busy()
+
+    async def _speculate(self, key, method, make_coro):
+        """Run one speculative request at low priority and keep its result if it is still wanted"""
+        if self._slot is None:
+            self._slot = asyncio.Semaphore(1)
+
+        async with self._slot:
+            while self._should_wait(key):
+                await asyncio.sleep(BUSY_POLL_SECONDS)
+            try:
+                result = await make_coro()
+            except Exception as e:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                    self.failed += 1
+                logging.info(f"Prefetch of {method} failed: {str(e)}")
+                raise
+
+        with self._lock:
+            # Not wanted any more, or already claimed by a click waiting on this future
+            if self._inflight.pop(key, None) is not None:
+                self._results[key] = result
+        logging.info(f"Prefetched {method}")
+        return result
+
+    def take(self, method, inputs):
+        """Return a finished prefetched result for a click, or None"""
+        with self._lock:
+            result = self._results.pop(self.make_key(method, inputs), None)
+            if result is not None:
+                self.hits += 1
+        return result
+
+    def claim(self, method, inputs):
+        """Hand a click the future of a matching speculative request still running, or None
+
+        A claimed request is no longer cancelled when the inputs change.
+        """
+        with self._lock:
+            future = self._inflight.pop(self.make_key(method, inputs), None)
+            if future is not None:
+                self.hits += 1
+        return future
+
+    def close(self):
+        """Cancel speculative work and count unused results as wasted"""
+        with self._lock:
+            self.wasted += len(self._results)
+            self._results.clear()
+            for future in self._inflight.values():
+                future.cancel()
+            self.cancelled += len(self._inflight)
+            self._inflight.clear()
+
+    def stats(self):
+        """Return prefetch counters and the hit rate over speculative results that were resolved"""
+        with self._lock:
+            resolved = self.hits + self.wasted
+            return {
+                "started": self.started,
+                "hits": self.hits,
+                "wasted": self.wasted,
+                "cancelled": self.cancelled,
+                "failed": self.failed,
+                "hit_rate": self.hits / resolved if resolved else 0.0
+            }
@@ -0,0 +1,161 @@
+import json
+from dataclasses import dataclass, field
+
+from ai_common.section_stream import SectionStream
+
+# (field, heading, instructions, inputs the section depends on). Each section is
+# cached on its own, keyed only by its inputs, so e.g. changing the expected
+# salary regenerates the salary-related sections and reuses the rest.
+STRATEGY_SECTIONS = [
+    (
+        "keywords",
+        "Optimized Job Search Keywords",
+        "Suggest the best keywords and phrases to use when searching for this position on job boards.",
+        ("job_title", "experience", "skills")
+    ),
+    (
+        "job_boards",
+        "Job Board Recommendations",
+        "Recommend the top 5-7 job boards and platforms where this type of position is commonly posted.",
+        ("job_title", "experience")
+    ),
+    (
+        "skills_gap",
+        "Skills Gap Analysis",
+        "Based on the provided skills, identify any additional skills that would make the candidate more competitive for this role.",
+        ("job_title", "experience", "skills")
+    ),
+    (
+        "salary_insights",
+        "Salary Insights",
+        "Provide insights about the salary expectations for this role and experience level, including factors that might affect compensation.",
+        ("job_title", "experience", "expected_salary")
+    ),
+    (
+        "application_strategy",
+        "Application Strategy",
+        "Suggest the best approach for applying to these positions, including how to tailor resumes for this role, "
+        "key points to highlight in cover letters and interview preparation tips.",
+        ("job_title", "experience", "skills")
+    ),
+    (
+        "networking",
+        "Networking Opportunities",
+        "Suggest professional networks, communities, or events where one could connect with professionals in this field.",
+        ("job_title",)
+    ),
+    (
+        "company_types",
+        "Company Types",
+        "Recommend types of companies (startups, enterprises, specific industries) that typically hire for this role.",
+        ("job_title", "experience")
+    ),
+    (
+        "timeline",
+        "Timeline and Expectations",
+        "Provide realistic expectations about the job search timeline for this level of position.",
+        ("job_title", "experience", "expected_salary")
+    )
+]
+
+INPUT_LABELS = {
+    "job_title": "Job Title",
+    "experience": "Experience Level",
+    "skills": "Skills",
+    "expected_salary": "Expected Salary"
+}
+
+
+@dataclass
+class JobSearchStrategy:
+    """A job search strategy with one markdown field per section"""
+
+    keywords: str = ""
+    job_boards: str = ""
+    skills_gap: str = ""
+    salary_insights: str = ""
+    application_strategy: str = ""
+    networking: str = ""
+    company_types: str = ""
+    timeline: str = ""
+    reused_sections: list = field(default_factory=list)
+    generated_sections: list = field(default_factory=list)
+
+    def to_markdown(self):
+        """Render the sections in their usual order with numbered headings"""
+        parts = []
+        for number, (name, heading, _, _) in enumerate(STRATEGY_SECTIONS, start=1):
+            parts.append(f"## {number}. {heading}\n\n{getattr(self, name).strip()}")
+        return "\n\n".join(parts)
+
+
+def section_inputs(name, inputs):
+    """Return only the inputs a section depends on (its cache key)"""
+    dependencies = next(deps for section, _, _, deps in STRATEGY_SECTIONS if section == name)
+    return {key: inputs[key] for key in dependencies}
+
+
+def prompt_fields(sections):
+    """Return the inputs a prompt for the given sections shows, in label order"""
+    return [
+        key for key in INPUT_LABELS
+        if any(key in deps for name, _, _, deps in STRATEGY_SECTIONS if name in sections)
+    ]
+
+
+def build_sections_prompt(sections, inputs):
+    """Build a prompt asking for just the given sections as a JSON object"""
+    parameters = "\n".join(f"{INPUT_LABELS[key]}: {inputs[key]}" for key in prompt_fields(sections))
+    requested = "\n".join(
+        f'- "{name}" ({heading}): {instructions}'
+        for name, heading, instructions, _ in STRATEGY_SECTIONS
+        if name in sections
+    )
+
+    return (
+        "You are a professional career advisor and job search expert. "
+        "Help create part of a comprehensive job search strategy based on the following parameters:\n\n"
+        f"{parameters}\n\n"
+        "Return a JSON object with exactly these fields. Each value is a markdown string "
+        "using bullet points, without a heading:\n\n"
+        f"{requested}"
+    )
+
+
+def structured_generation_config(sections):
+    """Generation config asking for a JSON object with one string field per requested section"""
+    return {
+        "response_mime_type": "application/json",
+        "response_schema": {
+            "type": "OBJECT",
+            "properties": {name: {"type": "STRING"} for name in sections},
+            "required": list(sections)
+        }
+    }
+
+
+def parse_sections(text, sections):
+    """Parse the model's JSON reply, returning {section: markdown} for the requested sections"""
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("Structured strategy response is not a JSON object")
+    return {name: str(data.get(name, "")).strip() for name in sections}
+
+
+
+class StrategyStream(SectionStream):
+    """Stream a JobSearchStrategy as markdown while its JSON reply arrives"""
+
+    def __init__(self, strategy, missing, on_chunk):
+        order = [name for name, _, _, _ in STRATEGY_SECTIONS]
+        ready = {name: getattr(strategy, name) for name in order if name not in missing}
+        super().__init__(order, ready, missing, on_chunk)
+
+    def render(self, name, body):
+        """Render a section the way JobSearchStrategy.to_markdown() does"""
+        number, heading = next(
+            (number, heading)
+            for number, (section, heading, _, _) in enumerate(STRATEGY_SECTIONS, start=1)
+            if section == name
+        )
+        return f"## {number}. {heading}\n\n{body}"
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+import batch_cli
+from batch_cli import Config, read_rows, row_key, run_batch
+
+
+class Client:
+    """Stands in for GeminiClient: builds requests and reports empty stats"""
+
+    def _job_search_query_request(self, job_title, experience, skills, expected_salary):
+        return {"job_title": job_title}, f"strategy for {job_title}"
+
+    def _job_market_trends_request(self, job_title, skills):
+        return {"job_title": job_title}, f"trends for {job_title}"
+
+    def _resume_tips_request(self, job_title, experience, skills):
+        return {"job_title": job_title}, f"tips for {job_title}"
+
+    def prompt_budget_stats(self):
+        return {"sent_tokens": 0, "saved_tokens": 0}
+
+
+class AsyncClient:
+    """Stands in for AsyncGeminiClient, failing the prompts in fail"""
+
+    def __init__(self, fail=()):
+        self.client = Client()
+        self.fail = set(fail)
+        self.prompts = []
+
+    async def _generate(self, method, inputs, prompt, use_cache=True):
+        self.prompts.append(prompt)
+        if prompt in self.fail:
+            raise RuntimeError("quota")
+        return f"{method}: {inputs['job_title']}"
+
+
+@pytest.fixture(autouse=True)
+def plain_strategy(monkeypatch):
+    monkeypatch.setattr(Config, "STRUCTURED_STRATEGY", False)
+    monkeypatch.setattr(Config, "HEDGE_ENABLED", False)
+    monkeypatch.setattr(Config, "MODEL_ROUTING_ENABLED", False)
+
+
+def write_rows(tmp_path, *titles):
+    path = tmp_path / "rows.jsonl"
+    path.write_text("".join(json.dumps({"job_title": title}) + "\n" for title in titles), encoding="utf-8")
+    return str(path)
+
+
+def test_missing_fields_get_the_app_defaults(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_text("job_title,skills\nData Engineer, Spark \n", encoding="utf-8")
+
+    assert read_rows(str(path)) == [{
+        "job_title": "Data Engineer",
+        "experience": Config.DEFAULT_EXPERIENCE_LEVELS[0],
+        "skills": "Spark",
+        "expected_salary": Config.DEFAULT_SALARY_RANGES[0]
+    }]
+
+
+def test_rows_expand_across_experience_levels(tmp_path):
+    rows = read_rows(write_rows(tmp_path, "Data Engineer"), all_experience_levels=True)
+
+    assert [row["experience"] for row in rows] == list(Config.DEFAULT_EXPERIENCE_LEVELS)
+
+
+def test_row_key_is_stable_and_covers_every_field():
+    row = {"job_title": "Data Engineer", "experience": "Senior", "skills": "Spark", "expected_salary": "$100k"}
+
+    assert row_key(row) == row_key(dict(row))
+    assert row_key(row).startswith("data_engineer_senior_")
+    assert row_key(row) != row_key(dict(row, skills="Spark, Kafka"))
+
+
+def test_row_is_written_only_once_every_analysis_succeeded(tmp_path):
+    rows = read_rows(write_rows(tmp_path, "Data Engineer", "Analyst"))
+    async_client = AsyncClient(fail={"trends for Analyst"})
+
+    completed, failed = asyncio.run(run_batch(async_client, rows, str(tmp_path), workers=2))
+
+    assert (completed, failed) == (1, [row_key(rows[1])])
+    with open(tmp_path / f"{row_key(rows[0])}.json", encoding="utf-8") as handle:
+        result = json.load(handle)
+    assert result["row"] == rows[0]
+    assert result["market_trends"] == "analyze_job_market_trends: Data Engineer"
+    assert not os.path.exists(tmp_path / f"{row_key(rows[1])}.json")
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def run_main(monkeypatch, argv, async_client):
+    created = []
+    monkeypatch.setattr(sys, "argv", ["batch_cli.py"] + argv)
+    monkeypatch.setattr(batch_cli, "create_client", lambda config, client_class: created.append(1))
+    monkeypatch.setattr(batch_cli, "create_async_client", lambda client, async_client_class: async_client)
+    try:
+        batch_cli.main()
+    except SystemExit as e:
+        return e.code, created
+    return 0, created
+
+
+def test_rerun_resumes_with_the_rows_that_are_not_written(tmp_path, monkeypatch):
+    rows_path = write_rows(tmp_path, "Data Engineer", "Analyst")
+    output_dir = str(tmp_path / "results")
+
+    first = AsyncClient(fail={"tips for Analyst"})
+    assert run_main(monkeypatch, [rows_path, output_dir], first) == (1, [1])
+    assert len(first.prompts) == 6
+
+    second = AsyncClient()
+    assert run_main(monkeypatch, [rows_path, output_dir], second) == (0, [1])
+    assert sorted(second.prompts) == ["strategy for Analyst", "tips for Analyst", "trends for Analyst"]
+
+    # Every row has its file, so a third run starts no client at all
+    assert run_main(monkeypatch, [rows_path, output_dir], AsyncClient()) == (0, [])
+    assert len(os.listdir(output_dir)) == 2
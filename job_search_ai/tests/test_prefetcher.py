@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import prefetcher
+from ai_common.async_runner import AsyncLoopThread
+from prefetcher import Prefetcher
+
+INPUTS = {"job_title": "Data Engineer", "skills": "Python"}
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while True:
+        value = condition()
+        if value:
+            return value
+        assert time.monotonic() < deadline, "timed out waiting"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def loop_thread(monkeypatch):
+    monkeypatch.setattr(prefetcher, "BUSY_POLL_SECONDS", 0.01)
+    loop_thread = AsyncLoopThread().start()
+    yield loop_thread
+    loop_thread.stop()
+
+
+def request(method, inputs, calls, release=None, error=None):
+    """A (method, inputs, make_coro) prefetch request that records when it runs"""
+    async def run():
+        calls.append(method)
+        if release is not None:
+            while not release.is_set():
+                await asyncio.sleep(0.005)
+        if error is not None:
+            raise error
+        return f"{method} for {inputs['job_title']}"
+    return method, inputs, run
+
+
+def test_finished_result_is_taken_once(loop_thread):
+    calls = []
+    speculative = Prefetcher(loop_thread)
+
+    speculative.prefetch([request("tips", INPUTS, calls)])
+
+    # Normalized like the response cache, so spacing and case do not matter
+    assert wait_until(lambda: speculative.take("tips", {"job_title": "data  engineer", "skills": "python"})) == (
+        "tips for Data Engineer"
+    )
+    assert speculative.take("tips", INPUTS) is None
+    assert calls == ["tips"]
+    assert speculative.stats()["hits"] == 1
+
+
+def test_prefetching_the_same_inputs_again_starts_nothing(loop_thread):
+    calls = []
+    speculative = Prefetcher(loop_thread)
+
+    speculative.prefetch([request("tips", INPUTS, calls)])
+    speculative.prefetch([request("tips", INPUTS, calls)])
+
+    wait_until(lambda: speculative.take("tips", INPUTS))
+    assert calls == ["tips"]
+    assert speculative.stats()["started"] == 1
+
+
+def test_changed_inputs_drop_results_and_cancel_running_requests(loop_thread):
+    calls = []
+    release = threading.Event()
+    speculative = Prefetcher(loop_thread)
+
+    # One speculative request runs at a time, so tips has finished once trends starts
+    speculative.prefetch([request("tips", INPUTS, calls), request("trends", INPUTS, calls, release)])
+    wait_until(lambda: "trends" in calls)
+
+    speculative.prefetch([request("trends", dict(INPUTS, job_title="Analyst"), calls, release)])
+
+    stats = speculative.stats()
+    assert stats["wasted"] == 1 and stats["cancelled"] == 1
+    assert speculative.take("tips", INPUTS) is None
+    release.set()
+
+
+def test_claimed_request_survives_an_input_change(loop_thread):
+    calls = []
+    release = threading.Event()
+    speculative = Prefetcher(loop_thread)
+
+    speculative.prefetch([request("tips", INPUTS, calls, release)])
+    wait_until(lambda: calls)
+    future = speculative.claim("tips", INPUTS)
+    speculative.prefetch([])
+    release.set()
+
+    assert future.result(timeout=5) == "tips for Data Engineer"
+    assert speculative.stats()["cancelled"] == 0
+    assert speculative.stats()["hits"] == 1
+
+
+def test_waits_while_the_user_is_busy(loop_thread):
+    calls = []
+    busy = threading.Event()
+    busy.set()
+    speculative = Prefetcher(loop_thread, is_busy=busy.is_set)
+
+    speculative.prefetch([request("tips", INPUTS, calls)])
+    time.sleep(0.1)
+    assert calls == []
+
+    busy.clear()
+    assert wait_until(lambda: speculative.take("tips", INPUTS))
+
+
+def test_waits_for_rate_limit_headroom(loop_thread):
+    class RateLimiter:
+        room = 0.2
+
+        def headroom(self):
+            return self.room
+
+    calls = []
+    limiter = RateLimiter()
+    speculative = Prefetcher(loop_thread, min_headroom=0.5, rate_limiter=limiter)
+
+    speculative.prefetch([request("tips", INPUTS, calls)])
+    time.sleep(0.1)
+    assert calls == []
+
+    limiter.room = 0.9
+    assert wait_until(lambda: speculative.take("tips", INPUTS))
+
+
+def test_claimed_request_starts_even_when_busy(loop_thread):
+    calls = []
+    speculative = Prefetcher(loop_thread, is_busy=lambda: True)
+
+    speculative.prefetch([request("tips", INPUTS, calls)])
+
+    assert speculative.claim("tips", INPUTS).result(timeout=5) == "tips for Data Engineer"
+
+
+def test_failures_are_counted_and_not_kept(loop_thread):
+    calls = []
+    speculative = Prefetcher(loop_thread)
+
+    speculative.prefetch([request("tips", INPUTS, calls, error=RuntimeError("quota"))])
+
+    wait_until(lambda: speculative.stats()["failed"] == 1)
+    assert speculative.take("tips", INPUTS) is None
+
+
+def test_close_cancels_and_counts_unused_work(loop_thread):
+    calls = []
+    release = threading.Event()
+    speculative = Prefetcher(loop_thread)
+
+    speculative.prefetch([request("tips", INPUTS, calls), request("trends", INPUTS, calls, release)])
+    wait_until(lambda: "trends" in calls)
+    speculative.close()
+    release.set()
+
+    stats = speculative.stats()
+    assert stats["wasted"] == 1 and stats["cancelled"] == 1
+    assert stats["hit_rate"] == 0.0
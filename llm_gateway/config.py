@@ -0,0 +1,46 @@
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+class Config:
+    """Configuration class for the shared LLM gateway"""
+
+    # Gemini AI Configuration
+    GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
+
+    # Server Configuration
+    GATEWAY_HOST = os.getenv('LLM_GATEWAY_HOST', '127.0.0.1')
+    GATEWAY_PORT = int(os.getenv('LLM_GATEWAY_PORT', 8765))
+    # How often a non-streaming request checks whether its client has gone away
+    CLIENT_DISCONNECT_POLL_SECONDS = float(os.getenv('LLM_GATEWAY_DISCONNECT_POLL_SECONDS', 0.5))
+
+    # Response Cache Configuration (set GEMINI_CACHE_ENABLED=false to disable)
+    CACHE_ENABLED = os.getenv('GEMINI_CACHE_ENABLED', 'true').lower() == 'true'
+    CACHE_PATH = os.getenv(
+        'GEMINI_CACHE_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '.gemini_cache.sqlite3')
+    )
+    CACHE_TTL_SECONDS = int(os.getenv('GEMINI_CACHE_TTL_SECONDS', 24 * 60 * 60))
+    CACHE_MAX_ENTRIES = int(os.getenv('GEMINI_CACHE_MAX_ENTRIES', 2000))
+
+    # Rate limiting (one quota shared by every app using the gateway)
+    RATE_LIMIT_REQUESTS_PER_MINUTE = int(os.getenv('GEMINI_REQUESTS_PER_MINUTE', 14))
+    RATE_LIMIT_TOKENS_PER_MINUTE = int(os.getenv('GEMINI_TOKENS_PER_MINUTE', 950000))
+    RATE_LIMIT_EXPECTED_OUTPUT_TOKENS = int(os.getenv('GEMINI_EXPECTED_OUTPUT_TOKENS', 1024))
+    MAX_CONCURRENT_REQUESTS = int(os.getenv('GEMINI_MAX_CONCURRENT_REQUESTS', 4))
+    RETRY_MAX_ATTEMPTS = int(os.getenv('GEMINI_RETRY_MAX_ATTEMPTS', 4))
+    RETRY_BASE_DELAY = float(os.getenv('GEMINI_RETRY_BASE_DELAY', 1.0))
+    RETRY_MAX_DELAY = float(os.getenv('GEMINI_RETRY_MAX_DELAY', 60.0))
+
+    # Hedged requests (off by default): a non-streaming request still running after the
+    # HEDGE_PERCENTILE latency recently observed for its method is sent again and the first
+    # response wins. At most about HEDGE_MAX_RATE of requests are hedged, so quota use stays bounded;
+    # thresholds are learned from each method's last HEDGE_WINDOW latencies once HEDGE_MIN_SAMPLES are in
+    HEDGE_ENABLED = os.getenv('GEMINI_HEDGE_REQUESTS', 'false').lower() == 'true'
+    HEDGE_PERCENTILE = float(os.getenv('GEMINI_HEDGE_PERCENTILE', 0.95))
+    HEDGE_MAX_RATE = float(os.getenv('GEMINI_HEDGE_MAX_RATE', 0.1))
+    HEDGE_MIN_SAMPLES = int(os.getenv('GEMINI_HEDGE_MIN_SAMPLES', 20))
+    HEDGE_WINDOW = int(os.getenv('GEMINI_HEDGE_WINDOW', 200))
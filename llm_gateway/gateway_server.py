@@ -0,0 +1,273 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+
+# The shared ai_common package sits next to the gateway's folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from ai_common.rate_limiter import RateLimiter, RateLimitExceeded
+from ai_common.hedging import Hedger
+from ai_common.response_cache import create_cache
+from ai_common.single_flight import SingleFlight
+
+logging.basicConfig(level=logging.INFO)
+
+
+class GatewayEngine:
+    """Owns the Gemini connection, response cache, rate limiter and request coalescing
+
+    The desktop apps build their prompts locally and send them here, so every
+    app shares one warm SDK connection, one cache and one quota.
+    """
+
+    def __init__(self):
+        if not Config.GEMINI_API_KEY:
+            raise RuntimeError("Gemini API key not found. Please set GEMINI_API_KEY in your .env file")
+
+        import google.generativeai as genai
+
+        genai.configure(api_key=Config.GEMINI_API_KEY)
+        self._genai = genai
+        self.models = {}
+        self.cache = create_cache(Config)
+        self.rate_limiter = RateLimiter.shared(Config)
+        self.hedger = Hedger.shared(Config)
+        self.single_flight = SingleFlight.shared()
+        self.started_at = time.time()
+        self._model(Config.GEMINI_MODEL)
+
+    def _model(self, name):
+        """Return a GenerativeModel for the name, creating it on first use"""
+        if name not in self.models:
+            self.models[name] = self._genai.GenerativeModel(name)
+        return self.models[name]
+
+    async def generate(self, model_name, method, inputs, prompt, use_cache=True, on_chunk=None, generation_config=None):
+        """Generate text for a prompt, serving repeat inputs from the shared cache"""
+        cache = self.cache if use_cache else None
+
+        if cache:
+            cached = cache.get(model_name, method, inputs)
+            if cached is not None:
+                logging.info(f"Cache hit for {method}")
+                if on_chunk:
+                    on_chunk(cached)
+                return cached
+
+        key = SingleFlight.make_key(model_name, prompt)
+        text, shared = await self.single_flight.do_async(
+            key, lambda: self._call_model(model_name, method, prompt, on_chunk, generation_config)
+        )
+
+        if shared:
+            if on_chunk:
+                on_chunk(text)
+        elif cache:
+            cache.set(model_name, method, inputs, text)
+
+        return text
+
+    async def _call_model(self, model_name, method, prompt, on_chunk=None, generation_config=None):
+        """Send a prompt to Gemini under the shared rate limits, hedging slow non-streaming calls
+
+        Hedge thresholds are learned per model and method, since the apps route
+        one method to different model tiers.
+        """
+        if on_chunk:
+            return await self.rate_limiter.call_async(
+                lambda: self._stream(model_name, prompt, on_chunk, generation_config), prompt
+            )
+        return await self.hedger.call_async((model_name, method), lambda: self.rate_limiter.call_async(
+            lambda: self._request_text(model_name, prompt, generation_config), prompt
+        ))
+
+    async def _request_text(self, model_name, prompt, generation_config=None):
+        """Send a single non-streaming request and return its text"""
+        response = await self._model(model_name).generate_content_async(
+            prompt, generation_config=generation_config
+        )
+        return response.text
+
+    async def _stream(self, model_name, prompt, on_chunk, generation_config=None):
+        """Stream a response chunk by chunk"""
+        parts = []
+        response = await self._model(model_name).generate_content_async(
+            prompt, stream=True, generation_config=generation_config
+        )
+        async for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+            parts.append(text)
+            on_chunk(text)
+        return "".join(parts)
+
+    def stats(self):
+        """Return cache, rate limiter, coalescing and hedging counters"""
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "cache": self.cache.stats() if self.cache else None,
+            "rate_limit": self.rate_limiter.stats(),
+            "single_flight": self.single_flight.stats(),
+            "hedging": self.hedger.stats()
+        }
+
+
+class GenerateRequest(BaseModel):
+    method: str
+    prompt: str
+    inputs: Dict[str, Any] = {}
+    model: Optional[str] = None
+    use_cache: bool = True
+    stream: bool = False
+    generation_config: Optional[Dict[str, Any]] = None
+    # Seconds the client will wait for the response
+    timeout: Optional[float] = None
+
+
+class ClientDisconnected(Exception):
+    """The client closed its connection before the response was ready"""
+
+
+app = FastAPI(title="LLM Gateway", version="0.1.0")
+engine = None
+
+
+@app.on_event("startup")
+def warm_up():
+    global engine
+    engine = GatewayEngine()
+    logging.info("LLM gateway ready")
+
+
+@app.get("/health")
+def health_check():
+    return {"status": "ok", "model": Config.GEMINI_MODEL}
+
+
+@app.get("/stats")
+def stats():
+    return engine.stats()
+
+
+@app.post("/generate")
+async def generate(request: GenerateRequest, http_request: Request):
+    model_name = request.model or Config.GEMINI_MODEL
+
+    if request.stream:
+        return StreamingResponse(
+            _stream_events(model_name, request),
+            media_type="application/x-ndjson"
+        )
+
+    try:
+        text = await _until_done(http_request, request.timeout, engine.generate(
+            model_name,
+            request.method,
+            request.inputs,
+            request.prompt,
+            request.use_cache,
+            generation_config=request.generation_config
+        ))
+    except ClientDisconnected:
+        logging.info(f"Client cancelled {request.method}")
+        return Response(status_code=499)
+    except asyncio.TimeoutError as exc:
+        logging.info(f"{request.method} passed its {request.timeout:.1f}s deadline")
+        raise HTTPException(status_code=504, detail=f"No response within {request.timeout:.1f}s") from exc
+    except RateLimitExceeded as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+    except Exception as exc:
+        logging.error(f"Error generating {request.method}: {str(exc)}")
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+
+    return {"text": text}
+
+
+def _deadline(timeout):
+    """Event loop time by which a request with the client's timeout must finish, or None"""
+    return None if timeout is None else asyncio.get_running_loop().time() + timeout
+
+
+def _remaining(deadline):
+    """Seconds left before a deadline from _deadline(), or None"""
+    return None if deadline is None else max(0.0, deadline - asyncio.get_running_loop().time())
+
+
+async def _until_done(http_request, timeout, coro):
+    """Await a coroutine, cancelling it if the client disconnects or its timeout passes first"""
+    deadline = _deadline(timeout)
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            poll = Config.CLIENT_DISCONNECT_POLL_SECONDS
+            remaining = _remaining(deadline)
+            if remaining is not None:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                poll = min(poll, remaining)
+            done, _ = await asyncio.wait({task}, timeout=poll)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def _stream_events(model_name, request):
+    """Yield newline-delimited JSON events: chunks, then the full text or an error"""
+    queue = asyncio.Queue()
+    task = asyncio.ensure_future(engine.generate(
+        model_name,
+        request.method,
+        request.inputs,
+        request.prompt,
+        request.use_cache,
+        on_chunk=queue.put_nowait,
+        generation_config=request.generation_config
+    ))
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+    deadline = _deadline(request.timeout)
+
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(queue.get(), _remaining(deadline))
+            except asyncio.TimeoutError:
+                logging.info(f"{request.method} passed its {request.timeout:.1f}s deadline")
+                error = f"No response within {request.timeout:.1f}s"
+                yield json.dumps({"error": error, "status": 504}) + "\n"
+                return
+            if chunk is None:
+                break
+            yield json.dumps({"chunk": chunk}) + "\n"
+
+        if task.exception() is None:
+            yield json.dumps({"text": task.result()}) + "\n"
+        else:
+            error = task.exception()
+            status = 429 if isinstance(error, RateLimitExceeded) else 502
+            logging.error(f"Error streaming {request.method}: {str(error)}")
+            yield json.dumps({"error": str(error), "status": status}) + "\n"
+    finally:
+        # The client went away or the deadline passed before the response finished
+        if not task.done():
+            task.cancel()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=Config.GATEWAY_HOST, port=Config.GATEWAY_PORT)
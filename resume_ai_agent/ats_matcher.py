@@ -0,0 +1,173 @@
+import re
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from config import Config
+from ai_common.skill_taxonomy import SkillTaxonomy
+
+# Stopwords plus job-ad filler that is never a useful ATS keyword
+STOPWORDS = {
+    "a", "about", "across", "after", "all", "also", "an", "and", "any", "are", "as", "at", "be",
+    "been", "being", "both", "but", "by", "can", "could", "do", "does", "each", "etc", "for",
+    "from", "has", "have", "having", "he", "her", "his", "how", "i", "if", "in", "including",
+    "into", "is", "it", "its", "may", "me", "more", "most", "must", "my", "new", "no", "not", "of",
+    "on", "one", "or", "other", "our", "out", "over", "own", "per", "plus", "preferred", "she",
+    "should", "so", "such", "than", "that", "the", "their", "them", "then", "there", "these",
+    "they", "this", "those", "through", "to", "under", "up", "us", "using", "very", "was", "we",
+    "well", "were", "what", "when", "where", "which", "while", "who", "will", "with", "within",
+    "would", "you", "your", "ability", "able", "candidate", "company", "degree", "e.g", "etc.",
+    "excellent", "experience", "experienced", "familiarity", "good", "great", "ideal", "ideally",
+    "including", "job", "knowledge", "looking", "nice", "optional", "proficiency", "proficient",
+    "qualifications", "related", "required", "requirements", "responsibilities", "role", "skills",
+    "strong", "team", "understanding", "work", "working", "year", "years"
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+SENTENCE_PATTERN = re.compile(r"[\n;•]+|\.\s+")
+
+# BM25 term-frequency saturation and length normalization, and the extra weight
+# given to taxonomy skills
+BM25_K1 = 1.2
+BM25_B = 0.75
+SKILL_BOOST = 2.0
+OVER_REPRESENTED_RATIO = 3.0
+
+
+def _word_terms(text):
+    """Lowercase words of the text, without stopwords and numbers"""
+    words = (word.rstrip(".-/") for word in TOKEN_PATTERN.findall(text.lower()))
+    return [word for word in words if len(word) > 1 and word not in STOPWORDS and not word.isdigit()]
+
+
+def tokenize(text, taxonomy=None):
+    """Split text into keywords: taxonomy skills by canonical name, other words lowercased
+
+    Aliases collapse onto one keyword, so "k8s" in a profile matches
+    "Kubernetes" in the requirements.
+    """
+    taxonomy = taxonomy or SkillTaxonomy.shared(Config)
+    terms = []
+    position = 0
+    for start, end, skill in taxonomy.find(text):
+        terms.extend(_word_terms(text[position:start]))
+        terms.append(skill)
+        position = end
+    terms.extend(_word_terms(text[position:]))
+    return terms
+
+
+@dataclass
+class MatchReport:
+    """Keyword comparison between a profile and job requirements, strongest keywords first"""
+
+    score: float
+    matched: list = field(default_factory=list)
+    missing: list = field(default_factory=list)
+    over_represented: list = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    def top_missing(self, limit):
+        """The highest-weighted requirement keywords the profile does not mention"""
+        return [term for term, _ in self.missing[:limit]]
+
+    def to_markdown(self, limit=20):
+        """Render the report for the results dialog"""
+        def terms(items):
+            return ", ".join(term for term, _ in items[:limit]) or "None"
+
+        return (
+            f"### ATS Keyword Match: {self.score:.0f}%\n\n"
+            f"**Matched keywords:** {terms(self.matched)}\n\n"
+            f"**Missing keywords:** {terms(self.missing)}\n\n"
+            f"**Over-represented in your profile:** {terms(self.over_represented)}\n\n"
+            f"_Scored locally in {self.elapsed_ms:.1f} ms_"
+        )
+
+
+def skill_list_terms(skills, taxonomy=None):
+    """Keywords of a comma-separated skills list, where even ambiguous names like "Go" count"""
+    taxonomy = taxonomy or SkillTaxonomy.shared(Config)
+    terms = []
+    for item, found in taxonomy.list_items(skills):
+        terms.extend(found or _word_terms(item))
+    return terms
+
+
+def match_keywords(profile_text, requirements_text, profile_skills=""):
+    """Score how well the profile covers the keywords of the job requirements
+
+    Each requirement sentence is treated as a BM25 document; a keyword's weight is
+    its BM25 contribution summed over the sentences, so keywords repeated across
+    the requirements rank higher while the IDF damps boilerplate that appears in
+    nearly every line. Taxonomy skills get a boost. The score is the share of the
+    total weight the profile covers.
+    """
+    started = time.perf_counter()
+    taxonomy = SkillTaxonomy.shared(Config)
+    sentences = [tokenize(sentence, taxonomy) for sentence in SENTENCE_PATTERN.split(requirements_text)]
+    sentences = [terms for terms in sentences if terms]
+    profile_terms = tokenize(profile_text, taxonomy) + skill_list_terms(profile_skills, taxonomy)
+
+    vocabulary = sorted({term for terms in sentences for term in terms} | set(profile_terms))
+    if not sentences or not vocabulary:
+        return MatchReport(score=0.0, elapsed_ms=(time.perf_counter() - started) * 1000)
+
+    index = {term: position for position, term in enumerate(vocabulary)}
+
+    # Sentence x term count matrix for the requirements, one count vector for the profile
+    counts = np.zeros((len(sentences), len(vocabulary)))
+    for row, terms in enumerate(sentences):
+        np.add.at(counts[row], [index[term] for term in terms], 1)
+    profile_counts = np.zeros(len(vocabulary))
+    if profile_terms:
+        np.add.at(profile_counts, [index[term] for term in profile_terms], 1)
+
+    requirement_counts = counts.sum(axis=0)
+    document_frequency = (counts > 0).sum(axis=0)
+    idf = np.log1p(len(sentences) / np.maximum(document_frequency, 1))
+    lengths = counts.sum(axis=1, keepdims=True)
+    saturation = BM25_K1 * (1 - BM25_B + BM25_B * lengths / lengths.mean())
+    bm25_tf = (counts * (BM25_K1 + 1) / (counts + saturation)).sum(axis=0)
+    skills = set(taxonomy.canonical.values())
+    boost = np.array([SKILL_BOOST if term in skills else 1.0 for term in vocabulary])
+    weights = bm25_tf * idf * boost
+
+    in_requirements = requirement_counts > 0
+    in_profile = profile_counts > 0
+    total_weight = weights[in_requirements].sum()
+    score = 100.0 * weights[in_requirements & in_profile].sum() / total_weight if total_weight else 0.0
+
+    # Profile keywords taking a much larger share of the profile than of the requirements
+    profile_share = profile_counts / max(profile_counts.sum(), 1)
+    requirement_share = requirement_counts / requirement_counts.sum()
+    over = (profile_counts >= 2) & (profile_share > OVER_REPRESENTED_RATIO * requirement_share)
+
+    def ranked(mask, values):
+        positions = np.flatnonzero(mask)
+        positions = positions[np.argsort(-values[positions], kind="stable")]
+        return [(vocabulary[position], float(values[position])) for position in positions]
+
+    return MatchReport(
+        score=float(score),
+        matched=ranked(in_requirements & in_profile, weights),
+        missing=ranked(in_requirements & ~in_profile, weights),
+        over_represented=ranked(over, profile_share - requirement_share),
+        elapsed_ms=(time.perf_counter() - started) * 1000
+    )
+
+
+def match_profile(profile_data, requirements):
+    """Compare a profile (collect_profile_data() fields) with job requirements"""
+    profile_text = "\n".join(
+        profile_data.get(key, "") for key in ("current_role", "achievements", "industries")
+    )
+    return match_keywords(profile_text, requirements, profile_data.get("skills", ""))
+
+
+def missing_keywords(profile_data, requirements, limit):
+    """Top requirement keywords missing from the profile, for the prompt builders"""
+    if not requirements or limit <= 0:
+        return []
+    return match_profile(profile_data, requirements).top_missing(limit)
@@ -0,0 +1,181 @@
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import re
+import sys
+import time
+
+# The shared ai_common package sits next to this app's folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from gemini_client import GeminiClient, AsyncGeminiClient
+from ai_common.gateway_client import create_client, create_async_client
+from ai_common.async_runner import with_deadline
+
+# Same keys as ResumeAIAgent.collect_profile_data()
+PROFILE_FIELDS = (
+    "name", "current_role", "experience", "skills",
+    "achievements", "target_role", "requirements", "industries"
+)
+
+logging.basicConfig(level=logging.INFO)
+
+
+def read_profiles(path):
+    """Yield (row_id, profile) pairs from a CSV or JSONL file.
+
+    Rows are identified by an "id" column when present, otherwise by their
+    1-based position, so a rerun over the same file resumes cleanly.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.lower().endswith(".csv"):
+            rows = csv.DictReader(handle)
+        else:
+            rows = (json.loads(line) for line in handle if line.strip())
+
+        for index, row in enumerate(rows, start=1):
+            profile = {key: str(row.get(key) or "").strip() for key in PROFILE_FIELDS}
+            yield str(row.get("id") or index), profile
+
+
+class BatchOutput:
+    """Writes each result as soon as it completes and checkpoints finished rows.
+
+    Output is a JSONL file (one {"id", "profile", "content"} object per line)
+    or a directory of <id>.md drafts; the checkpoint lists the finished ids.
+    """
+
+    def __init__(self, path):
+        self.jsonl = path.lower().endswith(".jsonl")
+        if self.jsonl:
+            directory = os.path.dirname(os.path.abspath(path))
+            self.checkpoint_path = f"{path}.checkpoint"
+        else:
+            directory = path
+            self.checkpoint_path = os.path.join(path, ".checkpoint")
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.done = set()
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding="utf-8") as handle:
+                self.done = {line.strip() for line in handle if line.strip()}
+
+        self._results = open(path, "a", encoding="utf-8") if self.jsonl else None
+        self._checkpoint = open(self.checkpoint_path, "a", encoding="utf-8")
+
+    def write(self, row_id, profile, content):
+        """Write one result, then record it in the checkpoint"""
+        if self.jsonl:
+            self._results.write(json.dumps({"id": row_id, "profile": profile, "content": content}) + "\n")
+            self._results.flush()
+        else:
+            filename = re.sub(r"[^\w.-]+", "_", row_id) + ".md"
+            with open(os.path.join(self.path, filename), "w", encoding="utf-8") as handle:
+                handle.write(content)
+
+        self._checkpoint.write(row_id + "\n")
+        self._checkpoint.flush()
+        self.done.add(row_id)
+
+    def close(self):
+        """Close the output and checkpoint files"""
+        if self._results:
+            self._results.close()
+        self._checkpoint.close()
+
+
+async def run_batch(async_client, rows, output, workers, use_cache=True):
+    """Generate drafts for every row with at most `workers` requests in flight.
+
+    The shared rate limiter still paces the requests themselves; failed rows
+    are reported and left out of the checkpoint so the next run retries them.
+    """
+    client = async_client.client
+    semaphore = asyncio.Semaphore(workers)
+    started = time.perf_counter()
+    completed = 0
+    failed = []
+
+    async def generate(row_id, profile):
+        nonlocal completed
+        async with semaphore:
+            try:
+                # Called directly rather than through generate_resume_sections so
+                # failures raise instead of coming back as an error string
+                content = await with_deadline(
+                    async_client._generate(
+                        "generate_resume_sections",
+                        profile,
+                        client._resume_sections_request(profile),
+                        use_cache
+                    ),
+                    Config.REQUEST_DEADLINES.get("generate_resume_sections", Config.ASYNC_REQUEST_TIMEOUT)
+                )
+            except Exception as e:
+                logging.error(f"Row {row_id} failed: {str(e) or type(e).__name__}")
+                failed.append(row_id)
+                return
+
+        output.write(row_id, profile, content)
+        completed += 1
+        elapsed = time.perf_counter() - started
+        print(f"[{completed}/{len(rows)}] {row_id} done ({completed / elapsed * 60:.1f} drafts/min)")
+
+    await asyncio.gather(*(generate(row_id, profile) for row_id, profile in rows))
+    return completed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=f"{Config.APP_TITLE} batch mode")
+    parser.add_argument("input", help="CSV or JSONL file of profiles (collect_profile_data() fields)")
+    parser.add_argument("output", help="JSONL file or directory for the generated drafts")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=Config.BATCH_MAX_WORKERS,
+        help="maximum number of profiles generated at the same time"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="ignore cached responses")
+    args = parser.parse_args()
+
+    output = BatchOutput(args.output)
+    profiles = list(read_profiles(args.input))
+    rows = [(row_id, profile) for row_id, profile in profiles if row_id not in output.done]
+    print(f"{len(profiles)} profiles, {len(profiles) - len(rows)} already done, {len(rows)} to generate")
+
+    if not rows:
+        output.close()
+        return
+
+    async_client = create_async_client(create_client(Config, GeminiClient), AsyncGeminiClient)
+    try:
+        completed, failed = asyncio.run(
+            run_batch(async_client, rows, output, max(1, args.workers), not args.no_cache)
+        )
+    except KeyboardInterrupt:
+        print(f"Interrupted; rerun the same command to resume ({len(output.done)} rows checkpointed)")
+        sys.exit(130)
+    finally:
+        output.close()
+
+    print(f"Finished: {completed} generated, {len(failed)} failed")
+    stats = async_client.client.prompt_budget_stats()
+    print(f"Prompts: ~{stats['sent_tokens']} input tokens sent, ~{stats['saved_tokens']} saved by compaction")
+    if Config.HEDGE_ENABLED:
+        stats = async_client.client.hedge_stats()
+        print(f"Hedging: {stats['hedges']} of {stats['requests']} requests hedged, {stats['hedge_wins']} won by the hedge")
+    if Config.MODEL_ROUTING_ENABLED:
+        for model, tier in async_client.client.routing_stats().items():
+            print(f"{model}: {tier['answered']} answered, {tier['fallbacks']} fell back, p95 {tier['p95']}s")
+    if failed:
+        print("Rerun the same command to retry: " + ", ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,25 @@
-import google.generativeai as genai
 from config import Config
+from ai_common.response_cache import create_cache
+from ai_common.rate_limiter import RateLimiter, RateLimitExceeded
+from ai_common.hedging import Hedger
+from ai_common.model_router import ModelRouter
+from ai_common.single_flight import SingleFlight
+from ai_common.prompt_budget import PromptBudget
+from ai_common.skill_taxonomy import SkillTaxonomy
+from ai_common.async_runner import with_deadline
+from ats_matcher import missing_keywords
+from requirements_summary import summarize_requirements
+from resume_sections import (
+    DraftStream, ResumeDraft, build_sections_prompt, parse_sections, prompt_fields, render_header,
+    section_inputs, stale_sections, structured_generation_config
+)
+import asyncio
+import json
 import logging
+import time
+
+# Profile fields condensed into the digest shared by every tailored draft
+DIGEST_FIELDS = ("name", "current_role", "experience", "skills", "achievements", "industries")
 
 class GeminiClient:
     """Client for interacting with Google's Gemini AI model"""
@@ -9,6 +28,16 @@ class GeminiClient:
         self.api_key = Config.GEMINI_API_KEY
         self.model_name = Config.GEMINI_MODEL
         self.model = None
+        self.models = {}
+        self.cache = create_cache(Config)
+        self.section_cache = self.cache
+        self.rate_limiter = RateLimiter.shared(Config)
+        self.hedger = Hedger.shared(Config)
+        self.router = ModelRouter.shared(Config)
+        self.single_flight = SingleFlight.shared()
+        self.skill_taxonomy = SkillTaxonomy.shared(Config)
+        self.prompt_budget = PromptBudget.shared(Config)
+        self.sdk_import_seconds = None
         self._initialize_client()
     
     def _initialize_client(self):
@@ -17,28 +46,174 @@ class GeminiClient:
             if not self.api_key:
                 raise ValueError("Gemini API key not found. Please set GEMINI_API_KEY in your .env file")
             
+            # Imported here rather than at module level: the SDK alone takes over
+            # a second to import, so apps construct the client off the GUI thread
+            started = time.perf_counter()
+            import google.generativeai as genai
+            self.sdk_import_seconds = time.perf_counter() - started
+
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel(self.model_name)
+            self._genai = genai
+            self.model = self._model(self.model_name)
             logging.info("Gemini AI client initialized successfully")
             
         except Exception as e:
             logging.error(f"Failed to initialize Gemini AI client: {str(e)}")
             raise
-    
-    def generate_resume_sections(self, profile_data):
-        """Generate resume sections tailored to the user's profile and target role."""
 
-        prompt = f"""
+    def _generate(self, method, inputs, prompt, use_cache=True, on_chunk=None, generation_config=None):
+        """Generate content for a prompt, serving repeat inputs from the response cache."""
+        cache = self.cache if use_cache else None
+
+        if cache:
+            # A response from any tier this request may be routed to is good enough
+            cached = cache.get_any(self.router.candidates(method, prompt), method, inputs)
+            if cached is not None:
+                logging.info(f"Cache hit for {method}")
+                if on_chunk:
+                    on_chunk(cached)
+                return cached
+
+        # Identical prompts already in flight share that request instead of sending another
+        key = SingleFlight.make_key(self.model_name, prompt)
+        answered = []
+        text, shared = self.single_flight.do(
+            key, lambda: self._call_model(method, prompt, on_chunk, generation_config, answered)
+        )
+
+        if shared:
+            logging.info(f"Joined an identical in-flight {method} request")
+            if on_chunk:
+                on_chunk(text)
+        elif cache:
+            # Keyed on the tier that answered, which need not be GEMINI_MODEL
+            cache.set(answered[-1], method, inputs, text)
+
+        return text
+
+    def _model(self, model_name):
+        """Return the GenerativeModel for a model tier, creating it on first use."""
+        if model_name not in self.models:
+            self.models[model_name] = self._genai.GenerativeModel(model_name)
+        return self.models[model_name]
+
+    @staticmethod
+    def _hedge_key(method, model_name):
+        """Latency key for hedging: the method, plus the model when it is not the default tier."""
+        return method if model_name == Config.GEMINI_MODEL else f"{method}:{model_name}"
+
+    def _call_model(self, method, prompt, on_chunk=None, generation_config=None, answered=None):
+        """Send a prompt to the routed model tier, falling back to heavier tiers on failure.
+
+        Each tier tried is appended to answered, so once a call succeeds its
+        last entry is the model that answered.
+        """
+        def attempt(model_name, on_chunk, timeout):
+            if answered is not None:
+                answered.append(model_name)
+            return self._call_tier(method, model_name, prompt, on_chunk, generation_config, timeout)
+
+        return self.router.call(method, prompt, on_chunk, attempt)
+
+    def _call_tier(self, method, model_name, prompt, on_chunk, generation_config, timeout):
+        """Call one model under the shared rate limits, hedging slow non-streaming calls
+
+        A call with a timeout has a heavier tier to fall back to, so quota and
+        server errors are not retried on this one.
+        """
+        model = self._model(model_name)
+        request_options = {"timeout": timeout} if timeout else None
+        max_retries = 0 if timeout else None
+        if on_chunk:
+            return self.rate_limiter.call(
+                lambda: self._stream(method, prompt, on_chunk, generation_config, model, request_options),
+                prompt,
+                max_retries
+            )
+        return self.hedger.call(self._hedge_key(method, model_name), lambda: self.rate_limiter.call(
+            lambda: model.generate_content(
+                prompt, generation_config=generation_config, request_options=request_options
+            ).text,
+            prompt,
+            max_retries
+        ))
+
+    def _stream(self, method, prompt, on_chunk, generation_config=None, model=None, request_options=None):
+        """Stream a response chunk by chunk, logging its time to first token."""
+        started = time.perf_counter()
+        parts = []
+        model = model or self.model
+
+        for chunk in model.generate_content(
+            prompt, stream=True, generation_config=generation_config, request_options=request_options
+        ):
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. safety metadata only) are skipped
+                continue
+
+            if not parts:
+                logging.info(f"{method} first token after {time.perf_counter() - started:.2f}s")
+
+            parts.append(text)
+            on_chunk(text)
+
+        return "".join(parts)
+
+    def cache_stats(self):
+        """Return response cache counters, or None when caching is disabled."""
+        return self.cache.stats() if self.cache else None
+
+    def rate_limit_stats(self):
+        """Return throttling and retry counters for the shared rate limiter."""
+        return self.rate_limiter.stats()
+
+    def single_flight_stats(self):
+        """Return how many duplicate in-flight requests were coalesced."""
+        return self.single_flight.stats()
+
+    def prompt_budget_stats(self):
+        """Return prompt counts and the estimated input tokens saved by compaction."""
+        return self.prompt_budget.stats()
+
+    def hedge_stats(self):
+        """Return hedged request counters and per-method latency percentiles."""
+        return self.hedger.stats()
+
+    def routing_stats(self):
+        """Return per-tier answered and fallback counts with recent error rates and latency."""
+        return self.router.stats()
+
+    def _resume_sections_request(self, profile_data):
+        """Build the prompt for generate_resume_sections."""
+        priority_keywords = missing_keywords(
+            profile_data, profile_data['requirements'], Config.ATS_PROMPT_KEYWORDS
+        )
+        fields = {
+            "name": profile_data['name'] or 'Candidate',
+            "current_role": profile_data['current_role'] or 'Not specified',
+            "experience": profile_data['experience'],
+            "skills": self.skill_taxonomy.compact_skills(profile_data['skills']),
+            "achievements": profile_data['achievements'],
+            "target_role": profile_data['target_role'],
+            "industries": profile_data['industries'],
+            "requirements": summarize_requirements(profile_data['requirements']).text,
+            "priority_keywords": ', '.join(priority_keywords) or 'None'
+        }
+
+        template = """
         You are an expert resume writer creating tailored resume content. Use the details below to craft a professional resume draft:
 
-        Candidate Name: {profile_data['name'] or 'Candidate'}
-        Current Role: {profile_data['current_role'] or 'Not specified'}
-        Experience Level: {profile_data['experience']}
-        Core Skills: {profile_data['skills']}
-        Achievements: {profile_data['achievements']}
-        Target Role: {profile_data['target_role']}
-        Target Industries: {profile_data['industries']}
-        Job Requirements: {profile_data['requirements']}
+        Candidate Name: {name}
+        Current Role: {current_role}
+        Experience Level: {experience}
+        Core Skills: {skills}
+        Achievements: {achievements}
+        Target Role: {target_role}
+        Target Industries: {industries}
+        Job Requirements: {requirements}
+        Priority Keywords (in the requirements but missing from the profile): {priority_keywords}
 
         Produce a markdown-formatted resume draft that includes:
         - A concise professional summary aligned with the target role
@@ -47,13 +222,381 @@ class GeminiClient:
         - A core competencies section grouping skills into categories
         - Optional industry alignment notes if industries are provided
 
-        Ensure content is ATS-friendly, uses strong action verbs, and incorporates keywords from the target role and requirements.
+        Ensure content is ATS-friendly, uses strong action verbs, and incorporates keywords from the target role and requirements, working in the priority keywords wherever the candidate's background supports them.
+        """
+
+        return self.prompt_budget.build("generate_resume_sections", template, fields)
+
+    def generate_resume_sections(self, profile_data, use_cache=True, on_chunk=None):
+        """Generate resume sections tailored to the user's profile and target role.
+
+        Pass on_chunk to stream the response; it is called with each text chunk as it arrives.
         """
+        prompt = self._resume_sections_request(profile_data)
 
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._generate("generate_resume_sections", profile_data, prompt, use_cache, on_chunk)
 
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             logging.error(f"Error generating resume content: {str(e)}")
-            return f"Error generating resume content: {str(e)}"
\ No newline at end of file
+            return f"Error generating resume content: {str(e)}"
+
+    def _compact_profile(self, profile_data):
+        """Copy of the profile for prompts: skills normalized and long requirements condensed."""
+        return dict(
+            profile_data,
+            skills=self.skill_taxonomy.compact_skills(profile_data['skills']),
+            requirements=summarize_requirements(profile_data['requirements']).text
+        )
+
+    def _draft_prompt(self, missing, profile_data):
+        """Build the resume draft prompt for the missing sections within its token budget."""
+        profile = self._compact_profile(profile_data)
+        priority_keywords = missing_keywords(
+            profile_data, profile_data['requirements'], Config.ATS_PROMPT_KEYWORDS
+        )
+        return self.prompt_budget.render(
+            "generate_resume_draft",
+            lambda values: build_sections_prompt(missing, dict(profile, **values), priority_keywords),
+            {key: profile[key] for key in prompt_fields(missing)}
+        )
+
+    def _resume_draft_plan(self, profile_data, previous=None, use_cache=True):
+        """Start a draft from the header plus every section that can be reused.
+
+        Sections whose profile fields are unchanged are spliced in from the previous
+        draft, then from the section cache; the rest are returned as missing.
+        """
+        draft = ResumeDraft()
+        draft.sections["header"] = render_header(profile_data)
+        draft.section_inputs["header"] = section_inputs("header", profile_data)
+        stale = stale_sections(previous, profile_data)
+        missing = []
+
+        for name in stale_sections(None, profile_data):
+            inputs = section_inputs(name, profile_data)
+            content = None
+            if name not in stale:
+                content = previous.sections[name]
+            elif use_cache and self.section_cache:
+                content = self.section_cache.get(self.model_name, f"resume_section:{name}", inputs)
+
+            if content is None:
+                missing.append(name)
+            else:
+                draft.sections[name] = content
+                draft.section_inputs[name] = inputs
+                draft.reused_sections.append(name)
+
+        return draft, missing
+
+    def _fill_draft(self, draft, profile_data, missing, text):
+        """Splice generated sections into the draft, caching each under its own fields."""
+        for name, content in parse_sections(text, missing).items():
+            inputs = section_inputs(name, profile_data)
+            draft.sections[name] = content
+            draft.section_inputs[name] = inputs
+            draft.generated_sections.append(name)
+            if self.section_cache and content:
+                self.section_cache.set(self.model_name, f"resume_section:{name}", inputs, content)
+
+        logging.info(
+            f"Resume draft: generated {len(draft.generated_sections)} sections, "
+            f"reused {len(draft.reused_sections)}"
+        )
+        return draft
+
+    def generate_resume_draft(self, profile_data, previous=None, use_cache=True, on_chunk=None):
+        """Build the resume section by section into ResumeTemplates.
+
+        Pass the previous ResumeDraft to only re-request the sections whose
+        profile fields changed; the others are spliced in unchanged. Pass
+        on_chunk to stream the draft as markdown; each section is filled in as
+        its JSON value arrives.
+        """
+        draft, missing = self._resume_draft_plan(profile_data, previous, use_cache)
+        stream = DraftStream(draft, missing, on_chunk) if on_chunk else None
+        if not missing:
+            return draft
+
+        text = self._generate(
+            "generate_resume_draft",
+            profile_data,
+            self._draft_prompt(missing, profile_data),
+            use_cache=False,
+            on_chunk=stream.feed if stream else None,
+            generation_config=structured_generation_config(missing)
+        )
+        return self._fill_draft(draft, profile_data, missing, text)
+
+    def _profile_digest_request(self, profile_data):
+        """Build the cache inputs and prompt for the profile digest used by tailor_for_many."""
+        inputs = {key: profile_data[key] for key in DIGEST_FIELDS}
+        fields = {
+            "name": profile_data['name'] or 'Candidate',
+            "current_role": profile_data['current_role'] or 'Not specified',
+            "experience": profile_data['experience'],
+            "skills": self.skill_taxonomy.compact_skills(profile_data['skills']),
+            "achievements": profile_data['achievements'],
+            "industries": profile_data['industries']
+        }
+
+        template = """
+        You are an expert resume writer. Condense the candidate profile below into a compact digest
+        that another writer can tailor resumes from without seeing the original:
+
+        Candidate Name: {name}
+        Current Role: {current_role}
+        Experience Level: {experience}
+        Core Skills: {skills}
+        Achievements: {achievements}
+        Industries: {industries}
+
+        Keep every concrete fact, metric and skill, drop filler, and stay under 200 words.
+        Use short bullet points grouped as Roles, Skills, Achievements and Industries.
+        """
+
+        return inputs, self.prompt_budget.build("generate_profile_digest", template, fields)
+
+    def _tailored_draft_request(self, profile_data, digest, job_description):
+        """Build the cache inputs and prompt for one tailored draft from the profile digest."""
+        inputs = {
+            "digest": digest,
+            "target_role": profile_data["target_role"],
+            "job_description": job_description
+        }
+        priority_keywords = missing_keywords(profile_data, job_description, Config.ATS_PROMPT_KEYWORDS)
+        fields = dict(
+            inputs,
+            job_description=summarize_requirements(job_description).text,
+            priority_keywords=', '.join(priority_keywords) or 'None'
+        )
+
+        template = """
+        You are an expert resume writer. Tailor a resume draft for the job description below,
+        using only the facts in the candidate digest.
+
+        Candidate Digest:
+        {digest}
+
+        Target Role: {target_role}
+        Job Description:
+        {job_description}
+
+        Priority Keywords (in the job description but missing from the profile): {priority_keywords}
+
+        Produce a markdown resume draft with a professional summary, 4-5 experience bullet points,
+        key achievements and grouped core competencies. Emphasize what this job asks for, use strong
+        action verbs and the job description's keywords (including the priority keywords wherever the
+        digest supports them), and keep it ATS-friendly.
+        """
+
+        return inputs, self.prompt_budget.build("generate_tailored_draft", template, fields)
+
+    def run_job(self, method, payload, on_progress=None):
+        """Run a request from the durable job queue, raising on failure so it can be retried.
+
+        For generate_resume_sections the payload is the collect_profile_data()
+        dict; for generate_resume_draft it is {"profile_data": ..., "previous":
+        ResumeDraft.to_dict() or None} and the result is the new draft's
+        to_dict() as JSON. on_progress receives the text as it streams in.
+        tailor_for_many jobs run on AsyncGeminiClient.
+        """
+        if method == "generate_resume_sections":
+            return self._generate(method, payload, self._resume_sections_request(payload), on_chunk=on_progress)
+        if method == "generate_resume_draft":
+            previous = ResumeDraft.from_dict(payload["previous"]) if payload["previous"] else None
+            draft = self.generate_resume_draft(payload["profile_data"], previous, on_chunk=on_progress)
+            return json.dumps(draft.to_dict())
+        raise ValueError(f"Unknown job method: {method}")
+
+
+class AsyncGeminiClient:
+    """Asyncio counterpart of GeminiClient built on generate_content_async.
+
+    Shares the prompts, model and response cache of a GeminiClient. Run its
+    coroutines on the app's AsyncLoopThread rather than one thread per request.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or GeminiClient()
+        self.model_name = self.client.model_name
+
+    async def _generate(self, method, inputs, prompt, use_cache=True, on_chunk=None, generation_config=None):
+        """Generate content asynchronously, serving repeat inputs from the response cache."""
+        cache = self.client.cache if use_cache else None
+
+        if cache:
+            # A response from any tier this request may be routed to is good enough
+            cached = cache.get_any(self.client.router.candidates(method, prompt), method, inputs)
+            if cached is not None:
+                logging.info(f"Cache hit for {method}")
+                if on_chunk:
+                    on_chunk(cached)
+                return cached
+
+        key = SingleFlight.make_key(self.model_name, prompt)
+        answered = []
+        text, shared = await self.client.single_flight.do_async(
+            key, lambda: self._call_model(method, prompt, on_chunk, generation_config, answered)
+        )
+
+        if shared:
+            logging.info(f"Joined an identical in-flight {method} request")
+            if on_chunk:
+                on_chunk(text)
+        elif cache:
+            # Keyed on the tier that answered, which need not be GEMINI_MODEL
+            cache.set(answered[-1], method, inputs, text)
+
+        return text
+
+    async def _call_model(self, method, prompt, on_chunk=None, generation_config=None, answered=None):
+        """Send a prompt to the routed model tier, falling back to heavier tiers on failure.
+
+        Each tier tried is appended to answered, so once a call succeeds its
+        last entry is the model that answered.
+        """
+        def attempt(model_name, on_chunk, timeout):
+            if answered is not None:
+                answered.append(model_name)
+            return self._call_tier(method, model_name, prompt, on_chunk, generation_config, timeout)
+
+        return await self.client.router.call_async(method, prompt, on_chunk, attempt)
+
+    async def _call_tier(self, method, model_name, prompt, on_chunk, generation_config, timeout):
+        """Call one model under the shared rate limits, hedging slow non-streaming calls."""
+        model = self.client._model(model_name)
+        request_options = {"timeout": timeout} if timeout else None
+        max_retries = 0 if timeout else None
+        rate_limiter = self.client.rate_limiter
+        if on_chunk:
+            return await rate_limiter.call_async(
+                lambda: self._stream(method, prompt, on_chunk, generation_config, model, request_options),
+                prompt,
+                max_retries
+            )
+        return await self.client.hedger.call_async(
+            self.client._hedge_key(method, model_name),
+            lambda: rate_limiter.call_async(
+                lambda: self._request_text(prompt, generation_config, model, request_options), prompt, max_retries
+            )
+        )
+
+    async def _request_text(self, prompt, generation_config=None, model=None, request_options=None):
+        """Send a single non-streaming request and return its text."""
+        response = await (model or self.client.model).generate_content_async(
+            prompt, generation_config=generation_config, request_options=request_options
+        )
+        return response.text
+
+    async def _stream(self, method, prompt, on_chunk, generation_config=None, model=None, request_options=None):
+        """Stream a response chunk by chunk, logging its time to first token."""
+        started = time.perf_counter()
+        parts = []
+
+        response = await (model or self.client.model).generate_content_async(
+            prompt, stream=True, generation_config=generation_config, request_options=request_options
+        )
+        async for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+
+            if not parts:
+                logging.info(f"{method} first token after {time.perf_counter() - started:.2f}s")
+
+            parts.append(text)
+            on_chunk(text)
+
+        return "".join(parts)
+
+    async def generate_resume_sections(self, profile_data, use_cache=True, on_chunk=None):
+        """Generate resume sections tailored to the user's profile and target role."""
+        prompt = self.client._resume_sections_request(profile_data)
+
+        try:
+            return await self._generate("generate_resume_sections", profile_data, prompt, use_cache, on_chunk)
+
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            logging.error(f"Error generating resume content: {str(e)}")
+            return f"Error generating resume content: {str(e)}"
+
+    async def run_job(self, method, payload, on_progress=None):
+        """Async counterpart of GeminiClient.run_job, raising on failure.
+
+        Also runs tailor_for_many jobs: the payload is {"profile_data": ...,
+        "job_descriptions": [...]}, on_progress(index, draft) is called as each
+        draft finishes and the result is the list of drafts as JSON.
+        """
+        if method == "generate_resume_sections":
+            return await self._generate(
+                method, payload, self.client._resume_sections_request(payload), on_chunk=on_progress
+            )
+        if method == "generate_resume_draft":
+            previous = ResumeDraft.from_dict(payload["previous"]) if payload["previous"] else None
+            draft = await self.generate_resume_draft(payload["profile_data"], previous, on_chunk=on_progress)
+            return json.dumps(draft.to_dict())
+        if method == "tailor_for_many":
+            drafts = await self.tailor_for_many(
+                payload["profile_data"], payload["job_descriptions"], on_draft=on_progress
+            )
+            return json.dumps(drafts)
+        raise ValueError(f"Unknown job method: {method}")
+
+    async def generate_resume_draft(self, profile_data, previous=None, use_cache=True, on_chunk=None):
+        """Build the resume section by section, re-requesting only changed sections and streaming to on_chunk."""
+        draft, missing = self.client._resume_draft_plan(profile_data, previous, use_cache)
+        stream = DraftStream(draft, missing, on_chunk) if on_chunk else None
+        if not missing:
+            return draft
+
+        text = await self._generate(
+            "generate_resume_draft",
+            profile_data,
+            self.client._draft_prompt(missing, profile_data),
+            use_cache=False,
+            on_chunk=stream.feed if stream else None,
+            generation_config=structured_generation_config(missing)
+        )
+        return self.client._fill_draft(draft, profile_data, missing, text)
+
+    async def tailor_for_many(self, profile_data, job_descriptions, use_cache=True, on_draft=None):
+        """Tailor one draft per job description from a single profile digest.
+
+        Drafts run concurrently once the digest is ready; on_draft(index, text) is
+        called as each one finishes. Returns the drafts in input order.
+        """
+        inputs, prompt = self.client._profile_digest_request(profile_data)
+        digest = await with_deadline(
+            self._generate("generate_profile_digest", inputs, prompt, use_cache),
+            Config.REQUEST_DEADLINES.get("generate_profile_digest", Config.ASYNC_REQUEST_TIMEOUT)
+        )
+        semaphore = asyncio.Semaphore(Config.TAILOR_MAX_WORKERS)
+
+        async def tailor(index, job_description):
+            inputs, prompt = self.client._tailored_draft_request(profile_data, digest, job_description)
+            async with semaphore:
+                try:
+                    draft = await with_deadline(
+                        self._generate("generate_tailored_draft", inputs, prompt, use_cache),
+                        Config.REQUEST_DEADLINES.get("generate_tailored_draft", Config.ASYNC_REQUEST_TIMEOUT)
+                    )
+                except TimeoutError:
+                    draft = "Error generating tailored draft: request timed out"
+                except Exception as e:
+                    logging.error(f"Error generating tailored draft: {str(e)}")
+                    draft = f"Error generating tailored draft: {str(e)}"
+
+            if on_draft:
+                on_draft(index, draft)
+            return draft
+
+        return await asyncio.gather(*(
+            tailor(index, job_description) for index, job_description in enumerate(job_descriptions)
+        ))
@@ -1,6 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import customtkinter as ctk
+import logging
+import re
+import threading
+import time
+from collections import deque
 from config import Config
 
 # Set CustomTkinter appearance
@@ -101,18 +106,167 @@ class ModernFrame(ctk.CTkFrame):
             **kwargs
         )
 
+def _percentiles(samples):
+    """p50, p95 and max of a list of seconds, in milliseconds"""
+    if not samples:
+        return {"p50": None, "p95": None, "max": None}
+    ordered = sorted(samples)
+    return {
+        "p50": round(ordered[len(ordered) // 2] * 1000, 1),
+        "p95": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 1),
+        "max": round(ordered[-1] * 1000, 1)
+    }
+
+class UIDispatcher:
+    """Thread-safe hand-off of widget updates from worker threads to the Tk thread
+    
+    Worker threads and the asyncio loop never touch widgets: they post()
+    callables, which the Tk thread runs in order, in batches, every
+    interval_ms. post_latest() keeps only the newest pending update per key,
+    so a burst of status updates costs one redraw, and stream() joins the
+    text chunks that arrived since the last pass into one insert. A pass
+    stops once budget_ms is spent and leaves the rest for the next one, so a
+    flood of events cannot stall the main loop. stats() reports dispatch
+    latency (post to run) and frame pacing (the actual gap between passes).
+    """
+    
+    def __init__(self, root, interval_ms=16, budget_ms=8, window=500):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.budget = budget_ms / 1000
+        self._lock = threading.Lock()
+        # [posted_at, fn, args, kwargs, key] in post order
+        self._events = deque()
+        self._latest = {}
+        self._after_id = None
+        self._last_pass = None
+        self._latencies = deque(maxlen=window)
+        self._frame_gaps = deque(maxlen=window)
+        self.posted = 0
+        self.coalesced = 0
+        self.dispatched = 0
+        self.passes = 0
+        self.max_batch = 0
+        self.late_frames = 0
+    
+    def start(self):
+        """Start draining the queue on the Tk thread"""
+        self._after_id = self.root.after(self.interval_ms, self._drain)
+        return self
+    
+    def stop(self):
+        """Stop draining; updates still queued are dropped"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def post(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the Tk thread (safe to call from any thread)"""
+        with self._lock:
+            self._events.append([time.perf_counter(), fn, args, kwargs, None])
+            self.posted += 1
+    
+    def post_latest(self, key, fn, *args, **kwargs):
+        """Like post(), but replaces an update with the same key that has not run yet"""
+        with self._lock:
+            self.posted += 1
+            event = self._latest.get(key)
+            if event is not None:
+                # Keep its place in the queue and its post time, run the newest call
+                event[1:4] = [fn, args, kwargs]
+                self.coalesced += 1
+                return
+            event = self._latest[key] = [time.perf_counter(), fn, args, kwargs, key]
+            self._events.append(event)
+    
+    def stream(self, fn):
+        """Return a thread-safe on_chunk callback that hands fn the text received since the last pass"""
+        parts = []
+        lock = threading.Lock()
+        key = object()
+        
+        def flush():
+            with lock:
+                text = "".join(parts)
+                parts.clear()
+            if text:
+                fn(text)
+        
+        def on_chunk(text):
+            with lock:
+                parts.append(text)
+            self.post_latest(key, flush)
+        
+        return on_chunk
+    
+    def _drain(self):
+        """Run queued updates until the queue is empty or this pass's time budget is spent"""
+        started = time.perf_counter()
+        if self._last_pass is not None:
+            gap = started - self._last_pass
+            self._frame_gaps.append(gap)
+            if gap * 1000 > 2 * self.interval_ms:
+                self.late_frames += 1
+        self._last_pass = started
+        
+        batch = 0
+        while time.perf_counter() - started < self.budget:
+            with self._lock:
+                if not self._events:
+                    break
+                posted_at, fn, args, kwargs, key = self._events.popleft()
+                if key is not None:
+                    del self._latest[key]
+        
+            self._latencies.append(time.perf_counter() - posted_at)
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                logging.exception("UI update failed")
+            batch += 1
+        
+        self.passes += 1
+        self.dispatched += batch
+        self.max_batch = max(self.max_batch, batch)
+        self._after_id = self.root.after(self.interval_ms, self._drain)
+    
+    def stats(self):
+        """Return update counts, dispatch latency and the gap between passes (milliseconds)"""
+        with self._lock:
+            pending = len(self._events)
+        return {
+            "posted": self.posted,
+            "coalesced": self.coalesced,
+            "dispatched": self.dispatched,
+            "pending": pending,
+            "max_batch": self.max_batch,
+            "late_frames": self.late_frames,
+            "latency_ms": _percentiles(list(self._latencies)),
+            "frame_gap_ms": _percentiles(list(self._frame_gaps))
+        }
+
 class LoadingDialog:
-    """Modern loading dialog"""
+    """Modern loading dialog
     
-    def __init__(self, parent, title="Processing..."):
+    Shows how long the request has been running against its deadline, and a
+    Cancel button (also bound to the window's close button) that calls
+    on_cancel so the request itself is aborted, not just hidden.
+    """
+    
+    def __init__(self, parent, title="Processing...", on_cancel=None, deadline=None):
+        self.on_cancel = on_cancel
+        self.deadline = deadline
+        self.opened_at = time.perf_counter()
+        self.closed = False
+        self._tick_job = None
         self.dialog = ctk.CTkToplevel(parent)
         self.dialog.title(title)
-        self.dialog.geometry("300x150")
+        self.dialog.geometry("300x200")
         self.dialog.resizable(False, False)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
         
-        # Center the dialog
+        # Stay above the main window without blocking it, so other requests can be started meanwhile
         self.dialog.transient(parent)
-        self.dialog.grab_set()
         
         # Create loading content
         self.create_loading_content()
@@ -147,6 +301,23 @@ class LoadingDialog:
             size=10
         )
         self.status_label.pack(pady=5)
+        
+        # Elapsed time against the request's deadline
+        self.elapsed_label = ModernLabel(main_frame, text="", size=10)
+        self.elapsed_label.pack()
+        self.tick()
+        
+        # Cancel button
+        cancel_btn = ModernButton(
+            main_frame,
+            text="⏹️ Cancel",
+            command=self.cancel,
+            width=100,
+            height=28,
+            fg_color="#FF6B6B",
+            hover_color="#FF5252"
+        )
+        cancel_btn.pack(pady=(5, 0))
     
     def center_on_parent(self, parent):
         """Center the dialog on the parent window"""
@@ -165,30 +336,132 @@ class LoadingDialog:
         
         self.dialog.geometry(f"+{x}+{y}")
     
+    def tick(self):
+        """Refresh the elapsed time once a second while the dialog is open"""
+        elapsed = int(time.perf_counter() - self.opened_at)
+        if self.deadline:
+            self.elapsed_label.configure(text=f"⏱️ {elapsed}s of {self.deadline:.0f}s limit")
+        else:
+            self.elapsed_label.configure(text=f"⏱️ {elapsed}s")
+        self._tick_job = self.dialog.after(1000, self.tick)
+    
     def update_status(self, status_text):
-        """Update the status text"""
-        self.status_label.configure(text=status_text)
-        self.dialog.update()
+        """Update the status text (call from the Tk thread, e.g. through UIDispatcher.post)"""
+        if not self.closed:
+            self.status_label.configure(text=status_text)
+    
+    def cancel(self):
+        """Abort the request through on_cancel and close the dialog"""
+        if self.closed:
+            return
+        if self.on_cancel:
+            self.on_cancel()
+        self.close()
     
     def close(self):
-        """Close the loading dialog"""
+        """Close the loading dialog (safe to call more than once)"""
+        if self.closed:
+            return
+        self.closed = True
+        if self._tick_job is not None:
+            self.dialog.after_cancel(self._tick_job)
         self.progress.stop()
         self.dialog.destroy()
 
+# Markdown headings, and bold-only lines for responses without any
+HEADING_PATTERN = re.compile(r"^#{1,6}[ \t]+(.+?)[ \t#]*$", re.MULTILINE)
+BOLD_HEADING_PATTERN = re.compile(r"^\*\*([^*\n]+?)\*\*:?[ \t]*$", re.MULTILINE)
+
+def _find_sections(text):
+    """(outline label, character offset) of each heading in a response"""
+    matches = list(HEADING_PATTERN.finditer(text))
+    if len(matches) < 2:
+        matches = list(BOLD_HEADING_PATTERN.finditer(text))
+    return [
+        (f"{number}. {match.group(1).strip()[:60]}", match.start())
+        for number, match in enumerate(matches, start=1)
+    ]
+
+class ChunkedRenderer:
+    """Fills a text widget a chunk at a time across idle callbacks
+    
+    Inserting a long response in one call blocks the Tk thread while it is
+    laid out. The first chunk_chars go in right away and the rest follow in
+    idle callbacks, broken at line ends, so the dialog paints and resizes
+    while the remainder is added. on_done runs once the last chunk is in.
+    """
+    
+    def __init__(self, widget, chunk_chars=4000):
+        self.widget = widget
+        self.chunk_chars = chunk_chars
+        self.text = ""
+        self.inserted = 0
+        self.on_done = None
+        self._idle_job = None
+    
+    def render(self, text, on_done=None):
+        """Replace the widget's text, dropping any chunks of the previous text still pending"""
+        self.cancel()
+        self.widget.delete("1.0", "end")
+        self.text = text
+        self.inserted = 0
+        self.on_done = on_done
+        self._step()
+    
+    def cancel(self):
+        """Stop inserting the current text"""
+        if self._idle_job is not None:
+            self.widget.after_cancel(self._idle_job)
+            self._idle_job = None
+    
+    def _step(self):
+        """Insert the next chunk and schedule the one after it"""
+        self._idle_job = None
+        if not self.widget.winfo_exists():
+            return
+        
+        end = min(len(self.text), self.inserted + self.chunk_chars)
+        if end < len(self.text):
+            newline = self.text.rfind("\n", self.inserted, end)
+            if newline >= self.inserted:
+                end = newline + 1
+        self.widget.insert("end", self.text[self.inserted:end])
+        self.inserted = end
+        
+        if self.inserted < len(self.text):
+            self._idle_job = self.widget.after_idle(self._step)
+        elif self.on_done:
+            on_done, self.on_done = self.on_done, None
+            on_done()
+
 class ResultsDialog:
-    """Modern results display dialog"""
+    """Modern results display dialog
     
-    def __init__(self, parent, title, content):
+    With streaming=True the dialog opens empty and text is added with
+    append_text() as chunks arrive; finish() marks the response complete.
+    Closing the dialog calls on_close, e.g. to cancel a response still being
+    generated. Text is inserted in chunks across idle callbacks, so even a
+    very long response stays one scrollable document; the outline jumps
+    between its headings by scrolling, without re-rendering.
+    """
+    
+    def __init__(self, parent, title, content="", streaming=False):
+        self.streaming = streaming
+        self.opened_at = time.perf_counter()
+        self.time_to_first_token = None
+        self.on_close = None
+        self.content = content
+        self.sections = []
         self.dialog = ctk.CTkToplevel(parent)
         self.dialog.title(title)
         self.dialog.geometry("900x700")
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
         
         # Make it resizable
         self.dialog.resizable(True, True)
         
-        # Center the dialog
+        # Stay above the main window without blocking it, so other requests can be started meanwhile
         self.dialog.transient(parent)
-        self.dialog.grab_set()
         
         # Create content
         self.create_content(content)
@@ -210,12 +483,23 @@ class ResultsDialog:
         )
         title_label.pack(pady=(10, 20))
         
+        # Section outline (packed by update_outline when there is something to show)
+        self.outline_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        self.outline_label = ModernLabel(self.outline_frame, text="🧭 Jump to:", size=10)
+        self.outline_menu = ctk.CTkOptionMenu(
+            self.outline_frame,
+            values=[""],
+            command=self.jump_to_section,
+            width=320
+        )
+        
         # Results text area
         self.results_text = ModernTextArea(main_frame, height=400)
         self.results_text.pack(fill="both", expand=True, pady=(0, 20))
+        self.renderer = ChunkedRenderer(self.results_text, Config.RESULTS_CHUNK_CHARS)
         
         # Insert content
-        self.results_text.insert("1.0", content)
+        self.show_content(content)
         
         # Button frame
         button_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
@@ -230,20 +514,99 @@ class ResultsDialog:
         )
         copy_btn.pack(side="left", padx=(0, 10))
         
+        # Streaming status label
+        self.stream_status_label = ModernLabel(
+            button_frame,
+            text="⏳ Waiting for the first words..." if self.streaming else "",
+            size=10
+        )
+        self.stream_status_label.pack(side="left", padx=10)
+        
         # Close button
         close_btn = ModernButton(
             button_frame,
             text="✅ Close",
-            command=self.dialog.destroy,
+            command=self.close,
             width=100
         )
         close_btn.pack(side="right")
     
+    def close(self):
+        """Close the dialog, notifying on_close so a response still generating can be cancelled"""
+        if self.on_close:
+            self.on_close()
+        self.renderer.cancel()
+        self.dialog.destroy()
+    
+    def show_content(self, content):
+        """Show a complete response and index its headings"""
+        self.content = content
+        self.sections = _find_sections(content)
+        self.update_outline()
+        self.renderer.render(content)
+    
+    def update_outline(self):
+        """Show the outline when the response has several headings"""
+        if len(self.sections) > 1:
+            labels = [label for label, _ in self.sections]
+            self.outline_menu.configure(values=labels)
+            self.outline_menu.set(labels[0])
+            self.outline_label.pack(side="left", padx=(0, 10))
+            self.outline_menu.pack(side="left")
+            self.outline_frame.pack(fill="x", pady=(0, 10), before=self.results_text)
+        else:
+            self.outline_frame.pack_forget()
+    
+    def jump_to_section(self, label):
+        """Scroll to a heading picked in the outline"""
+        offset = dict(self.sections)[label]
+        position = f"1.0 + {offset} chars"
+        
+        if offset < self.renderer.inserted:
+            self.results_text.see(position)
+        else:
+            # Not inserted yet: scroll once the rest is in
+            self.renderer.on_done = lambda: self.results_text.see(position)
+    
+    def append_text(self, text):
+        """Append a streamed chunk to the results (call from the Tk thread)"""
+        if not self.dialog.winfo_exists():
+            return
+        
+        if self.time_to_first_token is None:
+            self.time_to_first_token = time.perf_counter() - self.opened_at
+            self.stream_status_label.configure(
+                text=f"✍️ Writing... first words after {self.time_to_first_token:.2f}s"
+            )
+        
+        self.content += text
+        self.results_text.insert("end", text)
+        self.results_text.see("end")
+    
+    def finish(self, content=None):
+        """Mark a streamed response as complete, replacing the text if it differs"""
+        if not self.dialog.winfo_exists():
+            return
+        
+        if content is not None and content != self.content:
+            self.show_content(content)
+        else:
+            # Already on screen in full; only index its headings
+            self.sections = _find_sections(self.content)
+            self.update_outline()
+        
+        total = time.perf_counter() - self.opened_at
+        if self.time_to_first_token is None:
+            self.stream_status_label.configure(text=f"✅ Done in {total:.2f}s")
+        else:
+            self.stream_status_label.configure(
+                text=f"✅ Done in {total:.2f}s (first words after {self.time_to_first_token:.2f}s)"
+            )
+    
     def copy_to_clipboard(self):
-        """Copy results to clipboard"""
-        content = self.results_text.get("1.0", "end-1c")
+        """Copy the whole response to the clipboard"""
         self.dialog.clipboard_clear()
-        self.dialog.clipboard_append(content)
+        self.dialog.clipboard_append(self.content)
         messagebox.showinfo("Success", "Results copied to clipboard!")
     
     def center_on_parent(self, parent):
@@ -261,4 +624,145 @@ class ResultsDialog:
         x = parent_x + (parent_width - dialog_width) // 2
         y = parent_y + (parent_height - dialog_height) // 2
         
-        self.dialog.geometry(f"+{x}+{y}")
\ No newline at end of file
+        self.dialog.geometry(f"+{x}+{y}")
+
+class TabbedResultsDialog:
+    """Results dialog with one tab per tailored draft, filled in as each one finishes"""
+    
+    def __init__(self, parent, title, tab_names):
+        self.tab_names = list(tab_names)
+        self.completed = set()
+        self.opened_at = time.perf_counter()
+        self.on_close = None
+        self.dialog = ctk.CTkToplevel(parent)
+        self.dialog.title(title)
+        self.dialog.geometry("900x700")
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        
+        # Make it resizable
+        self.dialog.resizable(True, True)
+        
+        # Stay above the main window without blocking it, so other requests can be started meanwhile
+        self.dialog.transient(parent)
+        
+        # Create content
+        self.create_content()
+        
+        # Center on parent
+        self.center_on_parent(parent)
+    
+    def create_content(self):
+        """Create the tabbed drafts content"""
+        main_frame = ModernFrame(self.dialog)
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        # Title
+        title_label = ModernLabel(
+            main_frame, 
+            text="🎯 Tailored Resume Drafts", 
+            size=16, 
+            weight="bold"
+        )
+        title_label.pack(pady=(10, 10))
+        
+        # One tab per target role
+        self.tabview = ctk.CTkTabview(main_frame)
+        self.tabview.pack(fill="both", expand=True, pady=(0, 10))
+        
+        self.tab_texts = {}
+        self.tab_contents = {}
+        self.renderers = {}
+        for name in self.tab_names:
+            tab = self.tabview.add(name)
+            text_area = ModernTextArea(tab)
+            text_area.pack(fill="both", expand=True)
+            text_area.insert("1.0", "⏳ Generating...")
+            self.tab_texts[name] = text_area
+            self.tab_contents[name] = "⏳ Generating..."
+            self.renderers[name] = ChunkedRenderer(text_area, Config.RESULTS_CHUNK_CHARS)
+        
+        # Button frame
+        button_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        button_frame.pack(fill="x", pady=(10, 0))
+        
+        # Copy button
+        copy_btn = ModernButton(
+            button_frame,
+            text="📋 Copy All Drafts",
+            command=self.copy_to_clipboard,
+            width=150
+        )
+        copy_btn.pack(side="left", padx=(0, 10))
+        
+        # Progress label
+        self.progress_label = ModernLabel(
+            button_frame,
+            text=f"⏳ 0/{len(self.tab_names)} drafts complete",
+            size=10
+        )
+        self.progress_label.pack(side="left", padx=10)
+        
+        # Close button
+        close_btn = ModernButton(
+            button_frame,
+            text="✅ Close",
+            command=self.close,
+            width=100
+        )
+        close_btn.pack(side="right")
+    
+    def close(self):
+        """Close the dialog, notifying on_close so unfinished work can be cancelled"""
+        if self.on_close:
+            self.on_close()
+        for renderer in self.renderers.values():
+            renderer.cancel()
+        self.dialog.destroy()
+    
+    def set_tab_content(self, name, content):
+        """Fill in a finished draft (call from the Tk thread)"""
+        if not self.dialog.winfo_exists():
+            return
+        
+        self.tab_contents[name] = content
+        self.renderers[name].render(content)
+        
+        # Jump to the first draft that finishes
+        if not self.completed:
+            self.tabview.set(name)
+        self.completed.add(name)
+        
+        elapsed = time.perf_counter() - self.opened_at
+        if len(self.completed) == len(self.tab_names):
+            self.progress_label.configure(text=f"✅ All drafts complete in {elapsed:.2f}s")
+        else:
+            self.progress_label.configure(
+                text=f"⏳ {len(self.completed)}/{len(self.tab_names)} drafts complete ({elapsed:.2f}s)"
+            )
+    
+    def copy_to_clipboard(self):
+        """Copy every finished draft to the clipboard"""
+        sections = [
+            f"# {name}\n\n{self.tab_contents[name]}"
+            for name in self.tab_names
+        ]
+        self.dialog.clipboard_clear()
+        self.dialog.clipboard_append("\n\n".join(sections))
+        messagebox.showinfo("Success", "Drafts copied to clipboard!")
+    
+    def center_on_parent(self, parent):
+        """Center the dialog on the parent window"""
+        self.dialog.update_idletasks()
+        
+        parent_x = parent.winfo_rootx()
+        parent_y = parent.winfo_rooty()
+        parent_width = parent.winfo_width()
+        parent_height = parent.winfo_height()
+        
+        dialog_width = self.dialog.winfo_width()
+        dialog_height = self.dialog.winfo_height()
+        
+        x = parent_x + (parent_width - dialog_width) // 2
+        y = parent_y + (parent_height - dialog_height) // 2
+        
+        self.dialog.geometry(f"+{x}+{y}")
@@ -1,14 +1,36 @@
+import os
+import sys
+
+# The shared ai_common package sits next to this app's folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_common.startup_profile import profiler
+import argparse
+import asyncio
 import tkinter as tk
 from tkinter import messagebox
 import customtkinter as ctk
-import threading
+import json
 import logging
+import threading
+from concurrent.futures import Future
 from config import Config
-from gemini_client import GeminiClient
+from gemini_client import GeminiClient, AsyncGeminiClient
+from ai_common.gateway_client import create_client, create_async_client
+from ai_common.async_runner import ActionLimitReached, ActionRunner, AsyncLoopThread
+from ai_common.job_queue import CANCELLED, DONE, JobWorkerPool, create_job_queue
+from ai_common.skill_taxonomy import SkillTaxonomy
 from gui_components import (
     ModernButton, ModernEntry, ModernComboBox, ModernTextArea,
-    ModernLabel, ModernFrame, LoadingDialog, ResultsDialog
+    ModernLabel, ModernFrame, LoadingDialog, ResultsDialog, TabbedResultsDialog, UIDispatcher
 )
+from ats_matcher import match_profile
+from requirements_summary import summarize_requirements
+from resume_sections import ResumeDraft
+
+profiler.mark("imports")
+
+REQUIREMENTS_PLACEHOLDER = "Paste key responsibilities or qualifications from a job description"
 
 logging.basicConfig(level=logging.INFO)
 
@@ -17,11 +39,39 @@ class ResumeAIAgent:
 
     def __init__(self):
         self.root = ctk.CTk()
+        # Worker threads update widgets only through this queue, drained on the Tk thread
+        self.ui = UIDispatcher(self.root, Config.UI_DISPATCH_INTERVAL_MS, Config.UI_DISPATCH_BUDGET_MS).start()
         self.gemini_client = None
-        self.loading_dialog = None
+        self.async_client = None
+        self.gemini_init_error = None
+
+        # Last generated draft; regenerating only re-requests sections whose fields changed
+        self.resume_draft = None
+
+        # One long-lived event loop thread for async Gemini requests, with a bounded
+        # thread pool for the blocking work it hands off
+        self.async_loop = AsyncLoopThread(max_workers=Config.ASYNC_MAX_WORKER_THREADS).start()
+
+        # Requests started from the GUI; a repeat click attaches to the pending one
+        self.actions = ActionRunner(Config.MAX_PENDING_ACTIONS)
+
+        # Durable queue for requests that must survive closing the app; its
+        # workers start once the Gemini client is ready
+        self.job_queue = create_job_queue(Config)
+        self.job_workers = None
+        # job_futures, running_requests and job_progress are shared by the Tk thread, the
+        # job workers and whichever thread cancels a future, so they are only touched under this lock
+        self.jobs_lock = threading.Lock()
+        # Futures of the jobs queued this session, resolved when each one finishes
+        self.job_futures = {}
+        # Requests running for queued jobs, so a job can be cancelled mid-call
+        self.running_requests = {}
+        # Where the progress of a job queued this session goes (streamed text or finished drafts)
+        self.job_progress = {}
 
         self.setup_window()
         self.create_widgets()
+        profiler.mark("widgets created")
         self.initialize_gemini()
 
     def setup_window(self):
@@ -41,12 +91,164 @@ class ResumeAIAgent:
         self.root.geometry(f"{Config.WINDOW_WIDTH}x{Config.WINDOW_HEIGHT}+{x}+{y}")
 
     def initialize_gemini(self):
+        # Warm up in the background so the window paints before the SDK is imported
+        self.async_loop.submit_to_tk(
+            self.ui,
+            self._warm_up_gemini(),
+            self._on_gemini_ready,
+            on_error=self._on_gemini_error
+        )
+
+    async def _warm_up_gemini(self):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, create_client, Config, GeminiClient)
+
+    def _on_gemini_ready(self, client):
+        self.gemini_client = client
+        self.async_client = create_async_client(client, AsyncGeminiClient)
+        self.status_label.configure(text="✅ Gemini Ready")
+        self.start_job_workers()
+
+        if client.sdk_import_seconds is not None:
+            profiler.note("Gemini SDK import (background)", client.sdk_import_seconds)
+        profiler.mark("Gemini warm-up finished")
+
+    def _on_gemini_error(self, exc):
+        self.gemini_init_error = exc
+        self.status_label.configure(text="❌ Gemini Error - Check API Key")
+        logging.error("Failed to initialize Gemini client: %s", exc)
+        profiler.mark("Gemini warm-up finished")
+
+    def start_job_workers(self):
+        # Jobs left queued or running by the last session are picked up too
+        resumed = len(self.job_queue.pending())
+        self.job_workers = JobWorkerPool(
+            self.job_queue,
+            self._run_job,
+            Config.JOB_QUEUE_WORKERS,
+            lease_seconds=Config.JOB_LEASE_SECONDS,
+            max_attempts=Config.JOB_MAX_ATTEMPTS,
+            retry_delay=Config.JOB_RETRY_DELAY,
+            on_finished=lambda job: self.ui.post(self._on_job_finished, job)
+        ).start()
+
+        if resumed:
+            self.status_label.configure(text=f"✅ Gemini Ready - resuming {resumed} unfinished request(s)")
+
+    def request_deadline(self, method):
+        return Config.REQUEST_DEADLINES.get(method, Config.ASYNC_REQUEST_TIMEOUT)
+
+    def _run_job(self, job):
+        # Runs on a job worker thread; the request itself runs on the event loop under its deadline
+        self.ui.post_latest(
+            "status",
+            self.status_label.configure,
+            text=f"⏳ Generating resume content (attempt {job.attempts})..."
+        )
+        # A retried attempt does not report progress again; its dialog gets the final result
+        with self.jobs_lock:
+            on_progress = self.job_progress.get(job.id) if job.attempts == 1 else None
+        handle = self.async_loop.start_request(
+            job.method,
+            self.async_client.run_job(job.method, job.payload, on_progress),
+            self.request_deadline(job.method)
+        )
+        with self.jobs_lock:
+            self.running_requests[job.id] = handle
         try:
-            self.gemini_client = GeminiClient()
+            # Cancelled while it was being leased
+            if self.job_queue.get(job.id).status == CANCELLED:
+                handle.cancel()
+            return handle.result()
+        finally:
+            with self.jobs_lock:
+                self.running_requests.pop(job.id, None)
+
+    def cancel_job(self, job_id):
+        # Aborting the request releases its connection and rate-limit slot; safe from any thread
+        if not self.job_queue.cancel(job_id):
+            # Already finished: drop the result that is on its way to the Tk thread,
+            # unless it has been delivered and its entry is gone
+            with self.jobs_lock:
+                if job_id in self.job_futures:
+                    self.job_futures[job_id] = None
+            return
+
+        with self.jobs_lock:
+            self.job_futures.pop(job_id, None)
+            self.job_progress.pop(job_id, None)
+            handle = self.running_requests.get(job_id)
+        if handle:
+            handle.cancel()
+        logging.info("Cancelled job %s", job_id)
+        self.ui.post_latest("status", self.status_label.configure, text="✅ Gemini Ready - request cancelled")
+
+    def submit_job(self, method, payload, on_progress=None):
+        # Returns a Future of the result text, resolved on the Tk thread (a RuntimeError with
+        # the job's error if it failed for good); cancelling the future cancels the job.
+        # on_progress is passed to run_job (streamed text, or each finished tailored draft)
+        job_id = self.job_queue.enqueue(method, payload)
+        logging.info("Queued %s as job %s", method, job_id)
+        future = Future()
+        future.add_done_callback(lambda done: self.cancel_job(job_id) if done.cancelled() else None)
+        with self.jobs_lock:
+            self.job_futures[job_id] = future
+            if on_progress:
+                self.job_progress[job_id] = on_progress
+        self.job_workers.notify()
+        return future
+
+    def _on_job_finished(self, job):
+        with self.jobs_lock:
+            idle = not self.running_requests
+            queued_here = job.id in self.job_futures
+            future = self.job_futures.pop(job.id, None)
+            self.job_progress.pop(job.id, None)
+        if idle:
             self.status_label.configure(text="✅ Gemini Ready")
-        except Exception as exc:
-            self.status_label.configure(text="❌ Gemini Error - Check API Key")
-            logging.error("Failed to initialize Gemini client: %s", exc)
+
+        if queued_here:
+            if future is None or not future.set_running_or_notify_cancel():
+                return
+            if job.status == DONE:
+                future.set_result(job.result)
+            else:
+                future.set_exception(RuntimeError(job.error))
+        elif job.status == DONE and job.method == "generate_resume_draft":
+            self.resume_draft = ResumeDraft.from_dict(json.loads(job.result))
+            ResultsDialog(self.root, "AI-Generated Resume Content (resumed)", self.resume_draft.to_markdown())
+        elif job.status == DONE and job.method == "tailor_for_many":
+            tab_names = self._tailor_tab_names(job.payload["job_descriptions"])
+            drafts_dialog = TabbedResultsDialog(self.root, "Tailored Resume Drafts (resumed)", tab_names)
+            for name, draft in zip(tab_names, json.loads(job.result)):
+                drafts_dialog.set_tab_content(name, draft)
+        elif job.status == DONE:
+            ResultsDialog(self.root, "AI-Generated Resume Content (resumed)", job.result)
+        else:
+            logging.error("Resumed job %s (%s) failed: %s", job.id, job.method, job.error)
+
+    def run_action(self, name, inputs, start):
+        # A repeat click while the same action with the same inputs is pending brings its
+        # dialog to the front instead; past MAX_PENDING_ACTIONS the click is refused
+        try:
+            action, started = self.actions.run(name, inputs, start)
+        except ActionLimitReached as exc:
+            messagebox.showwarning("Busy", str(exc))
+            return None
+
+        if not started:
+            logging.info("%s is already running for these inputs; showing it instead", name)
+            if action.dialog and action.dialog.dialog.winfo_exists():
+                action.dialog.dialog.lift()
+                action.dialog.dialog.focus_force()
+            return None
+        return action
+
+    def show_ai_unavailable(self):
+        if self.gemini_init_error is None:
+            messagebox.showinfo("Please wait", "Gemini is still starting up. Please try again in a moment.")
+        else:
+            messagebox.showerror("Error", "AI Assistant is not available. Please check your API key.")
 
     def create_widgets(self):
         main_container = ModernFrame(self.root)
@@ -191,10 +393,7 @@ class ResumeAIAgent:
         )
         self.requirements_text = ModernTextArea(form_frame, height=140)
         self.requirements_text.grid(row=3, column=0, sticky="ew", pady=(0, 15))
-        self.requirements_text.insert(
-            "1.0",
-            "Paste key responsibilities or qualifications from a job description"
-        )
+        self.requirements_text.insert("1.0", REQUIREMENTS_PLACEHOLDER)
 
         primary_action_btn = ModernButton(
             requirements_frame,
@@ -205,6 +404,30 @@ class ResumeAIAgent:
         )
         primary_action_btn.grid(row=2, column=0, sticky="ew", padx=20, pady=(0, 10))
 
+        tailor_btn = ModernButton(
+            requirements_frame,
+            text="🎯 Tailor for Many Roles",
+            command=self.tailor_for_many,
+            height=45
+        )
+        tailor_btn.grid(row=3, column=0, sticky="ew", padx=20, pady=(0, 10))
+
+        ats_btn = ModernButton(
+            requirements_frame,
+            text="🔎 Check ATS Keywords",
+            command=self.check_ats_keywords,
+            height=45
+        )
+        ats_btn.grid(row=4, column=0, sticky="ew", padx=20, pady=(0, 10))
+
+        condensed_btn = ModernButton(
+            requirements_frame,
+            text="✂️ Show Condensed Requirements",
+            command=self.show_condensed_requirements,
+            height=45
+        )
+        condensed_btn.grid(row=5, column=0, sticky="ew", padx=20, pady=(0, 10))
+
         reset_btn = ModernButton(
             requirements_frame,
             text="🗑️ Clear All",
@@ -213,7 +436,7 @@ class ResumeAIAgent:
             fg_color="#FF6B6B",
             hover_color="#FF5252"
         )
-        reset_btn.grid(row=3, column=0, sticky="ew", padx=20, pady=(0, 20))
+        reset_btn.grid(row=6, column=0, sticky="ew", padx=20, pady=(0, 20))
 
     def create_footer(self, parent):
         footer_frame = ModernFrame(parent)
@@ -243,6 +466,12 @@ class ResumeAIAgent:
         if not skills or skills.startswith("List your key skills"):
             messagebox.showerror("Validation Error", "Please enter your core skills.")
             return False
+        if not SkillTaxonomy.shared(Config).known_skills(skills) and not messagebox.askyesno(
+            "Check Skills",
+            "None of the entered skills were recognized. Separate skills with commas "
+            "(e.g. Python, SQL, Project Management).\n\nContinue anyway?"
+        ):
+            return False
         return True
 
     def collect_profile_data(self):
@@ -253,7 +482,7 @@ class ResumeAIAgent:
             "skills": self.skills_text.get("1.0", "end-1c").strip(),
             "achievements": self.achievements_text.get("1.0", "end-1c").strip(),
             "target_role": self.target_role_entry.get().strip(),
-            "requirements": self.requirements_text.get("1.0", "end-1c").strip(),
+            "requirements": self.collect_requirements(),
             "industries": self.industries_text.get("1.0", "end-1c").strip()
         }
 
@@ -261,32 +490,204 @@ class ResumeAIAgent:
         if not self.validate_inputs():
             return
         if not self.gemini_client:
-            messagebox.showerror("Error", "AI Assistant is not available. Please check your API key.")
+            self.show_ai_unavailable()
             return
 
         data = self.collect_profile_data()
-        self.loading_dialog = LoadingDialog(self.root, "Crafting resume content...")
-        worker = threading.Thread(target=self._generate_resume_thread, args=(data,))
-        worker.daemon = True
-        worker.start()
+        self._report_condensed_requirements(data["requirements"])
+        job_count = len(self.collect_job_descriptions())
+        if job_count > 1:
+            self.status_label.configure(
+                text=f"📄 Using the first of {job_count} job descriptions "
+                "(Tailor for Many Roles drafts one per role)"
+            )
+        if Config.INCREMENTAL_RESUME:
+            method = "generate_resume_draft"
+            payload = {
+                "profile_data": data,
+                "previous": self.resume_draft.to_dict() if self.resume_draft else None
+            }
+            show_result = self._show_resume_draft
+        else:
+            method, payload, show_result = "generate_resume_sections", data, self._finish_stream
+
+        # Every request is queued durably, so closing the app mid-request resumes it on the next launch
+        if Config.INCREMENTAL_RESUME or Config.STREAM_RESPONSES:
+            # Open the results right away; with streaming on they fill in as the response is written
+            def start(action):
+                action.dialog = ResultsDialog(self.root, "AI-Generated Resume Content", streaming=True)
+                on_chunk = self.ui.stream(action.dialog.append_text) if Config.STREAM_RESPONSES else None
+                future = self.submit_job(method, payload, on_chunk)
+                # Closing the dialog cancels the job
+                action.dialog.on_close = future.cancel
+                return future
+
+            action = self.run_action(method, data, start)
+            if action:
+                action.future.add_done_callback(
+                    lambda done: self.ui.post(show_result, done, action.dialog)
+                )
+        else:
+            action = self.run_action(
+                "generate_resume_sections",
+                data,
+                lambda action: self.submit_job("generate_resume_sections", data)
+            )
+            if action is None:
+                return
+
+            loading_dialog = LoadingDialog(
+                self.root,
+                "Crafting resume content...",
+                on_cancel=action.future.cancel,
+                deadline=self.request_deadline("generate_resume_sections")
+            )
+            loading_dialog.update_status("Analyzing your profile and target role...")
+            action.dialog = loading_dialog
+            action.future.add_done_callback(
+                lambda done: self.ui.post(self._show_resume_job, done, loading_dialog)
+            )
+
+    def collect_requirements(self):
+        # Several job descriptions are for Tailor for Many Roles; a single draft targets the first
+        job_descriptions = self.collect_job_descriptions()
+        return job_descriptions[0] if job_descriptions else ""
+
+    def check_ats_keywords(self):
+        data = self.collect_profile_data()
+        if not data["requirements"]:
+            messagebox.showerror("Validation Error", "Paste the job requirements to check keywords against.")
+            return
 
-    def _generate_resume_thread(self, profile_data):
-        try:
-            self.loading_dialog.update_status("Analyzing your profile and target role...")
-            resume_sections = self.gemini_client.generate_resume_sections(profile_data)
-            self.root.after(0, self._show_resume_results, resume_sections)
-        except Exception as exc:
-            logging.error("Error generating resume content: %s", exc)
-            self.root.after(0, self._show_error, f"Error generating resume content: {exc}")
+        # Scored locally in milliseconds, so no worker thread or Gemini call is needed
+        report = match_profile(data, data["requirements"])
+        ResultsDialog(self.root, "ATS Keyword Match", report.to_markdown())
+
+    def show_condensed_requirements(self):
+        requirements = self.collect_requirements()
+        if not requirements:
+            messagebox.showerror("Validation Error", "Paste the job requirements to condense.")
+            return
+
+        ResultsDialog(self.root, "Condensed Job Requirements", summarize_requirements(requirements).to_markdown())
+
+    def _report_condensed_requirements(self, requirements):
+        # Condensing is local and memoized, so the prompt builders reuse this result
+        summary = summarize_requirements(requirements)
+        if summary.summarized:
+            self.status_label.configure(
+                text=f"✂️ Requirements condensed from {summary.original_words} to {summary.kept_words} words "
+                "(Show Condensed Requirements to review)"
+            )
+
+    def collect_job_descriptions(self):
+        text = self.requirements_text.get("1.0", "end-1c")
+        descriptions = []
+        current = []
+        for line in text.splitlines() + ["---"]:
+            if line.strip() != "---":
+                current.append(line)
+                continue
+            description = "\n".join(current).strip()
+            if description and description != REQUIREMENTS_PLACEHOLDER:
+                descriptions.append(description)
+            current = []
+        return descriptions
+
+    def tailor_for_many(self):
+        if not self.validate_inputs():
+            return
+        if not self.gemini_client:
+            self.show_ai_unavailable()
+            return
+
+        job_descriptions = self.collect_job_descriptions()
+        if not job_descriptions:
+            messagebox.showerror(
+                "Validation Error",
+                "Paste one or more job descriptions, separated by a line containing only ---."
+            )
+            return
+
+        tab_names = self._tailor_tab_names(job_descriptions)
+        data = self.collect_profile_data()
+
+        def start(action):
+            drafts_dialog = action.dialog = TabbedResultsDialog(self.root, "Tailored Resume Drafts", tab_names)
+            # Queued durably like resume generation; each tab fills in as its draft finishes
+            future = self.submit_job(
+                "tailor_for_many",
+                {"profile_data": data, "job_descriptions": job_descriptions},
+                lambda index, draft: self.ui.post(drafts_dialog.set_tab_content, tab_names[index], draft)
+            )
+
+            # Closing the dialog cancels any drafts that are still running
+            drafts_dialog.on_close = future.cancel
+            return future
+
+        action = self.run_action("tailor_for_many", [data, job_descriptions], start)
+        if action:
+            action.future.add_done_callback(
+                lambda done: self.ui.post(self._show_tailored_drafts, done, action.dialog, tab_names)
+            )
+
+    def _tailor_tab_names(self, job_descriptions):
+        # Tab names must be unique, so number them
+        return [
+            f"{index}. {description.splitlines()[0].strip()[:30]}"
+            for index, description in enumerate(job_descriptions, start=1)
+        ]
+
+    def _show_tailored_drafts(self, future, drafts_dialog, tab_names):
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self._show_tailoring_error(drafts_dialog, tab_names, future.exception())
+            return
+        # Fill in any tab a retried attempt did not report
+        for name, draft in zip(tab_names, json.loads(future.result())):
+            if drafts_dialog.tab_contents.get(name) != draft:
+                drafts_dialog.set_tab_content(name, draft)
+
+    def _show_tailoring_error(self, drafts_dialog, tab_names, exc):
+        logging.error("Error building the profile digest: %s", exc)
+        for name in tab_names:
+            drafts_dialog.set_tab_content(name, f"Error building the profile digest: {exc}")
+
+    def _show_resume_draft(self, future, results_dialog):
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self._show_stream_error(results_dialog, future.exception())
+            return
+        self.resume_draft = ResumeDraft.from_dict(json.loads(future.result()))
+        results_dialog.finish(self.resume_draft.to_markdown())
+
+    def _finish_stream(self, future, results_dialog):
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self._show_stream_error(results_dialog, future.exception())
+            return
+        results_dialog.finish(future.result())
+
+    def _show_stream_error(self, results_dialog, exc):
+        logging.error("Error generating resume content: %s", exc)
+        results_dialog.finish(f"Error generating resume content: {exc}")
+
+    def _show_resume_job(self, future, loading_dialog):
+        loading_dialog.close()
+        if future.cancelled():
+            return
+        if future.exception() is None:
+            self._show_resume_results(future.result())
+        else:
+            self._show_error(f"Error generating resume content: {future.exception()}")
 
     def _show_resume_results(self, sections):
-        if self.loading_dialog:
-            self.loading_dialog.close()
         ResultsDialog(self.root, "AI-Generated Resume Content", sections)
 
     def _show_error(self, error_message):
-        if self.loading_dialog:
-            self.loading_dialog.close()
         messagebox.showerror("Error", error_message)
 
     def clear_form(self):
@@ -301,13 +702,32 @@ class ResumeAIAgent:
         self.industries_text.insert("1.0", "Optional: List industries or company types you are targeting")
         self.target_role_entry.delete(0, tk.END)
         self.requirements_text.delete("1.0", tk.END)
-        self.requirements_text.insert("1.0", "Paste key responsibilities or qualifications from a job description")
+        self.requirements_text.insert("1.0", REQUIREMENTS_PLACEHOLDER)
 
     def run(self):
-        self.root.mainloop()
+        self.root.after_idle(profiler.mark, "first paint")
+        try:
+            self.root.mainloop()
+        finally:
+            # Unfinished jobs stay in the queue and resume on the next launch
+            if self.job_workers:
+                self.job_workers.stop()
+            self.async_loop.stop()
+            self.ui.stop()
+            logging.info("UI dispatch stats: %s", self.ui.stats())
+            logging.info("Action stats: %s", self.actions.stats())
 
 
 def main():
+    parser = argparse.ArgumentParser(description=Config.APP_TITLE)
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print an import-time and first-paint breakdown once the app is ready"
+    )
+    args = parser.parse_args()
+    profiler.enabled = args.profile_startup
+
     app = ResumeAIAgent()
     app.run()
 
@@ -0,0 +1,175 @@
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+from ats_matcher import tokenize
+from config import Config
+from ai_common.skill_taxonomy import SkillTaxonomy
+
+LINE_PATTERN = re.compile(r"\n+|•")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9])")
+# Bullet markers and list numbering at the start of a line
+LIST_MARKER = re.compile(r"^\s*(?:[-*–·]+|\(?\d+[.)])\s*")
+
+# TextRank damping factor and power-iteration limits
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+
+# Random-jump weight of a sentence naming no skills, relative to one naming one skill
+JUMP_FLOOR = 0.1
+
+# Sentences this similar to one already kept are treated as repeats
+DUPLICATE_SIMILARITY = 0.8
+
+# Shorter lines without a known skill are headings ("Benefits"), not requirements
+MIN_SENTENCE_WORDS = 4
+
+
+@dataclass
+class RequirementsSummary:
+    """Job requirements as sent to Gemini: the original text, or its top-ranked sentences"""
+
+    text: str
+    kept: list = field(default_factory=list)
+    total_sentences: int = 0
+    original_words: int = 0
+    kept_words: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def summarized(self):
+        return self.kept_words < self.original_words
+
+    def to_markdown(self):
+        """Render the kept sentences for the results dialog"""
+        if not self.summarized:
+            return (
+                f"### Job Requirements Sent in Full\n\n"
+                f"The requirements are {self.original_words} words, within the "
+                f"{Config.REQUIREMENTS_SUMMARY_THRESHOLD}-word limit, so nothing was removed."
+            )
+
+        kept = "\n".join(f"- {sentence}" for sentence in self.kept)
+        return (
+            f"### Condensed Job Requirements\n\n"
+            f"Kept {len(self.kept)} of {self.total_sentences} sentences "
+            f"({self.kept_words} of {self.original_words} words). These are sent to Gemini "
+            f"in place of the full text:\n\n"
+            f"{kept}\n\n"
+            f"_Ranked locally in {self.elapsed_ms:.1f} ms_"
+        )
+
+
+def split_sentences(text):
+    """Split pasted requirements into sentences, one per bullet or line at most"""
+    sentences = []
+    for line in LINE_PATTERN.split(text):
+        line = LIST_MARKER.sub("", " ".join(line.split()))
+        sentences.extend(sentence for sentence in SENTENCE_END.split(line) if sentence)
+    return sentences
+
+
+def rank_sentences(sentence_terms, taxonomy):
+    """Return TextRank scores and the normalized TF-IDF vectors of the sentences
+
+    Sentences are linked by the cosine similarity of their TF-IDF vectors. Plain
+    TextRank would favor company boilerplate, which is repetitive and so similar
+    to itself; instead the random jump lands mostly on sentences naming taxonomy
+    skills, and rank flows from them to the sentences most like them.
+    """
+    vocabulary = {term: position for position, term in enumerate(sorted({
+        term for terms in sentence_terms for term in terms
+    }))}
+    counts = np.zeros((len(sentence_terms), len(vocabulary)))
+    for row, terms in enumerate(sentence_terms):
+        if terms:
+            np.add.at(counts[row], [vocabulary[term] for term in terms], 1)
+
+    document_frequency = (counts > 0).sum(axis=0)
+    idf = np.log((len(sentence_terms) + 1) / (document_frequency + 1)) + 1
+    vectors = np.log1p(counts) * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    skills = set(taxonomy.canonical.values())
+    jump = np.array([JUMP_FLOOR + sum(term in skills for term in terms) for terms in sentence_terms])
+    jump /= jump.sum()
+
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    # Sentences sharing no terms with any other follow the random jump
+    transition = np.divide(
+        similarity, row_sums,
+        out=np.tile(jump, (len(sentence_terms), 1)),
+        where=row_sums > 0
+    )
+
+    scores = np.full(len(sentence_terms), 1.0 / len(sentence_terms))
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) * jump + DAMPING * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+
+    return scores, vectors
+
+
+@lru_cache(maxsize=32)
+def summarize_requirements(text):
+    """Condense job requirements longer than Config.REQUIREMENTS_SUMMARY_THRESHOLD words
+
+    The highest-ranked sentences are kept, in their original order, until about
+    Config.REQUIREMENTS_SUMMARY_WORDS words. Shorter text, and text with no
+    sentence worth keeping, is returned unchanged.
+    Results are memoized, so the GUI and the prompt builders share the work.
+    """
+    started = time.perf_counter()
+    original_words = len(text.split())
+    threshold = Config.REQUIREMENTS_SUMMARY_THRESHOLD
+    if threshold <= 0 or original_words <= threshold:
+        return RequirementsSummary(text=text, original_words=original_words, kept_words=original_words)
+
+    taxonomy = SkillTaxonomy.shared(Config)
+    sentences = split_sentences(text)
+    sentence_terms = [tokenize(sentence, taxonomy) for sentence in sentences]
+    scores, vectors = rank_sentences(sentence_terms, taxonomy)
+
+    selected = []
+    kept_words = 0
+    for index in np.argsort(-scores, kind="stable"):
+        if kept_words >= Config.REQUIREMENTS_SUMMARY_WORDS:
+            break
+        if not sentence_terms[index]:
+            continue
+        if len(sentences[index].split()) < MIN_SENTENCE_WORDS and not taxonomy.extract(sentences[index]):
+            continue
+        if selected and (vectors[selected] @ vectors[index]).max() > DUPLICATE_SIMILARITY:
+            continue
+        selected.append(index)
+        kept_words += len(sentences[index].split())
+
+    if not selected:
+        # Nothing looked like a requirement; send the text as it is rather than nothing
+        return RequirementsSummary(
+            text=text,
+            total_sentences=len(sentences),
+            original_words=original_words,
+            kept_words=original_words,
+            elapsed_ms=(time.perf_counter() - started) * 1000
+        )
+
+    kept = [sentences[index] for index in sorted(selected)]
+    return RequirementsSummary(
+        text="\n".join(f"- {sentence}" for sentence in kept),
+        kept=kept,
+        total_sentences=len(sentences),
+        original_words=original_words,
+        kept_words=kept_words,
+        elapsed_ms=(time.perf_counter() - started) * 1000
+    )
@@ -0,0 +1,196 @@
+import json
+from dataclasses import asdict, dataclass, field
+
+from config import ResumeTemplates
+from ai_common.section_stream import SectionStream
+
+# (section, template, instructions, profile fields the section depends on). Section
+# names match the template placeholders. The header is filled in locally; every
+# other section is generated and remembered with the field values it used, so
+# editing e.g. only "Target Industries" re-requests just that section and
+# splices it into the existing draft.
+RESUME_SECTIONS = [
+    (
+        "header",
+        ResumeTemplates.HEADER,
+        None,
+        ("name", "target_role", "experience")
+    ),
+    (
+        "summary",
+        ResumeTemplates.SUMMARY,
+        "A concise professional summary aligned with the target role.",
+        ("current_role", "experience", "skills", "target_role", "requirements")
+    ),
+    (
+        "experience_highlights",
+        ResumeTemplates.EXPERIENCE,
+        "4-5 bullet points highlighting relevant experience and accomplishments.",
+        ("current_role", "experience", "achievements", "target_role", "requirements")
+    ),
+    (
+        "achievements",
+        ResumeTemplates.ACHIEVEMENTS,
+        "Bullet points leveraging the provided achievements, focused on metrics.",
+        ("achievements", "target_role")
+    ),
+    (
+        "skills",
+        ResumeTemplates.SKILLS,
+        "The core skills grouped into categories.",
+        ("skills", "target_role", "requirements")
+    ),
+    (
+        "industries",
+        ResumeTemplates.INDUSTRIES,
+        "Short notes on how the candidate aligns with each target industry.",
+        ("industries", "target_role")
+    )
+]
+
+FIELD_LABELS = {
+    "name": "Candidate Name",
+    "current_role": "Current Role",
+    "experience": "Experience Level",
+    "skills": "Core Skills",
+    "achievements": "Achievements",
+    "target_role": "Target Role",
+    "industries": "Target Industries",
+    "requirements": "Job Requirements"
+}
+
+
+@dataclass
+class ResumeDraft:
+    """A resume draft kept as ResumeTemplates sections, with the profile fields each one used"""
+
+    sections: dict = field(default_factory=dict)
+    section_inputs: dict = field(default_factory=dict)
+    reused_sections: list = field(default_factory=list)
+    generated_sections: list = field(default_factory=list)
+
+    def to_markdown(self):
+        """Render the sections through their templates in resume order"""
+        parts = []
+        for name, template, _, _ in RESUME_SECTIONS:
+            content = self.sections.get(name)
+            if not content:
+                continue
+            parts.append(content if name == "header" else template.format(**{name: content}))
+        return "\n".join(parts)
+
+    def to_dict(self):
+        """Plain dict of the draft, e.g. for a job queue payload or result"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a draft from to_dict()"""
+        return cls(**data)
+
+
+class DraftStream(SectionStream):
+    """Stream a ResumeDraft as markdown while its JSON reply arrives"""
+
+    separator = "\n"
+    skip_empty = True
+
+    def __init__(self, draft, missing, on_chunk):
+        order = [name for name, _, _, _ in RESUME_SECTIONS if name in draft.sections or name in missing]
+        super().__init__(order, draft.sections, missing, on_chunk)
+
+    def render(self, name, body):
+        """Render a section the way ResumeDraft.to_markdown() does"""
+        if name == "header":
+            return body
+        template = next(template for section, template, _, _ in RESUME_SECTIONS if section == name)
+        return template.format(**{name: body})
+
+
+def section_inputs(name, profile_data):
+    """Return only the profile fields a section depends on"""
+    dependencies = next(deps for section, _, _, deps in RESUME_SECTIONS if section == name)
+    return {key: profile_data.get(key, "") for key in dependencies}
+
+
+def render_header(profile_data):
+    """Fill in the header template locally; it needs no model call"""
+    return ResumeTemplates.HEADER.format(
+        name=profile_data.get("name") or "Candidate",
+        target_role=profile_data.get("target_role", ""),
+        experience=profile_data.get("experience", "")
+    )
+
+
+def stale_sections(draft, profile_data):
+    """Return the generated sections whose profile fields changed since the draft was made"""
+    stale = []
+    for name, _, instructions, _ in RESUME_SECTIONS:
+        if instructions is None:
+            continue
+        if name == "industries" and not profile_data.get("industries"):
+            continue
+        if draft is None or name not in draft.sections:
+            stale.append(name)
+        elif draft.section_inputs.get(name) != section_inputs(name, profile_data):
+            stale.append(name)
+    return stale
+
+
+def prompt_fields(sections):
+    """Return the profile fields a prompt for the given sections shows, in label order"""
+    return [
+        key for key in FIELD_LABELS
+        if any(key in deps for name, _, _, deps in RESUME_SECTIONS if name in sections)
+    ]
+
+
+def build_sections_prompt(sections, profile_data, priority_keywords=()):
+    """Build a prompt asking for just the given resume sections as a JSON object
+
+    priority_keywords are the requirement keywords missing from the profile,
+    found in the full requirements rather than the condensed ones shown here.
+    """
+    needed = prompt_fields(sections)
+    details = "\n".join(f"{FIELD_LABELS[key]}: {profile_data.get(key) or 'Not specified'}" for key in needed)
+    if "requirements" in needed:
+        if priority_keywords:
+            details += (
+                "\nPriority Keywords (in the requirements but missing from the profile; "
+                f"use where the background supports them): {', '.join(priority_keywords)}"
+            )
+    requested = "\n".join(
+        f'- "{name}": {instructions}'
+        for name, _, instructions, _ in RESUME_SECTIONS
+        if name in sections
+    )
+
+    return (
+        "You are an expert resume writer creating tailored resume content. "
+        "Use the details below to write part of a professional resume draft:\n\n"
+        f"{details}\n\n"
+        "Return a JSON object with exactly these fields. Each value is markdown without a heading; "
+        "keep it ATS-friendly, use strong action verbs and incorporate keywords from the target role "
+        "and requirements:\n\n"
+        f"{requested}"
+    )
+
+
+def structured_generation_config(sections):
+    """Generation config asking for a JSON object with one string field per requested section"""
+    return {
+        "response_mime_type": "application/json",
+        "response_schema": {
+            "type": "OBJECT",
+            "properties": {name: {"type": "STRING"} for name in sections},
+            "required": list(sections)
+        }
+    }
+
+
+def parse_sections(text, sections):
+    """Parse the model's JSON reply, returning {section: markdown} for the requested sections"""
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("Resume sections response is not a JSON object")
+    return {name: str(data.get(name, "")).strip() for name in sections}
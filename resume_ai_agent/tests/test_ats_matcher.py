@@ -0,0 +1,83 @@
+import pytest
+
+from ai_common.skill_taxonomy import SkillTaxonomy
+from ats_matcher import match_keywords, match_profile, missing_keywords, skill_list_terms, tokenize
+
+REQUIREMENTS = """
+Build data pipelines in Python and Spark.
+Deploy services on Kubernetes.
+Python and SQL for reporting.
+Experience with Airflow is a plus.
+"""
+
+
+@pytest.fixture(autouse=True)
+def taxonomy(monkeypatch):
+    # The bundled taxonomy, without writing the compiled cache next to the app
+    taxonomy = SkillTaxonomy()
+    monkeypatch.setattr(SkillTaxonomy, "_shared", taxonomy)
+    return taxonomy
+
+
+def test_aliases_collapse_onto_the_canonical_skill(taxonomy):
+    assert "Kubernetes" in tokenize("Ran k8s clusters", taxonomy)
+    assert tokenize("the strong team and years", taxonomy) == []
+
+
+def test_ambiguous_names_count_in_a_skills_list(taxonomy):
+    assert skill_list_terms("Go, JS", taxonomy) == ["Go", "JavaScript"]
+    assert "Go" not in tokenize("ready to go", taxonomy)
+
+
+def test_full_coverage_scores_100():
+    report = match_keywords("Python Spark Kubernetes SQL Airflow pipelines", "Python and Spark pipelines")
+
+    assert report.score == pytest.approx(100.0)
+    assert report.missing == []
+
+
+def test_missing_keywords_are_weighted():
+    report = match_keywords("Data pipelines", REQUIREMENTS, profile_skills="Spark")
+
+    weights = dict(report.missing)
+    assert report.top_missing(3) == [term for term, _ in report.missing[:3]]
+    # Keywords repeated across the requirements outweigh ones from the same sentence
+    assert weights["Python"] > weights["SQL"]
+    # Taxonomy skills outweigh plain words in the same sentence
+    assert weights["Kubernetes"] > weights["services"]
+    assert set(term for term, _ in report.matched) == {"Apache Spark", "data", "pipelines"}
+    assert 0 < report.score < 100
+
+
+def test_profile_skills_use_the_taxonomy():
+    assert "Kubernetes" not in match_keywords("", REQUIREMENTS, profile_skills="k8s").top_missing(10)
+
+
+def test_repeated_profile_keywords_are_over_represented():
+    report = match_keywords("Excel Excel Excel reports Python", REQUIREMENTS)
+
+    assert [term for term, _ in report.over_represented] == ["excel"]
+
+
+def test_empty_requirements_score_zero():
+    report = match_keywords("Python", "   ")
+
+    assert report.score == 0.0
+    assert report.matched == [] and report.missing == []
+
+
+def test_match_profile_reads_the_form_fields():
+    profile = {"current_role": "Data Engineer", "skills": "Python, SQL", "achievements": "", "industries": ""}
+
+    report = match_profile(profile, REQUIREMENTS)
+
+    assert {"Python", "SQL"} <= set(term for term, _ in report.matched)
+    assert "ATS Keyword Match" in report.to_markdown()
+
+
+def test_missing_keywords_needs_requirements_and_a_limit():
+    profile = {"skills": "Python"}
+
+    assert missing_keywords(profile, "", 5) == []
+    assert missing_keywords(profile, REQUIREMENTS, 0) == []
+    assert len(missing_keywords(profile, REQUIREMENTS, 2)) == 2
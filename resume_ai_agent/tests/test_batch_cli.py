@@ -0,0 +1,124 @@
+import asyncio
+import json
+import sys
+
+import batch_cli
+from batch_cli import BatchOutput, read_profiles, run_batch
+
+
+class Client:
+    """Stands in for GeminiClient: builds a prompt and reports empty stats"""
+
+    def _resume_sections_request(self, profile):
+        return f"prompt for {profile['name']}"
+
+    def prompt_budget_stats(self):
+        return {"sent_tokens": 0, "saved_tokens": 0}
+
+    def hedge_stats(self):
+        return {"hedges": 0, "requests": 0, "hedge_wins": 0}
+
+    def routing_stats(self):
+        return {}
+
+
+class AsyncClient:
+    """Stands in for AsyncGeminiClient, failing for the names in fail"""
+
+    def __init__(self, fail=()):
+        self.client = Client()
+        self.fail = set(fail)
+        self.prompts = []
+
+    async def _generate(self, method, inputs, prompt, use_cache=True):
+        self.prompts.append(prompt)
+        if inputs["name"] in self.fail:
+            raise RuntimeError("quota")
+        return f"# {inputs['name']}"
+
+
+def profile(name):
+    return dict({key: "" for key in batch_cli.PROFILE_FIELDS}, name=name)
+
+
+def test_csv_rows_are_keyed_by_id_or_position(tmp_path):
+    path = tmp_path / "profiles.csv"
+    path.write_text("id,name,skills\nada,Ada, Python \n,Grace,COBOL\n", encoding="utf-8")
+
+    rows = list(read_profiles(str(path)))
+
+    assert [row_id for row_id, _ in rows] == ["ada", "2"]
+    assert rows[0][1]["skills"] == "Python"
+    assert rows[1][1]["achievements"] == ""
+
+
+def test_jsonl_rows(tmp_path):
+    path = tmp_path / "profiles.jsonl"
+    path.write_text('{"name": "Ada"}\n\n{"id": 7, "name": "Grace"}\n', encoding="utf-8")
+
+    assert [(row_id, row["name"]) for row_id, row in read_profiles(str(path))] == [("1", "Ada"), ("7", "Grace")]
+
+
+def test_jsonl_output_is_checkpointed_and_reopened(tmp_path):
+    path = str(tmp_path / "drafts.jsonl")
+    output = BatchOutput(path)
+    output.write("ada", profile("Ada"), "# Ada")
+    output.close()
+
+    reopened = BatchOutput(path)
+    reopened.close()
+
+    assert reopened.done == {"ada"}
+    assert [json.loads(line)["id"] for line in open(path, encoding="utf-8")] == ["ada"]
+
+
+def test_directory_output_writes_one_markdown_file_per_row(tmp_path):
+    output = BatchOutput(str(tmp_path / "drafts"))
+    output.write("ada/lovelace", profile("Ada"), "# Ada")
+    output.close()
+
+    assert (tmp_path / "drafts" / "ada_lovelace.md").read_text(encoding="utf-8") == "# Ada"
+    assert BatchOutput(str(tmp_path / "drafts")).done == {"ada/lovelace"}
+
+
+def test_failed_rows_are_left_out_of_the_checkpoint(tmp_path):
+    output = BatchOutput(str(tmp_path / "drafts.jsonl"))
+    rows = [("1", profile("Ada")), ("2", profile("Grace"))]
+
+    completed, failed = asyncio.run(run_batch(AsyncClient(fail={"Grace"}), rows, output, workers=2))
+    output.close()
+
+    assert (completed, failed) == (1, ["2"])
+    assert output.done == {"1"}
+
+
+def run_main(monkeypatch, argv, async_client):
+    created = []
+    monkeypatch.setattr(sys, "argv", ["batch_cli.py"] + argv)
+    monkeypatch.setattr(batch_cli, "create_client", lambda config, client_class: created.append(1))
+    monkeypatch.setattr(batch_cli, "create_async_client", lambda client, async_client_class: async_client)
+    monkeypatch.setattr(batch_cli.Config, "HEDGE_ENABLED", False)
+    monkeypatch.setattr(batch_cli.Config, "MODEL_ROUTING_ENABLED", False)
+    try:
+        batch_cli.main()
+    except SystemExit as e:
+        return e.code, created
+    return 0, created
+
+
+def test_rerun_resumes_with_the_rows_that_are_not_done(tmp_path, monkeypatch):
+    profiles = tmp_path / "profiles.jsonl"
+    profiles.write_text('{"name": "Ada"}\n{"name": "Grace"}\n{"name": "Linus"}\n', encoding="utf-8")
+    output = str(tmp_path / "drafts.jsonl")
+
+    first = AsyncClient(fail={"Grace"})
+    assert run_main(monkeypatch, [str(profiles), output], first) == (1, [1])
+    assert len(first.prompts) == 3
+
+    second = AsyncClient()
+    assert run_main(monkeypatch, [str(profiles), output], second) == (0, [1])
+    assert second.prompts == ["prompt for Grace"]
+
+    # Everything is checkpointed, so a third run starts no client at all
+    assert run_main(monkeypatch, [str(profiles), output], AsyncClient()) == (0, [])
+    assert sorted(json.loads(line)["id"] for line in open(output, encoding="utf-8")) == ["1", "2", "3"]
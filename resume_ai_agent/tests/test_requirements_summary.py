@@ -0,0 +1,88 @@
+import pytest
+
+from ai_common.skill_taxonomy import SkillTaxonomy
+from ats_matcher import tokenize
+from requirements_summary import Config, rank_sentences, split_sentences, summarize_requirements
+
+BOILERPLATE = [
+    "We are a friendly company that values people and growth and fun.",
+    "Our friendly company values people, growth and fun every single day.",
+    "Join a friendly company where people and growth and fun matter.",
+]
+REQUIREMENTS = [
+    "Build batch pipelines with Python and Apache Spark.",
+    "Run services on Kubernetes with Terraform.",
+    "Write SQL for the reporting warehouse.",
+]
+TEXT = "\n".join(
+    ["About us"] + BOILERPLATE[:2] + ["Requirements:"] + REQUIREMENTS + [BOILERPLATE[2], REQUIREMENTS[0]]
+)
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(SkillTaxonomy, "_shared", SkillTaxonomy())
+    monkeypatch.setattr(Config, "REQUIREMENTS_SUMMARY_THRESHOLD", 40)
+    monkeypatch.setattr(Config, "REQUIREMENTS_SUMMARY_WORDS", 20)
+    summarize_requirements.cache_clear()
+    yield
+    summarize_requirements.cache_clear()
+
+
+def test_split_on_lines_bullets_and_sentence_ends():
+    text = "1. Python required. Spark a plus\n- SQL • Docker\n\n  Go"
+
+    assert split_sentences(text) == ["Python required.", "Spark a plus", "SQL", "Docker", "Go"]
+
+
+def test_skill_sentences_outrank_boilerplate():
+    taxonomy = SkillTaxonomy.shared(Config)
+    sentences = BOILERPLATE + REQUIREMENTS
+
+    scores, vectors = rank_sentences([tokenize(sentence, taxonomy) for sentence in sentences], taxonomy)
+
+    assert scores.sum() == pytest.approx(1.0)
+    assert min(scores[len(BOILERPLATE):]) > max(scores[:len(BOILERPLATE)])
+    assert vectors.shape[0] == len(sentences)
+
+
+def test_short_requirements_are_sent_in_full():
+    summary = summarize_requirements(" ".join(REQUIREMENTS))
+
+    assert not summary.summarized
+    assert summary.text == " ".join(REQUIREMENTS)
+    assert "Sent in Full" in summary.to_markdown()
+
+
+def test_long_requirements_keep_the_skill_sentences_in_order():
+    summary = summarize_requirements(TEXT)
+
+    assert summary.summarized
+    assert summary.kept == REQUIREMENTS
+    assert summary.text == "\n".join(f"- {sentence}" for sentence in REQUIREMENTS)
+    assert summary.total_sentences == len(TEXT.splitlines())
+    assert summary.kept_words < summary.original_words
+    assert "Kept 3 of 9 sentences" in summary.to_markdown()
+
+
+def test_word_limit_stops_adding_sentences(monkeypatch):
+    monkeypatch.setattr(Config, "REQUIREMENTS_SUMMARY_WORDS", 5)
+
+    summary = summarize_requirements(TEXT)
+
+    assert len(summary.kept) == 1
+    assert summary.kept[0] in REQUIREMENTS
+
+
+def test_text_without_requirements_is_sent_as_it_is():
+    text = " ".join(["the and of"] * 30)
+
+    summary = summarize_requirements(text)
+
+    assert summary.text == text and not summary.summarized
+
+
+def test_disabled_threshold_never_summarizes(monkeypatch):
+    monkeypatch.setattr(Config, "REQUIREMENTS_SUMMARY_THRESHOLD", 0)
+
+    assert summarize_requirements(TEXT).text == TEXT
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from resume_sections import (
+    ResumeDraft, build_sections_prompt, parse_sections, prompt_fields, section_inputs, stale_sections
+)
+
+PROFILE = {
+    "name": "Ada Lovelace",
+    "current_role": "Data Analyst",
+    "experience": "Mid Level (3-5 years)",
+    "skills": "Python, SQL",
+    "achievements": "Cut report time by 40%",
+    "target_role": "Data Engineer",
+    "industries": "Fintech",
+    "requirements": "Spark, Airflow"
+}
+
+GENERATED = ["summary", "experience_highlights", "achievements", "skills", "industries"]
+
+
+def draft_for(profile):
+    """A draft whose sections were all generated from profile"""
+    draft = ResumeDraft()
+    for name in GENERATED:
+        draft.sections[name] = f"{name} text"
+        draft.section_inputs[name] = section_inputs(name, profile)
+    return draft
+
+
+def test_parse_sections_returns_only_the_requested_ones():
+    text = json.dumps({"summary": "  Strong analyst.  ", "skills": "- Python", "extra": "ignored"})
+
+    assert parse_sections(text, ["summary", "skills"]) == {"summary": "Strong analyst.", "skills": "- Python"}
+
+
+def test_parse_sections_fills_missing_sections_with_empty_text():
+    assert parse_sections('{"summary": "Hi"}', ["summary", "achievements"]) == {"summary": "Hi", "achievements": ""}
+
+
+@pytest.mark.parametrize("text, error", [('["summary"]', ValueError), ("not json", json.JSONDecodeError)])
+def test_parse_sections_rejects_other_replies(text, error):
+    with pytest.raises(error):
+        parse_sections(text, ["summary"])
+
+
+def test_every_generated_section_is_stale_without_a_draft():
+    assert stale_sections(None, PROFILE) == GENERATED
+
+
+def test_industries_are_skipped_when_none_are_given():
+    assert "industries" not in stale_sections(None, dict(PROFILE, industries=""))
+
+
+def test_unchanged_profile_leaves_nothing_stale():
+    assert stale_sections(draft_for(PROFILE), dict(PROFILE)) == []
+
+
+def test_only_sections_depending_on_a_changed_field_are_stale():
+    draft = draft_for(PROFILE)
+
+    assert stale_sections(draft, dict(PROFILE, industries="Healthcare")) == ["industries"]
+    assert stale_sections(draft, dict(PROFILE, achievements="Led a team of 4")) == [
+        "experience_highlights", "achievements"
+    ]
+    # The name is only in the locally rendered header
+    assert stale_sections(draft, dict(PROFILE, name="Grace Hopper")) == []
+
+
+def test_section_missing_from_the_draft_is_stale():
+    draft = draft_for(PROFILE)
+    del draft.sections["skills"]
+
+    assert stale_sections(draft, PROFILE) == ["skills"]
+
+
+def test_prompt_asks_only_for_the_missing_sections_and_their_fields():
+    prompt = build_sections_prompt(["achievements"], PROFILE)
+
+    assert prompt_fields(["achievements"]) == ["achievements", "target_role"]
+    assert '- "achievements":' in prompt and '- "summary":' not in prompt
+    assert "Achievements: Cut report time by 40%" in prompt
+    assert "Core Skills" not in prompt
+
+
+def test_priority_keywords_are_shown_with_the_requirements():
+    prompt = build_sections_prompt(["skills"], PROFILE, priority_keywords=["Kafka", "dbt"])
+
+    assert "Priority Keywords" in prompt and "Kafka, dbt" in prompt
+    assert "Priority Keywords" not in build_sections_prompt(["achievements"], PROFILE, ["Kafka"])
+
+
+def test_draft_round_trips_through_a_dict():
+    draft = draft_for(PROFILE)
+    draft.sections["header"] = "# Ada Lovelace"
+
+    restored = ResumeDraft.from_dict(json.loads(json.dumps(draft.to_dict())))
+
+    assert restored == draft
+    assert restored.to_markdown().startswith("# Ada Lovelace\n")